@@ -0,0 +1,179 @@
+"""
+斜杠命令构建 (Markdown ↔ TOML)
+
+各平台使用的命令格式:
+- md: Claude / Codex，YAML frontmatter + 正文，参数占位符 ``$ARGUMENTS``
+- toml: Gemini / Qwen，``description`` + ``prompt``，参数占位符 ``{{args}}``
+
+每条命令只需以一种格式编写 (commands/claude/*.md 或 commands/gemini/*.toml)；
+缺少的格式由另一种自动生成。两种格式都存在时，手写文件优先 (用于针对平台调整措辞)。
+生成结果按源文件内容哈希缓存，安装时直接读取，只有变更过的命令会重新生成。
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+from token_budget import parse_frontmatter
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Bump when the generated output changes so cached artifacts are rebuilt
+TRANSPILER_VERSION = 1
+
+# Command format -> source directory under commands/ and file suffix
+FORMATS = {
+    "md": {"dir": "claude", "suffix": ".md"},
+    "toml": {"dir": "gemini", "suffix": ".toml"},
+}
+
+MD_ARGS = "$ARGUMENTS"
+TOML_ARGS = "{{args}}"
+
+
+def build_cache_dir() -> Path:
+    """生成结果的缓存目录 (XDG_CACHE_HOME、LOCALAPPDATA 或 ~/.cache)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    return (Path(base) if base else Path.home() / ".cache") / "myclaude" / "commands"
+
+
+def _read_toml(text: str) -> dict[str, str]:
+    if tomllib is not None:
+        return {k: v for k, v in tomllib.loads(text).items() if isinstance(v, str)}
+    # Minimal reader for the strings commands use: """...""", '''...''', "..." and '...'
+    fields = {}
+    pattern = re.compile(
+        r'^(\w+)\s*=\s*(?:"""(?P<ml>.*?)"""(?!")|\'\'\'(?P<mll>.*?)\'\'\'(?!\')'
+        r'|"(?P<basic>(?:[^"\\\n]|\\.)*)"|\'(?P<literal>[^\'\n]*)\')',
+        re.M | re.S,
+    )
+    for match in pattern.finditer(text):
+        if match.group("basic") is not None:
+            value = json.loads(f'"{match.group("basic")}"')
+        else:
+            value = next(v for v in match.group("ml", "mll", "literal") if v is not None)
+            if match.group("ml") is not None:
+                value = value.replace("\\\\", "\\")
+        # A newline right after the opening delimiter is trimmed
+        fields[match.group(1)] = value[1:] if value.startswith("\n") else value
+    return fields
+
+
+def _toml_string(value: str, multiline: bool = False) -> str:
+    if multiline:
+        if "\\" not in value and '"""' not in value and not value.endswith('"'):
+            return f'"""{value}"""'
+        if "'''" not in value and not value.endswith("'"):
+            return f"'''{value}'''"
+    # Basic string with escapes (json escapes are valid TOML escapes)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _yaml_scalar(value: str) -> str:
+    if not value or ": " in value or " #" in value or value[0] in "\"'[]{}>|*&!%@`#,?-" or "\n" in value:
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def md_to_toml(text: str) -> str:
+    """Markdown 命令 -> TOML 命令 (frontmatter 中只保留 description)"""
+    description = parse_frontmatter(text).get("description", "")
+    body = text
+    end = text.find("\n---", 3) if text.startswith("---") else -1
+    if end >= 0:
+        # Skip the closing '---' line
+        body = text[end + 4:].partition("\n")[2]
+    prompt = body.strip("\n").replace(MD_ARGS, TOML_ARGS) + "\n"
+    return f"description = {_toml_string(description)}\nprompt = {_toml_string(prompt, multiline=True)}\n"
+
+
+def toml_to_md(text: str) -> str:
+    """TOML 命令 -> Markdown 命令"""
+    fields = _read_toml(text)
+    prompt = fields.get("prompt", "").strip("\n").replace(TOML_ARGS, MD_ARGS)
+    return f"---\ndescription: {_yaml_scalar(fields.get('description', ''))}\n---\n\n{prompt}\n"
+
+
+TRANSPILERS = {
+    ("md", "toml"): md_to_toml,
+    ("toml", "md"): toml_to_md,
+}
+
+
+class CommandBuild:
+    """为指定格式汇总命令文件，缺失的格式从另一种格式生成并缓存
+
+    Attributes:
+        commands_dir: 仓库的 commands/ 目录
+        cache_dir: 生成结果缓存目录
+    """
+
+    def __init__(self, commands_dir: Path, cache_dir: Optional[Path] = None):
+        self.commands_dir = Path(commands_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else build_cache_dir()
+        self.generated = 0
+
+    def source_dirs(self) -> list[Path]:
+        """所有格式的源目录 (用于判断源文件是否变化)"""
+        return [self.commands_dir / spec["dir"] for spec in FORMATS.values()]
+
+    def signature(self) -> tuple[tuple[str, int, int], ...]:
+        """全部源文件的 (路径, mtime_ns, 大小)，任一命令增删或修改后都会变化"""
+        entries = []
+        for fmt in FORMATS:
+            for path in self._files(fmt).values():
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entries.append((path.as_posix(), st.st_mtime_ns, st.st_size))
+        return tuple(entries)
+
+    def _files(self, fmt: str) -> dict[str, Path]:
+        spec = FORMATS[fmt]
+        src_dir = self.commands_dir / spec["dir"]
+        if not src_dir.exists():
+            return {}
+        return {
+            path.relative_to(src_dir).as_posix(): path
+            for path in sorted(src_dir.rglob(f"*{spec['suffix']}"))
+            if path.is_file() and "__pycache__" not in path.parts
+        }
+
+    def _artifact(self, source: Path, src_fmt: str, fmt: str) -> Path:
+        data = source.read_bytes()
+        key = hashlib.sha256(f"{TRANSPILER_VERSION}:{src_fmt}->{fmt}\n".encode() + data).hexdigest()[:32]
+        artifact = self.cache_dir / f"{key}{FORMATS[fmt]['suffix']}"
+        if not artifact.exists():
+            output = TRANSPILERS[(src_fmt, fmt)](data.decode("utf-8"))
+            artifact.parent.mkdir(parents=True, exist_ok=True)
+            tmp = artifact.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(output, encoding="utf-8")
+            os.replace(tmp, artifact)
+            self.generated += 1
+        return artifact
+
+    def outputs(self, fmt: str) -> dict[str, Path]:
+        """该格式下的全部命令: 相对路径 -> 可直接复制的文件
+
+        手写的同格式文件原样使用；其余格式的命令取缓存中的生成结果。
+        """
+        outputs = dict(self._files(fmt))
+        suffix = FORMATS[fmt]["suffix"]
+        for src_fmt in FORMATS:
+            if src_fmt == fmt or (src_fmt, fmt) not in TRANSPILERS:
+                continue
+            for rel, source in self._files(src_fmt).items():
+                target_rel = rel[: -len(FORMATS[src_fmt]["suffix"])] + suffix
+                if target_rel not in outputs:
+                    outputs[target_rel] = self._artifact(source, src_fmt, fmt)
+        return dict(sorted(outputs.items()))
@@ -0,0 +1,253 @@
+"""
+技能内容寻址存储
+
+同一版本的技能在磁盘上只保存一份:
+- 技能目录按内容哈希存入 ``~/.local/share/myclaude/store/<hash>/``
+- 各目标平台 (claude/codex/gemini/qwen) 的安装目录以硬链接指向存储中的文件；
+  写时复制文件系统上改用 reflink (各目标的文件互相独立)，跨文件系统或不支持
+  链接时回退为复制 (见 copy_backend)
+- ``refs.json`` 记录每个存储条目被哪些安装目录引用，最后一个引用释放时删除条目；
+  每次读取时丢弃已不存在的安装目录，所有引用都已消失的条目随之删除。
+  读写 refs.json 时持有文件锁，CLI 与 TUI 同时安装不会丢失记录
+
+存储位置可通过环境变量 MYCLAUDE_STORE 覆盖。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from copy_backend import CopyBackend, get_backend
+
+# Bump when the hashing scheme changes so old entries are not reused
+STORE_VERSION = 1
+
+# Never stored or linked (matches the installer's copytree ignore list)
+IGNORE_DIRS = {"__pycache__"}
+IGNORE_SUFFIXES = {".pyc"}
+
+REFS_NAME = "refs.json"
+# Held (flock / msvcrt) while refs.json is read, updated and written back
+LOCK_NAME = ".refs.lock"
+# Per-entry (size, mtime) record used to notice files edited through a hard link
+STAT_NAME = ".stat.json"
+
+
+def store_root() -> Path:
+    """存储根目录 (MYCLAUDE_STORE、XDG_DATA_HOME 或 ~/.local/share)"""
+    override = os.environ.get("MYCLAUDE_STORE")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_DATA_HOME")
+    return (Path(base) if base else Path.home() / ".local" / "share") / "myclaude" / "store"
+
+
+def tree_files(src: Path) -> list[Path]:
+    """目录下需要安装的文件 (相对路径，排序)"""
+    files = []
+    for root, dirs, names in os.walk(src):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORE_DIRS)
+        for name in sorted(names):
+            path = Path(root) / name
+            if path.suffix not in IGNORE_SUFFIXES and path.is_file():
+                files.append(path.relative_to(src))
+    return files
+
+
+def tree_hash(src: Path, files: Optional[list[Path]] = None) -> str:
+    """目录内容哈希: 相对路径、可执行位与文件内容"""
+    digest = hashlib.sha256(f"myclaude-store:{STORE_VERSION}\n".encode())
+    for rel in files if files is not None else tree_files(src):
+        path = src / rel
+        file_digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                file_digest.update(block)
+        executable = os.access(path, os.X_OK)
+        digest.update(f"{rel.as_posix()}\0{int(executable)}\0{file_digest.hexdigest()}\n".encode())
+    return digest.hexdigest()[:32]
+
+
+def link_tree(src: Path, dst: Path, files: list[Path], backend: Optional[CopyBackend] = None) -> Counter:
+    """在 dst 重建 src 的目录结构，文件指向 src 中的数据
+
+    先对一个非空文件实测 reflink (见 CopyBackend.probe_reflink)；支持时全部使用
+    reflink，否则使用硬链接，都不可用时复制。硬链接与存储共享数据: 原地修改安装后的
+    文件会同时改变存储及其他目标中的同一文件。
+
+    Returns:
+        各方式处理的文件数，例如 ``{"hardlink": 12}``
+    """
+    backend = backend or get_backend()
+    methods: Counter = Counter()
+    dst.mkdir(parents=True, exist_ok=True)
+    sample = next((src / rel for rel in files if (src / rel).stat().st_size), None)
+    reflink = sample is not None and backend.probe_reflink(sample, dst)
+    for rel in files:
+        target = dst / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not reflink:
+            try:
+                os.link(src / rel, target)
+                methods["hardlink"] += 1
+                continue
+            except OSError:
+                pass
+        methods[backend.copy_file_via(src / rel, target)] += 1
+    return methods
+
+
+class ContentStore:
+    """内容寻址的技能存储，带引用计数
+
+    Attributes:
+        root: 存储根目录
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else store_root()
+        self._refs_path = self.root / REFS_NAME
+
+    @contextmanager
+    def _locked(self):
+        """独占存储 (读取、修改并写回 refs.json 期间持有)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / LOCK_NAME, "a+b") as lock:
+            try:
+                import fcntl
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            except ImportError:  # Windows
+                import msvcrt
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            # Closing the file releases the lock
+            yield
+
+    def _load_refs(self) -> dict[str, list[str]]:
+        """读取 refs.json，丢弃已不存在的安装目录 (条目可能因此没有引用)"""
+        try:
+            refs = json.loads(self._refs_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(refs, dict):
+            return {}
+        return {digest: [h for h in holders if Path(h).exists()] for digest, holders in refs.items()}
+
+    def _save_refs(self, refs: dict[str, list[str]]) -> list[str]:
+        """写回 refs.json，并删除没有引用的条目
+
+        Returns:
+            被删除的内容哈希
+        """
+        removed = sorted(digest for digest, holders in refs.items() if not holders)
+        for digest in removed:
+            del refs[digest]
+            shutil.rmtree(self.root / digest, ignore_errors=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._refs_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(refs, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self._refs_path)
+        return removed
+
+    def add(self, src: Path, files: Optional[list[Path]] = None) -> tuple[str, Path]:
+        """将目录存入存储 (已存在相同内容时直接复用)
+
+        Returns:
+            (内容哈希, 存储目录)
+        """
+        files = files if files is not None else tree_files(src)
+        digest = tree_hash(src, files)
+        entry = self.root / digest
+        if entry.is_dir() and not self._intact(entry, files):
+            # An installed copy was edited in place; move the shared inodes aside
+            stale = self.root / f".{digest}.{os.getpid()}.stale"
+            os.rename(entry, stale)
+            shutil.rmtree(stale, ignore_errors=True)
+        if not entry.is_dir():
+            self.root.mkdir(parents=True, exist_ok=True)
+            staging = self.root / f".{digest}.{os.getpid()}.tmp"
+            shutil.rmtree(staging, ignore_errors=True)
+            staging.mkdir()
+            for rel in files:
+                (staging / rel).parent.mkdir(parents=True, exist_ok=True)
+                get_backend().copy_file(src / rel, staging / rel)
+            stats = {rel.as_posix(): [st.st_size, st.st_mtime_ns]
+                     for rel in files for st in [(staging / rel).stat()]}
+            (staging / STAT_NAME).write_text(json.dumps(stats), encoding="utf-8")
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another installer stored the same content first
+                shutil.rmtree(staging, ignore_errors=True)
+        return digest, entry
+
+    @staticmethod
+    def _intact(entry: Path, files: list[Path]) -> bool:
+        try:
+            stats = json.loads((entry / STAT_NAME).read_text(encoding="utf-8"))
+            for rel in files:
+                st = (entry / rel).stat()
+                if stats.get(rel.as_posix()) != [st.st_size, st.st_mtime_ns]:
+                    return False
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def install(self, src: Path, dst: Path) -> tuple[str, Counter]:
+        """存入 src 并在 dst 创建指向存储的安装目录
+
+        dst 须不存在。
+
+        Returns:
+            (内容哈希, 各链接/复制方式处理的文件数)
+        """
+        files = tree_files(src)
+        # Locked throughout so a concurrent install cannot delete the entry as unreferenced
+        with self._locked():
+            digest, entry = self.add(src, files)
+            linked = link_tree(entry, dst, files)
+            refs = self._load_refs()
+            refs[digest] = [h for h in refs.get(digest, []) if h != str(dst)] + [str(dst)]
+            self._save_refs(refs)
+        return digest, linked
+
+    def release(self, digest: str, dst: Path) -> bool:
+        """释放 dst 对存储条目的引用；无引用时删除条目
+
+        Returns:
+            条目是否被删除
+        """
+        with self._locked():
+            refs = self._load_refs()
+            refs[digest] = [h for h in refs.get(digest, []) if h != str(dst)]
+            return digest in self._save_refs(refs)
+
+    def gc(self) -> list[str]:
+        """删除所有引用目录都已不存在的条目
+
+        Returns:
+            被删除的内容哈希
+        """
+        with self._locked():
+            refs = self._load_refs()
+            removed = self._save_refs(refs)
+            # Entries missing from refs.json (e.g. an interrupted install)
+            for entry in self.root.iterdir():
+                if entry.is_dir() and not entry.name.startswith(".") and entry.name not in refs:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed.append(entry.name)
+        return sorted(set(removed))
+
+    def usage(self) -> tuple[int, int]:
+        """存储条目数与占用字节数"""
+        entries = size = 0
+        for entry in self.root.iterdir() if self.root.exists() else []:
+            if entry.is_dir() and not entry.name.startswith("."):
+                entries += 1
+                size += sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+        return entries, size
@@ -10,6 +10,14 @@ import sys
 import os
 import shutil
 import datetime
+import hashlib
+import json
+
+from command_build import FORMATS, CommandBuild
+from content_store import ContentStore
+from platforms import load_platforms
+from copy_backend import get_backend
+from token_budget import TokenCache, parse_frontmatter, skill_budget, skill_budgets
 
 # --- Colors & Styles (Standard ANSI) ---
 class Colors:
@@ -33,39 +41,142 @@ PROMPTS_SRC_DIR = SCRIPT_DIR / "prompts"
 COMMANDS_SRC_DIR = SCRIPT_DIR / "commands"
 HOME_DIR = Path.home()
 
-TARGET_CONFIG = {
-    "claude": {
-        "base": HOME_DIR / ".claude",
-        "skills": HOME_DIR / ".claude" / "skills",
-        "commands": HOME_DIR / ".claude" / "commands",
-        "prompt": HOME_DIR / ".claude" / "CLAUDE.md"
-    },
-    "codex": {
-        "base": HOME_DIR / ".codex",
-        "skills": HOME_DIR / ".codex" / "skills",
-        "commands": HOME_DIR / ".codex" / "prompts",
-        "prompt": None
-    },
-    "gemini": {
-        "base": HOME_DIR / ".gemini",
-        "skills": HOME_DIR / ".gemini" / "skills",
-        "commands": HOME_DIR / ".gemini" / "commands",
-        "prompt": None
-    },
-    "qwen": {
-        "base": HOME_DIR / ".qwen",
-        "skills": HOME_DIR / ".qwen" / "skills",
-        "commands": HOME_DIR / ".qwen" / "commands",
-        "prompt": None
-    }
+# Target platforms, resolved once from the platform registry (built-ins, entry points, platforms.toml)
+TARGET_CONFIG = {name: platform.as_config() for name, platform in load_platforms(HOME_DIR).items()}
+TARGET_HELP = f"Target platform ({', '.join(TARGET_CONFIG)})"
+TARGETS_HELP = f"Target platform ({', '.join(TARGET_CONFIG)}, all)"
+
+# Skills that import code shipped with another skill
+SKILL_DEPENDENCIES = {
+    "latex-thesis-zh": ["latex-paper-en"],  # shared latex_toolkit package
 }
 
+# Per-target record of what this installer put there (kept in the target's base dir)
+MANIFEST_NAME = ".myclaude-manifest.json"
+
+# Default budget flags: always-loaded tokens per item, and SKILL.md/command size
+BUDGET_ALWAYS_THRESHOLD = 200
+BUDGET_TRIGGER_THRESHOLD = 5000
+
+
+class InstallManifest:
+    """JSON manifest of installed items for one target.
+
+    Skills map to the token budget measured at install time, together with
+    the installed SKILL.md's (mtime_ns, size) so a hand-edited copy is
+    re-measured instead of trusted, and the content store entry they link to.
+    Commands map each installed relative path to the SHA-256 and
+    (mtime_ns, size) written by the last sync.
+    """
+
+    def __init__(self, base_dir):
+        self.path = Path(base_dir) / MANIFEST_NAME
+        self.data = {"version": 1, "skills": {}}
+        self._dirty = False
+        try:
+            loaded = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(loaded, dict) and loaded.get("version") == 1:
+                self.data.update(loaded)
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def skills(self):
+        return self.data.setdefault("skills", {})
+
+    def skill_budget(self, name, installed_dir):
+        """Recorded (layer0, layer1, layer2) if the installed copy is unchanged."""
+        entry = self.skills.get(name)
+        if not entry or "tokens" not in entry:
+            return None
+        try:
+            st = (installed_dir / "SKILL.md").stat()
+        except OSError:
+            return None
+        if entry.get("signature") != [st.st_mtime_ns, st.st_size]:
+            return None
+        return tuple(entry["tokens"])
+
+    def record_skill(self, name, installed_dir, tokens, store=None):
+        try:
+            st = (installed_dir / "SKILL.md").stat()
+            signature = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            signature = None
+        entry = self.skills.setdefault(name, {})
+        entry.update({"signature": signature, "tokens": list(tokens)})
+        if store is not None:
+            entry["store"] = store
+        self._dirty = True
+
+    def skill_store(self, name):
+        return self.skills.get(name, {}).get("store")
+
+    @property
+    def commands(self):
+        return self.data.setdefault("commands", {})
+
+    def record_command(self, rel, path, digest):
+        st = path.stat()
+        self.commands[rel] = {"sha256": digest, "signature": [st.st_mtime_ns, st.st_size]}
+        self._dirty = True
+
+    def forget_command(self, rel):
+        if self.commands.pop(rel, None) is not None:
+            self._dirty = True
+
+    def forget_skill(self, name):
+        if self.skills.pop(name, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self.data, indent=2, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log_warn(f"Could not write manifest {self.path}: {e}")
+        self._dirty = False
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def command_description(path):
+    """Description of a command file: Markdown frontmatter or TOML 'description'."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return ""
+    if path.suffix == ".toml":
+        for line in text.splitlines():
+            key, _, value = line.partition("=")
+            if key.strip() == "description":
+                return value.strip().strip("\"'")
+        return ""
+    return parse_frontmatter(text).get("description", "")
+
 class SkillManager:
     def __init__(self, target):
         self.target = target
         self.config = TARGET_CONFIG[target]
         self.target_skills_dir = self.config["skills"]
         self.target_commands_dir = self.config["commands"]
+        self._hardlink_noted = False
+
+    @property
+    def token_cache(self):
+        if getattr(self, "_token_cache", None) is None:
+            self._token_cache = TokenCache()
+        return self._token_cache
 
     def ensure_dirs(self):
         self.config["base"].mkdir(parents=True, exist_ok=True)
@@ -88,12 +199,115 @@ class SkillManager:
             return
 
         skills = sorted([d for d in SKILLS_SRC_DIR.iterdir() if d.is_dir()])
+        cache = TokenCache()
         for i, skill in enumerate(skills, 1):
             desc = self.get_skill_description(skill)
+            budget = skill_budget(skill, cache)
             status = f"{Colors.SUCCESS}Installed{Colors.ENDC}" if (self.target_skills_dir / skill.name).exists() else f"{Colors.FAIL}Not installed{Colors.ENDC}"
             print(f"\n[{i}] {Colors.BOLD}{skill.name}{Colors.ENDC}")
             if desc: print(f"    Description: {desc}")
             print(f"    Status: {status}")
+            print(f"    Tokens: L0 ~{budget.layer0} / L1 ~{budget.layer1} / L2 ~{budget.layer2}")
+        cache.save()
+
+    def token_report(self, as_json=False):
+        cache = TokenCache()
+        budgets = skill_budgets(SKILLS_SRC_DIR, cache)
+        cache.save()
+        if as_json:
+            print(json.dumps({
+                "tokenizer": cache.tokenizer,
+                "skills": [{"name": b.name, "layer0": b.layer0, "layer1": b.layer1, "layer2": b.layer2}
+                           for b in budgets],
+            }, indent=2))
+            return
+
+        print(f"\n{Colors.HEADER}=== Skill Token Budgets (tokenizer: {cache.tokenizer}) ==={Colors.ENDC}")
+        print(f"{'Skill':<32}{'L0 always':>10}{'L1 trigger':>12}{'L2 on demand':>14}")
+        for b in budgets:
+            print(f"{b.name:<32}{b.layer0:>10}{b.layer1:>12}{b.layer2:>14}")
+        print(f"{'Total':<32}{sum(b.layer0 for b in budgets):>10}"
+              f"{sum(b.layer1 for b in budgets):>12}{sum(b.layer2 for b in budgets):>14}")
+
+    def context_budget(self, threshold=BUDGET_ALWAYS_THRESHOLD, trigger_threshold=BUDGET_TRIGGER_THRESHOLD):
+        """Always-loaded and on-trigger token cost of everything installed in this target.
+
+        Returns:
+            dict with prompt (CLAUDE.md) tokens, per-item entries ranked by
+            always-loaded cost and flagged against the thresholds, and totals
+        """
+        cache = self.token_cache
+        manifest = InstallManifest(self.config["base"])
+        items = []
+
+        if self.target_skills_dir.exists():
+            for skill_dir in sorted(d for d in self.target_skills_dir.iterdir() if d.is_dir()):
+                tokens = manifest.skill_budget(skill_dir.name, skill_dir)
+                if tokens is None:
+                    tokens = skill_budget(skill_dir, cache).as_tuple()
+                    manifest.record_skill(skill_dir.name, skill_dir, tokens)
+                items.append({
+                    "name": skill_dir.name,
+                    "kind": "skill",
+                    "always": tokens[0],
+                    "trigger": tokens[1] + tokens[2],
+                    "source": "repository" if (SKILLS_SRC_DIR / skill_dir.name).exists() else "external",
+                })
+
+        if self.target_commands_dir.exists():
+            for path in sorted(self.target_commands_dir.rglob("*")):
+                if path.is_file() and path.suffix in (".md", ".toml"):
+                    rel = path.relative_to(self.target_commands_dir).with_suffix("")
+                    items.append({
+                        "name": rel.as_posix(),
+                        "kind": "command",
+                        "always": cache.count_text(command_description(path)),
+                        "trigger": cache.count_file(path),
+                        "source": "",
+                    })
+
+        for item in items:
+            item["flags"] = [flag for flag, over in (("always-loaded", item["always"] > threshold),
+                                                     ("on-trigger", item["trigger"] > trigger_threshold)) if over]
+
+        prompt_file = self.config.get("prompt")
+        prompt_tokens = cache.count_file(prompt_file) if prompt_file and prompt_file.exists() else 0
+        manifest.save()
+        cache.save()
+
+        items.sort(key=lambda item: (-item["always"], -item["trigger"], item["name"]))
+        return {
+            "target": self.target,
+            "prompt": prompt_tokens,
+            "always_loaded": prompt_tokens + sum(item["always"] for item in items),
+            "on_trigger": sum(item["trigger"] for item in items),
+            "items": items,
+        }
+
+    def budget_report(self, threshold=BUDGET_ALWAYS_THRESHOLD, trigger_threshold=BUDGET_TRIGGER_THRESHOLD,
+                      as_json=False):
+        report = self.context_budget(threshold, trigger_threshold)
+        if as_json:
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+            return report
+
+        print(f"\n{Colors.HEADER}=== Context Budget (Target: {self.target}, tokenizer: {self.token_cache.tokenizer}) ==={Colors.ENDC}")
+        if not report["items"] and not report["prompt"]:
+            log_warn("Nothing installed.")
+            return report
+        print(f"{'#':>3}  {'Name':<34}{'Kind':<9}{'Always':>8}{'Trigger':>10}")
+        for i, item in enumerate(report["items"], 1):
+            flag = f" {Colors.WARN}⚠ {', '.join(item['flags'])}{Colors.ENDC}" if item["flags"] else ""
+            print(f"{i:>3}  {item['name']:<34}{item['kind']:<9}{item['always']:>8}{item['trigger']:>10}{flag}")
+        if report["prompt"]:
+            print(f"     {'CLAUDE.md':<34}{'prompt':<9}{report['prompt']:>8}{'':>10}")
+        print(f"\n{Colors.BOLD}Always loaded every session: ~{report['always_loaded']} tokens{Colors.ENDC}"
+              f"  (on trigger: up to ~{report['on_trigger']})")
+        flagged = [item["name"] for item in report["items"] if item["flags"]]
+        if flagged:
+            log_warn(f"{len(flagged)} item(s) over budget (always > {threshold} or trigger > {trigger_threshold}): "
+                     f"{', '.join(flagged)}")
+        return report
 
     def list_installed(self):
         print(f"\n{Colors.HEADER}=== Installed Skills (Target: {self.target}) ==={Colors.ENDC}")
@@ -119,40 +333,181 @@ class SkillManager:
             return False
 
         self.ensure_dirs()
+        manifest = InstallManifest(self.config["base"])
+        previous = manifest.skill_store(skill_name)
         if dst.exists():
             if not quiet: log_warn(f"Overwriting existing skill: {skill_name}")
             shutil.rmtree(dst)
 
-        shutil.copytree(src, dst)
-        if not quiet: log_success(f"Installed: {skill_name} -> {dst}")
+        # One stored copy per skill version, linked (or reflinked) into every target
+        digest = None
+        try:
+            digest, methods = ContentStore().install(src, dst)
+            via = ", ".join(f"{name} {count}" for name, count in methods.most_common())
+        except OSError as e:
+            if not quiet: log_warn(f"Content store unavailable ({e}), copying instead")
+            shutil.rmtree(dst, ignore_errors=True)
+            backend = get_backend()
+            backend.copytree(src, dst, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+            via = backend.summary()
+        if previous and previous != digest:
+            ContentStore().release(previous, dst)
+        if not quiet: log_success(f"Installed: {skill_name} -> {dst} ({via or 'empty'})")
+        if "hardlink" in via and not quiet and not self._hardlink_noted:
+            self._hardlink_noted = True
+            log_info("Hard-linked files share data with the store and other targets: "
+                     "editing one in place changes them all (copy the file before editing it)")
+
+        # Record the budget now so 'budget' never has to re-read installed skills
+        manifest.record_skill(skill_name, dst, skill_budget(src, self.token_cache).as_tuple(), store=digest or "")
+        manifest.save()
+        self.token_cache.save()
+
+        for dependency in SKILL_DEPENDENCIES.get(skill_name, []):
+            if not (self.target_skills_dir / dependency).exists():
+                if not quiet: log_info(f"Installing dependency of {skill_name}: {dependency}")
+                if not self.install_skill(dependency, quiet=quiet):
+                    return False
         return True
 
-    def install_commands(self):
-        log_info(f"Installing commands for {self.target}...")
-        self.ensure_dirs()
+    def installed_dependents(self, skill_name):
+        """已安装且依赖该技能的技能 (见 SKILL_DEPENDENCIES)"""
+        return [name for name, dependencies in SKILL_DEPENDENCIES.items()
+                if skill_name in dependencies and (self.target_skills_dir / name).exists()]
+
+    def uninstall_skill(self, skill_name, quiet=False, force=False):
+        dst = self.target_skills_dir / skill_name
+        if not dst.exists():
+            log_error(f"Skill not installed: {skill_name}")
+            return False
 
-        # Determine source directory based on target
-        if self.target in ["gemini", "qwen"]:
-            src_cmd_dir = COMMANDS_SRC_DIR / "gemini"
-        else:
-            # Claude and Codex share commands from 'claude' folder
-            src_cmd_dir = COMMANDS_SRC_DIR / "claude"
+        dependents = self.installed_dependents(skill_name)
+        if dependents and not force:
+            log_error(f"{skill_name} is required by {', '.join(dependents)}; "
+                      f"uninstall those first or pass --force")
+            return False
+        if dependents and not quiet:
+            log_warn(f"{', '.join(dependents)} will stop working without {skill_name}")
+
+        shutil.rmtree(dst)
+        manifest = InstallManifest(self.config["base"])
+        digest = manifest.skill_store(skill_name)
+        manifest.forget_skill(skill_name)
+        manifest.save()
+        # The stored copy goes only when no other target still links to it
+        if digest and ContentStore().release(digest, dst):
+            if not quiet: log_info(f"Removed {skill_name} from the content store")
+        if not quiet: log_success(f"Uninstalled: {skill_name} from {self.target}")
+        return True
 
-        if not src_cmd_dir.exists():
-            log_warn(f"No specific commands found for target {self.target} in {src_cmd_dir}")
-            return
+    @property
+    def command_format(self):
+        # Claude and Codex read Markdown commands, Gemini and Qwen read TOML
+        return self.config.get("format", "md")
 
-        # Copy contents to target_commands_dir
-        try:
-            # shutil.copytree requires the destination dir to not exist for Python < 3.8 if dirs_exist_ok is not used
-            # We use dirs_exist_ok=True (Python 3.8+) to allow merging/overwriting
-            shutil.copytree(src_cmd_dir, self.target_commands_dir, dirs_exist_ok=True)
+    def commands_source_dir(self):
+        return COMMANDS_SRC_DIR / FORMATS[self.command_format]["dir"]
 
-            log_success(f"Installed commands to {self.target_commands_dir}")
-            if self.target == "codex":
-                log_info(f"Note: For Codex, commands are installed as prompts in {self.target_commands_dir}")
-        except Exception as e:
-            log_error(f"Failed to install commands: {e}")
+    def command_sources(self):
+        """Relative path -> file to install, with missing formats generated (see command_build)."""
+        return CommandBuild(COMMANDS_SRC_DIR).outputs(self.command_format)
+
+    def _installed_digest(self, dst, recorded):
+        """Hash of an installed command, trusting the manifest while (mtime, size) match."""
+        try:
+            st = dst.stat()
+        except OSError:
+            return None
+        if recorded and recorded.get("signature") == [st.st_mtime_ns, st.st_size]:
+            return recorded["sha256"]
+        return file_sha256(dst)
+
+    def sync_commands(self, only=None, prune=False, sources=None):
+        """Copy new or changed command files into the target, one file at a time.
+
+        Args:
+            only: relative paths to sync (default: every command, nested dirs included)
+            prune: remove commands this installer put there earlier that no longer
+                exist in the repository (files edited since are kept)
+            sources: relative path -> file to install, when the caller already has
+                them (default: command_sources(), which rescans and rebuilds)
+
+        Returns:
+            list of (relative path, status, error) with status one of
+            added, updated, unchanged, removed, kept, failed
+        """
+        if sources is None:
+            sources = self.command_sources()
+        if not sources and not prune:
+            return []
+        self.ensure_dirs()
+        manifest = InstallManifest(self.config["base"])
+        backend = get_backend()
+        results = []
+
+        for rel, src in sources.items():
+            if only is not None and rel not in only:
+                continue
+            dst = self.target_commands_dir / rel
+            try:
+                src_digest = file_sha256(src)
+                installed = self._installed_digest(dst, manifest.commands.get(rel))
+                if installed == src_digest:
+                    status = "unchanged"
+                else:
+                    dst.parent.mkdir(parents=True, exist_ok=True)
+                    backend.copy_file(src, dst)
+                    status = "added" if installed is None else "updated"
+                manifest.record_command(rel, dst, src_digest)
+                results.append((rel, status, None))
+            except OSError as e:
+                results.append((rel, "failed", str(e)))
+
+        if prune:
+            for rel in sorted(set(manifest.commands) - set(sources)):
+                dst = self.target_commands_dir / rel
+                recorded = manifest.commands[rel]
+                try:
+                    if not dst.exists():
+                        manifest.forget_command(rel)
+                    elif self._installed_digest(dst, recorded) != recorded["sha256"]:
+                        results.append((rel, "kept", "modified since install"))
+                    else:
+                        dst.unlink()
+                        manifest.forget_command(rel)
+                        results.append((rel, "removed", None))
+                        # Drop namespace dirs (e.g. plan/) left empty
+                        parent = dst.parent
+                        while parent != self.target_commands_dir and not any(parent.iterdir()):
+                            parent.rmdir()
+                            parent = parent.parent
+                except OSError as e:
+                    results.append((rel, "failed", str(e)))
+
+        manifest.save()
+        return results
+
+    def install_commands(self, prune=False):
+        log_info(f"Installing commands for {self.target}...")
+        if not COMMANDS_SRC_DIR.exists():
+            log_warn(f"No commands found for target {self.target} in {COMMANDS_SRC_DIR}")
+            return []
+
+        results = self.sync_commands(prune=prune)
+        counts = {}
+        for rel, status, error in results:
+            counts[status] = counts.get(status, 0) + 1
+            if status == "failed":
+                log_error(f"Failed to install command {rel}: {error}")
+            elif status == "kept":
+                log_warn(f"Kept {rel}: {error}")
+            elif status != "unchanged":
+                print(f"    {status:<9} {rel}")
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        log_success(f"Synced commands to {self.target_commands_dir} ({summary or 'nothing to do'})")
+        if self.config.get("note"):
+            log_info(f"Note: For {self.config.get('label', self.target)}, {self.config['note']} in {self.target_commands_dir}")
+        return results
 
     def install_all(self):
         log_info(f"Installing all skills to {self.target}...")
@@ -246,13 +601,37 @@ app = typer.Typer(
 )
 
 @app.command()
-def list_skills(target: str = typer.Option("claude", "--target", "-t", help="Target platform (claude, codex, gemini, qwen)")):
+def list_skills(target: str = typer.Option("claude", "--target", "-t", help=TARGET_HELP)):
     """列出可用的技能"""
     mgr = SkillManager(target)
     mgr.list_available()
 
 @app.command()
-def installed(target: str = typer.Option("claude", "--target", "-t", help="Target platform (claude, codex, gemini, qwen)")):
+def tokens(json_output: bool = typer.Option(False, "--json", help="Output JSON")):
+    """统计所有技能的分层 token 预算 (Layer 0/1/2)"""
+    mgr = SkillManager("claude")
+    mgr.token_report(as_json=json_output)
+
+@app.command()
+def budget(
+    target: str = typer.Option("claude", "--target", "-t", help=TARGETS_HELP),
+    threshold: int = typer.Option(BUDGET_ALWAYS_THRESHOLD, "--threshold", help="Flag items whose always-loaded cost exceeds this"),
+    trigger_threshold: int = typer.Option(BUDGET_TRIGGER_THRESHOLD, "--trigger-threshold", help="Flag items whose on-trigger cost exceeds this"),
+    json_output: bool = typer.Option(False, "--json", help="Output JSON"),
+):
+    """统计已安装技能与命令的上下文开销 (常驻 / 触发时)，按开销排序"""
+    if target != "all":
+        SkillManager(target).budget_report(threshold, trigger_threshold, as_json=json_output)
+        return
+    if json_output:
+        reports = [SkillManager(t).context_budget(threshold, trigger_threshold) for t in TARGET_CONFIG]
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+        return
+    for t in TARGET_CONFIG:
+        SkillManager(t).budget_report(threshold, trigger_threshold)
+
+@app.command()
+def installed(target: str = typer.Option("claude", "--target", "-t", help=TARGET_HELP)):
     """列出已安装的技能"""
     mgr = SkillManager(target)
     mgr.list_installed()
@@ -260,39 +639,68 @@ def installed(target: str = typer.Option("claude", "--target", "-t", help="Targe
 @app.command()
 def install(
     skills: list[str] = typer.Argument(..., help="要安装的技能名称"),
-    target: str = typer.Option("claude", "--target", "-t", help="Target platform (claude, codex, gemini, qwen)")
+    target: str = typer.Option("claude", "--target", "-t", help=TARGETS_HELP)
 ):
     """安装指定的技能"""
-    mgr = SkillManager(target)
-    for skill in skills:
-        mgr.install_skill(skill)
+    for t in (list(TARGET_CONFIG) if target == "all" else [target]):
+        mgr = SkillManager(t)
+        for skill in skills:
+            mgr.install_skill(skill)
 
 @app.command()
-def install_all(target: str = typer.Option("claude", "--target", "-t", help="Target platform (claude, codex, gemini, qwen)")):
+def install_all(target: str = typer.Option("claude", "--target", "-t", help=TARGETS_HELP)):
     """安装所有技能"""
-    mgr = SkillManager(target)
-    mgr.install_all()
+    for t in (list(TARGET_CONFIG) if target == "all" else [target]):
+        mgr = SkillManager(t)
+        mgr.install_all()
 
 @app.command()
-def install_commands(target: str = typer.Option("claude", "--target", "-t", help="Target platform (claude, codex, gemini, qwen)")):
-    """安装命令"""
+def uninstall(
+    skills: list[str] = typer.Argument(..., help="要卸载的技能名称"),
+    target: str = typer.Option("claude", "--target", "-t", help=TARGETS_HELP),
+    force: bool = typer.Option(False, "--force", help="Uninstall even if installed skills depend on it"),
+):
+    """卸载指定的技能 (共享存储中的副本在最后一个引用释放后删除)"""
+    # Dependents first, so 'uninstall latex-paper-en latex-thesis-zh' succeeds
+    ordered = sorted(skills, key=lambda skill: skill not in SKILL_DEPENDENCIES)
+    for t in (list(TARGET_CONFIG) if target == "all" else [target]):
+        mgr = SkillManager(t)
+        for skill in ordered:
+            mgr.uninstall_skill(skill, force=force)
+
+@app.command()
+def store(gc: bool = typer.Option(False, "--gc", help="Remove entries no installed skill links to")):
+    """查看共享技能存储的占用 (可清理无引用条目)"""
+    content_store = ContentStore()
+    if gc:
+        removed = content_store.gc()
+        log_success(f"Removed {len(removed)} unreferenced store entries")
+    entries, size = content_store.usage()
+    log_info(f"{content_store.root}: {entries} entries, {size / 1024:.1f} KiB")
+
+@app.command()
+def install_commands(
+    target: str = typer.Option("claude", "--target", "-t", help=TARGET_HELP),
+    prune: bool = typer.Option(False, "--prune", help="Remove previously installed commands that no longer exist in the repository"),
+):
+    """安装命令 (仅复制新增或变更的文件)"""
     mgr = SkillManager(target)
-    mgr.install_commands()
+    mgr.install_commands(prune=prune)
 
 @app.command()
-def interactive(target: str = typer.Option("claude", "--target", "-t", help="Target platform (claude, codex, gemini, qwen)")):
+def interactive(target: str = typer.Option("claude", "--target", "-t", help=TARGET_HELP)):
     """交互式安装"""
     mgr = SkillManager(target)
     mgr.interactive()
 
 @app.command()
-def prompt_update(target: str = typer.Option("claude", "--target", "-t", help="Target platform (claude, codex, gemini, qwen)")):
+def prompt_update(target: str = typer.Option("claude", "--target", "-t", help=TARGET_HELP)):
     """更新 CLAUDE.md 提示文件"""
     mgr = SkillManager(target)
     mgr.prompt_update()
 
 @app.command()
-def prompt_diff(target: str = typer.Option("claude", "--target", "-t", help="Target platform (claude, codex, gemini, qwen)")):
+def prompt_diff(target: str = typer.Option("claude", "--target", "-t", help=TARGET_HELP)):
     """比较本地和全局 CLAUDE.md 提示文件"""
     mgr = SkillManager(target)
     mgr.prompt_diff()
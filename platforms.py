@@ -0,0 +1,209 @@
+"""
+目标平台注册表
+
+每个平台 (agent CLI) 由一组路径与命令格式描述:
+- base: 配置根目录 (如 ~/.claude)
+- skills / commands: 技能与命令目录 (相对 base，或绝对路径 / ~ 开头)
+- format: 命令格式 md 或 toml (见 command_build)
+- prompt: 全局提示文件 (如 CLAUDE.md)，没有则省略
+- label / note: 显示名称与安装命令时的附加说明
+
+来源按顺序合并，后者覆盖前者:
+1. 内置平台 (BUILTIN_PLATFORMS)
+2. entry point 组 ``myclaude.platforms`` (对象为 {名称: 定义} 字典或返回该字典的函数)
+3. TOML 文件: MYCLAUDE_PLATFORMS 指定的路径，或 ~/.config/myclaude/platforms.toml
+
+TOML 中每个表是一个平台，``enabled = false`` 可移除已有平台::
+
+    [cursor]
+    label = "Cursor"
+    base = "~/.cursor"
+    commands = "commands"
+    format = "md"
+
+无法读取的 TOML 文件与无效的平台定义只给出警告并被忽略 (被覆盖的内置平台保持原样)。
+结果在进程内缓存，只解析一次。
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+ENTRY_POINT_GROUP = "myclaude.platforms"
+
+BUILTIN_PLATFORMS: dict[str, dict[str, Any]] = {
+    "claude": {"label": "Claude", "base": "~/.claude", "prompt": "CLAUDE.md", "format": "md"},
+    # Claude and Codex share the Markdown commands
+    "codex": {"label": "Codex", "base": "~/.codex", "commands": "prompts", "format": "md",
+              "note": "commands are installed as prompts"},
+    "gemini": {"label": "Gemini", "base": "~/.gemini", "format": "toml"},
+    "qwen": {"label": "Qwen", "base": "~/.qwen", "format": "toml"},
+}
+
+
+class PlatformError(ValueError):
+    """平台定义无效"""
+
+
+@dataclass(frozen=True)
+class Platform:
+    """单个目标平台
+
+    Attributes:
+        name: 平台 ID (--target 的取值)
+        label: 显示名称
+        base: 配置根目录
+        skills: 技能安装目录
+        commands: 命令安装目录
+        format: 命令格式 (md / toml)
+        prompt: 全局提示文件，没有时为 None
+        note: 安装命令时显示的附加说明
+    """
+    name: str
+    label: str
+    base: Path
+    skills: Path
+    commands: Path
+    format: str = "md"
+    prompt: Optional[Path] = None
+    note: str = ""
+
+    def as_config(self) -> dict[str, Any]:
+        """install.TARGET_CONFIG 使用的字典形式"""
+        return {
+            "base": self.base,
+            "skills": self.skills,
+            "commands": self.commands,
+            "prompt": self.prompt,
+            "format": self.format,
+            "label": self.label,
+            "note": self.note,
+        }
+
+
+def _resolve(value: str, base: Path, home: Path) -> Path:
+    if value.startswith("~"):
+        return home / value[1:].lstrip("/\\")
+    path = Path(value)
+    return path if path.is_absolute() else base / path
+
+
+def platform_from_dict(name: str, data: dict[str, Any], home: Optional[Path] = None) -> Platform:
+    """由定义字典构建 Platform
+
+    Raises:
+        PlatformError: 缺少 base 或命令格式未知
+    """
+    home = home or Path.home()
+    if "base" not in data:
+        raise PlatformError(f"Platform '{name}' has no base directory")
+    fmt = data.get("format", "md")
+    if fmt not in ("md", "toml"):
+        raise PlatformError(f"Platform '{name}' has unknown command format: {fmt}")
+    base = _resolve(str(data["base"]), home, home)
+    return Platform(
+        name=name,
+        label=data.get("label", name.capitalize()),
+        base=base,
+        skills=_resolve(str(data.get("skills", "skills")), base, home),
+        commands=_resolve(str(data.get("commands", "commands")), base, home),
+        format=fmt,
+        prompt=_resolve(str(data["prompt"]), base, home) if data.get("prompt") else None,
+        note=data.get("note", ""),
+    )
+
+
+def platforms_file() -> Path:
+    """用户平台定义文件路径 (MYCLAUDE_PLATFORMS 或 XDG_CONFIG_HOME/myclaude/platforms.toml)"""
+    override = os.environ.get("MYCLAUDE_PLATFORMS")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CONFIG_HOME")
+    return (Path(base) if base else Path.home() / ".config") / "myclaude" / "platforms.toml"
+
+
+def _warn(message: str) -> None:
+    print(f"[WARN] {message}", file=sys.stderr)
+
+
+def _entry_point_definitions() -> dict[str, dict[str, Any]]:
+    from importlib.metadata import entry_points
+
+    definitions: dict[str, dict[str, Any]] = {}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            loaded = entry_point.load()
+            loaded = loaded() if callable(loaded) else loaded
+        except Exception as e:
+            # A broken plugin must not take the installer down with it
+            _warn(f"Ignoring platform plugin '{entry_point.name}': {e}")
+            continue
+        if not isinstance(loaded, dict):
+            _warn(f"Ignoring platform plugin '{entry_point.name}': expected a dict, got {type(loaded).__name__}")
+            continue
+        for name, table in loaded.items():
+            if isinstance(table, dict):
+                definitions[name] = table
+            else:
+                _warn(f"Ignoring platform '{name}' from plugin '{entry_point.name}': expected a table")
+    return definitions
+
+
+def _file_definitions(path: Path) -> dict[str, dict[str, Any]]:
+    if tomllib is None or not path.is_file():
+        return {}
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        # The installer must still start; only the built-in and plugin platforms are used
+        _warn(f"Ignoring platform definitions in {path}: {e}")
+        return {}
+    for name in [name for name, table in data.items() if not isinstance(table, dict)]:
+        _warn(f"Ignoring '{name}' in {path}: expected a [table]")
+        del data[name]
+    return data
+
+
+@lru_cache(maxsize=None)
+def load_platforms(home: Optional[Path] = None, config_file: Optional[Path] = None) -> dict[str, Platform]:
+    """合并内置、entry point 与 TOML 中的平台定义 (结果缓存)
+
+    Args:
+        home: 展开 ``~`` 使用的目录 (默认当前用户主目录)
+        config_file: TOML 定义文件 (默认 platforms_file())
+
+    Returns:
+        平台 ID -> Platform，内置平台在前，新增平台按出现顺序排在后面
+    """
+    home = home or Path.home()
+    definitions = {name: dict(data) for name, data in BUILTIN_PLATFORMS.items()}
+    for source in (_entry_point_definitions(), _file_definitions(config_file or platforms_file())):
+        for name, data in source.items():
+            if data.get("enabled", True) is False:
+                definitions.pop(name, None)
+            else:
+                # Partial definitions adjust an existing platform (e.g. only 'base')
+                definitions[name] = {**definitions.get(name, {}), **data}
+    platforms = {}
+    for name, data in definitions.items():
+        try:
+            platforms[name] = platform_from_dict(name, data, home)
+        except PlatformError as e:
+            if name not in BUILTIN_PLATFORMS:
+                _warn(f"{e}; skipping it")
+                continue
+            _warn(f"{e}; using the built-in definition")
+            platforms[name] = platform_from_dict(name, BUILTIN_PLATFORMS[name], home)
+    return platforms
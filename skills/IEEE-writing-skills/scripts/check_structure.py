@@ -1,8 +1,169 @@
-import sys
-import re
+import argparse
 import json
+import re
+import sys
+from pathlib import Path
+
+DEFAULT_FORBIDDEN = [
+    "very", "amazing", "totally", "huge", "incredible",
+    "unfortunately", "obviously", "surprisingly",
+    "a lot of", "kind of", "basically", "actually",
+    "I think", "I believe", "I feel"
+]
+
+REQUIRED_SECTIONS = ["Introduction", "Conclusion", "References"]
+PAPER_SUFFIXES = {".tex", ".txt", ".md"}
+# Repository documents a directory check skips (matched on the lowercased stem)
+NON_PAPER_STEMS = {"readme", "changelog", "changes", "history", "contributing", "license",
+                   "code_of_conduct", "security", "authors", "notice", "todo"}
+
+# LaTeX structure: real \section headings, the abstract environment and the bibliography
+LATEX_TOKEN = re.compile(
+    r'\\(?P<level>section|subsection)\*?\s*(?:\[[^\]]*\])?\s*\{(?P<title>[^}]*)\}'
+    r'|\\(?P<env>begin|end)\{abstract\}'
+    r'|(?P<bib>\\bibliography\{|\\printbibliography|\\begin\{thebibliography\})'
+)
+# Plain-text IEEE layout: "Abstract—...", "Index Terms—...", "I. INTRODUCTION" (or a
+# Markdown heading), "REFERENCES"
+TEXT_ABSTRACT = re.compile(r'^\s*Abstract\s*[—:\-]+\s*', re.IGNORECASE)
+TEXT_INDEX_TERMS = re.compile(r'^\s*Index Terms\s*[—:\-]', re.IGNORECASE)
+TEXT_HEADING = re.compile(
+    r'^\s*(?:(?P<number>[IVX]+|\d+)\.|#{1,3})\s+(?P<title>[A-Z][A-Za-z ,&\-]{2,60})\s*$')
+# Words a title-case heading may leave in lower case
+MINOR_WORDS = {"a", "an", "the", "and", "or", "nor", "but", "for", "of", "in", "on", "to",
+               "at", "by", "with", "from", "via", "vs", "as"}
+HEADING_MAX_WORDS = 8
+TEXT_REFERENCES = re.compile(r'^\s*References\s*$', re.IGNORECASE)
+
+COMMENT = re.compile(r'(?<!\\)%.*')
+# Commands whose argument is not body prose (headings included) are blanked with it
+COMMAND = re.compile(
+    r'\\(?:(?:sub)*section|begin|end|label|ref|eqref|cite[a-z]*|bibliography[a-z]*|includegraphics)\*?'
+    r'(?:\[[^\]]*\])?\{[^}]*\}'
+    r'|\\[A-Za-z@]+\*?|\$[^$]*\$'
+)
+WORD = re.compile(r"[A-Za-z0-9]+(?:['\-][A-Za-z0-9]+)*")
+
+
+def compile_forbidden(phrases):
+    """One case-insensitive alternation for all phrases (longest first), so a
+    line is scanned once regardless of how many phrases are configured."""
+    alternatives = sorted({p.strip() for p in phrases if p.strip()}, key=len, reverse=True)
+    if not alternatives:
+        return None
+    body = "|".join(r"\s+".join(re.escape(w) for w in p.split()) for p in alternatives)
+    return re.compile(fr"\b(?:{body})\b", re.IGNORECASE)
+
+
+def load_forbidden(path):
+    """Phrases from a file: one per line, '#' starts a comment."""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.split("#", 1)[0].strip() for line in lines if line.split("#", 1)[0].strip()]
+
+
+def is_text_heading(match, previous):
+    """A numbered line is a heading only in heading shape (title case or
+    capitals, at most HEADING_MAX_WORDS words); arabic-numbered ones must also
+    follow a blank line, as list items rarely do.
+
+    Markdown headings always count. "1. Related Work" and "II. METHOD" are
+    headings; "1. Results were good" (sentence case) or an item following
+    another list line are not.
+    """
+    if not match.group("number"):
+        return True
+    if match.group("number").isdigit() and previous.strip():
+        return False
+    words = match.group("title").split()
+    if len(words) > HEADING_MAX_WORDS:
+        return False
+    return all(word[0].isupper() or word.lower() in MINOR_WORDS for word in words)
+
+
+def analyze(content, forbidden):
+    """Single pass over the lines: sections, abstract, word counts and findings."""
+    latex = "\\begin{document}" in content or "\\section" in content
+    in_body = "\\begin{document}" not in content
+    sections = []
+    current = {"title": "(front matter)", "line": 1, "words": 0}
+    abstract = None
+    in_abstract = False
+    has_bibliography = False
+    findings = []
+    total_words = 0
+    previous = ""
 
-def check_structure(file_path):
+    for number, line in enumerate(content.split("\n"), 1):
+        if latex:
+            line = COMMENT.sub("", line)
+            if not in_body:
+                in_body = "\\begin{document}" in line
+                continue
+        text = line
+        if latex and "\\" in line:
+            for match in LATEX_TOKEN.finditer(line):
+                if match.group("level") == "section":
+                    in_abstract = False
+                    sections.append(current)
+                    current = {"title": match.group("title").strip(), "line": number, "words": 0}
+                elif match.group("env") == "begin":
+                    in_abstract = True
+                    abstract = {"line": number, "words": 0}
+                elif match.group("env") == "end":
+                    in_abstract = False
+                elif match.group("bib"):
+                    has_bibliography = True
+            # Blank out commands and inline math, keeping columns aligned
+            text = COMMAND.sub(lambda m: " " * len(m.group(0)), line)
+        elif not latex:
+            heading = TEXT_HEADING.match(line)
+            if heading and not is_text_heading(heading, previous):
+                heading = None
+            previous = line
+            if heading or TEXT_REFERENCES.match(line):
+                in_abstract = False
+                sections.append(current)
+                title = heading.group("title").strip() if heading else line.strip()
+                current = {"title": title.title(), "line": number, "words": 0}
+                if current["title"] == "Abstract":
+                    in_abstract = True
+                    abstract = {"line": number, "words": 0}
+                continue
+            if TEXT_INDEX_TERMS.match(line):
+                in_abstract = False
+            opening = TEXT_ABSTRACT.match(line)
+            if opening:
+                in_abstract = True
+                abstract = {"line": number, "words": 0}
+                text = " " * opening.end() + line[opening.end():]
+
+        words = len(WORD.findall(text))
+        total_words += words
+        current["words"] += words
+        if in_abstract:
+            abstract["words"] += words
+
+        if forbidden is not None:
+            for match in forbidden.finditer(text):
+                findings.append({
+                    "line": number,
+                    "column": match.start() + 1,
+                    "phrase": " ".join(match.group(0).split()),
+                    "section": current["title"],
+                })
+    sections.append(current)
+    if sections[0]["words"] == 0:
+        sections.pop(0)
+    return {
+        "sections": sections,
+        "abstract": abstract,
+        "has_bibliography": has_bibliography,
+        "findings": findings,
+        "total_words": total_words,
+    }
+
+
+def check_structure(file_path, forbidden_words=None):
     report = {
         "status": "success",
         "issues": [],
@@ -15,54 +176,81 @@ def check_structure(file_path):
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+    forbidden = compile_forbidden(DEFAULT_FORBIDDEN if forbidden_words is None else forbidden_words)
+    result = analyze(content, forbidden)
+    report["metrics"]["total_word_count"] = result["total_words"]
+    report["metrics"]["sections"] = result["sections"]
+
     # 1. Abstract Check
-    # Look for "Abstract" header/start
-    abstract_match = re.search(r'Abstract[—:-](.*?)(Index Terms|Introduction|I\.|1\.)', content, re.DOTALL | re.IGNORECASE)
-    if abstract_match:
-        abstract_text = abstract_match.group(1).strip()
-        word_count = len(abstract_text.split())
+    abstract = result["abstract"]
+    if abstract:
+        word_count = abstract["words"]
         report["metrics"]["abstract_word_count"] = word_count
         if word_count < 150:
-            report["issues"].append(f"Abstract is too short ({word_count} words). Minimum is 150.")
+            report["issues"].append(f"Abstract is too short ({word_count} words, line {abstract['line']}). Minimum is 150.")
         elif word_count > 250:
-            report["issues"].append(f"Abstract is too long ({word_count} words). Maximum is 250.")
+            report["issues"].append(f"Abstract is too long ({word_count} words, line {abstract['line']}). Maximum is 250.")
     else:
-        report["issues"].append("Could not automatically detect 'Abstract' section. Ensure it starts with 'Abstract—' or similar.")
+        report["issues"].append("Could not detect the abstract. Use \\begin{abstract} or start it with 'Abstract—'.")
 
-    # 2. Section Check
-    required_sections = ["Introduction", "Conclusion", "References"]
+    # 2. Section Check (headings only, not the word anywhere in the text)
+    titles = [s["title"].lower() for s in result["sections"]]
     missing_sections = []
-    for sec in required_sections:
-        if not re.search(fr'\b{sec}\b', content, re.IGNORECASE):
+    for sec in REQUIRED_SECTIONS:
+        found = any(title.startswith(sec.lower()) for title in titles)
+        if sec == "References":
+            found = found or result["has_bibliography"]
+        if not found:
             missing_sections.append(sec)
-    
+
     if missing_sections:
         report["issues"].append(f"Missing required sections: {', '.join(missing_sections)}")
 
     # 3. Tone Guard (Forbidden Words)
-    forbidden_words = [
-        "very", "amazing", "totally", "huge", "incredible", 
-        "unfortunately", "obviously", "surprisingly", 
-        "a lot of", "kind of", "basically", "actually",
-        "I think", "I believe", "I feel"
-    ]
-    
-    found_forbidden = []
-    for word in forbidden_words:
-        # Simple word boundary check
-        matches = re.findall(fr'\b{re.escape(word)}\b', content, re.IGNORECASE)
-        if matches:
-            found_forbidden.append(f"{word} ({len(matches)})")
-    
-    if found_forbidden:
+    findings = result["findings"]
+    report["findings"] = findings
+    if findings:
+        counts = {}
+        for finding in findings:
+            key = finding["phrase"].lower()
+            counts[key] = counts.get(key, 0) + 1
+        found_forbidden = [f"{word} ({count})" for word, count in counts.items()]
         report["issues"].append(f"Found forbidden/non-academic words: {', '.join(found_forbidden)}")
 
     return report
 
+
+def check_directory(directory, forbidden_words=None):
+    """Check every paper (.tex/.txt/.md) under a directory in one process.
+
+    README, CHANGELOG and similar repository documents are skipped.
+    """
+    files = sorted(p for p in Path(directory).rglob("*")
+                   if p.suffix in PAPER_SUFFIXES and p.stem.lower() not in NON_PAPER_STEMS and p.is_file())
+    reports = {str(p): check_structure(p, forbidden_words) for p in files}
+    return {
+        "status": "success",
+        "files": reports,
+        "files_with_issues": sum(1 for r in reports.values() if r.get("issues")),
+    }
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="IEEE paper structure and tone check")
+    parser.add_argument("path", nargs="?", help="Paper (.tex/.txt/.md) or a directory of papers")
+    parser.add_argument("--forbidden", help="File with forbidden phrases, one per line (replaces the defaults)")
+    parser.add_argument("--add", action="append", default=[], help="Additional forbidden phrase (repeatable)")
+    args = parser.parse_args()
+
+    if not args.path:
         print(json.dumps({"status": "error", "message": "No file provided"}))
         sys.exit(1)
-    
-    result = check_structure(sys.argv[1])
+
+    words = load_forbidden(args.forbidden) if args.forbidden else list(DEFAULT_FORBIDDEN)
+    words += args.add
+
+    if Path(args.path).is_dir():
+        result = check_directory(args.path, words)
+    else:
+        result = check_structure(args.path, words)
     print(json.dumps(result, indent=2))
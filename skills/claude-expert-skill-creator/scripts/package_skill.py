@@ -6,10 +6,12 @@ Packages a skill folder into a deployment-ready .zip file.
 
 Usage:
     python package_skill.py <skill-folder> <version> [output-dir]
+    python package_skill.py --all <skills-dir> [--jobs N] [--output DIR]
 
 Examples:
     python package_skill.py ./billing-migration 1.0
     python package_skill.py /path/to/my-skill 2.1 ./releases
+    python package_skill.py --all ../../ --jobs 8 --output ./releases
 
 Creates:
     skill-name-v{version}.zip
@@ -19,18 +21,65 @@ What it does:
     2. Generates DIRECTORY_STRUCTURE.txt
     3. Generates README.md (if missing)
     4. Creates versioned .zip file
+
+The source folder is never modified: generated files are written straight
+into the archive. Files matching .skillignore (gitignore-style globs, one
+per line) or the built-in ignores (.git/, __pycache__/, *.pyc, ...) are
+left out. Directories and files listed in .skillbundle ("<source> <archive
+path>" per line, source relative to the skill folder) are copied into the
+archive, so skills that share code with the repository package
+self-contained.
+Entries are sorted and timestamped with SOURCE_DATE_EPOCH (or
+1980-01-01), and the "Created" date comes from SOURCE_DATE_EPOCH or the
+skill's last git commit, so identical skills give byte-identical archives.
+
+--all packages every skill folder (a directory with SKILL.md) in parallel.
+Each skill's version comes from its frontmatter (default: --default-version).
+Archives are cached by a hash of the skill's content, so unchanged skills
+are copied from the cache instead of re-zipped, and release-index.json
+lists name, version, hash, size and token budget of every package.
 """
 
+import argparse
+import fnmatch
+import hashlib
+import importlib.util
+import json
+import os
 import re
 import shutil
+import subprocess
 import sys
-from datetime import datetime
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
+IGNORE_FILE = ".skillignore"
+BUNDLE_FILE = ".skillbundle"
+DEFAULT_IGNORE = [
+    ".git/", ".hg/", ".svn/", "__pycache__/", ".pytest_cache/", ".mypy_cache/",
+    "*.pyc", "*.pyo", ".DS_Store", "Thumbs.db", "*.zip",
+    IGNORE_FILE, BUNDLE_FILE, "DIRECTORY_STRUCTURE.txt",
+]
+GENERATED_STRUCTURE = "DIRECTORY_STRUCTURE.txt"
+
+# Already-compressed formats are stored; other files are deflated unless a
+# trial compression of their head saves less than 10%
+STORED_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".pdf", ".zip", ".gz",
+    ".tgz", ".bz2", ".xz", ".7z", ".woff", ".woff2", ".mp3", ".mp4", ".webm",
+}
+SAMPLE_SIZE = 64 * 1024
+MIN_SAVING = 0.10
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+RELEASE_INDEX = "release-index.json"
+
 
 def extract_frontmatter(skill_md_path: Path) -> dict:
-    """Extract YAML frontmatter from SKILL.md."""
-    content = skill_md_path.read_text()
+    """Extract YAML frontmatter from SKILL.md (scalars and | / > blocks)."""
+    content = skill_md_path.read_text(encoding="utf-8")
     
     if not content.startswith('---'):
         return {}
@@ -40,34 +89,200 @@ def extract_frontmatter(skill_md_path: Path) -> dict:
         return {}
     
     frontmatter = {}
-    for line in parts[1].strip().split('\n'):
-        if ':' in line:
+    block_key, block, folded = None, [], False
+    for line in parts[1].strip('\n').split('\n'):
+        if block_key and (not line.strip() or line[:1] in (' ', '\t')):
+            block.append(line.strip())
+            continue
+        if block_key:
+            frontmatter[block_key] = (' ' if folded else '\n').join(block).strip()
+            block_key, block = None, []
+        if ':' in line and line[:1] not in (' ', '\t'):
             key, value = line.split(':', 1)
-            frontmatter[key.strip()] = value.strip()
+            value = value.strip()
+            if value[:1] in ('|', '>'):
+                block_key, folded = key.strip(), value[0] == '>'
+            else:
+                frontmatter[key.strip()] = value.strip('"\'')
+    if block_key:
+        frontmatter[block_key] = (' ' if folded else '\n').join(block).strip()
     
     return frontmatter
 
 
-def estimate_tokens(text: str) -> int:
-    """Rough token estimate (~4 chars per token for English)."""
-    return len(text) // 4
+def load_token_budget():
+    """
+    The repository's token_budget module: the one token estimator and
+    Layer 2 definition shared with install.py.
+    
+    Loaded from the copy next to this script (kept identical to the
+    repository's, see token_budget.py). Returns None when it is missing.
+    """
+    path = Path(__file__).resolve().parent / "token_budget.py"
+    if not path.is_file():
+        return None
+    name = "_package_skill_token_budget"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses look the module up while the class is created
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+TOKEN_BUDGET = load_token_budget()
+
+
+def source_date(skill_path: Path = None) -> datetime:
+    """
+    Build date, identical across runs on the same sources.
+    
+    SOURCE_DATE_EPOCH if set, else the time of the last git commit touching
+    the skill folder, else the zip epoch (1980-01-01).
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch and epoch.isdigit():
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    if skill_path is not None:
+        try:
+            result = subprocess.run(["git", "log", "-1", "--format=%ct", "--", "."], cwd=skill_path,
+                                    capture_output=True, text=True, timeout=10)
+            if result.returncode == 0 and result.stdout.strip().isdigit():
+                return datetime.fromtimestamp(int(result.stdout.strip()), tz=timezone.utc)
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return datetime(*ZIP_EPOCH, tzinfo=timezone.utc)
+
+
+def load_ignore_patterns(skill_path: Path) -> list[str]:
+    """Built-in ignores plus the skill's .skillignore patterns."""
+    patterns = list(DEFAULT_IGNORE)
+    ignore_file = skill_path / IGNORE_FILE
+    if ignore_file.is_file():
+        for line in ignore_file.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                patterns.append(line)
+    return patterns
+
+
+def is_ignored(rel_path: str, is_dir: bool, patterns: list[str]) -> bool:
+    """Match a relative POSIX path against gitignore-style glob patterns.
+
+    A trailing "/" matches directories only; a pattern containing "/" is
+    matched against the whole path, otherwise against the name.
+    """
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        if pattern.endswith("/"):
+            if not is_dir:
+                continue
+            pattern = pattern.rstrip("/")
+        if "/" in pattern:
+            if fnmatch.fnmatchcase(rel_path, pattern.lstrip("/")):
+                return True
+        elif fnmatch.fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def collect_files(skill_path: Path, patterns: list[str] = None) -> list[str]:
+    """Relative POSIX paths of the files to package, sorted."""
+    patterns = load_ignore_patterns(skill_path) if patterns is None else patterns
+    files = []
+    for root, dirs, names in os.walk(skill_path):
+        rel_root = Path(root).relative_to(skill_path).as_posix()
+        prefix = "" if rel_root == "." else f"{rel_root}/"
+        dirs[:] = sorted(d for d in dirs if not is_ignored(prefix + d, True, patterns))
+        for name in names:
+            if not is_ignored(prefix + name, False, patterns):
+                files.append(prefix + name)
+    return sorted(files)
+
+
+def collect_bundles(skill_path: Path) -> dict[str, Path]:
+    """Archive path -> source file of the entries listed in .skillbundle.
+
+    Each line reads ``<source> <archive path>``; the source is a directory
+    or file relative to the skill folder and may point outside it (e.g. a
+    sibling skill's scripts). Built-in ignores apply to bundled files too.
+    """
+    bundle_file = skill_path / BUNDLE_FILE
+    if not bundle_file.is_file():
+        return {}
+    bundled = {}
+    for line in bundle_file.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) != 2:
+            raise ValueError(f"{bundle_file}: expected '<source> <archive path>', got: {line}")
+        source = (skill_path / parts[0]).resolve()
+        prefix = parts[1].strip("/")
+        if source.is_file():
+            bundled[prefix] = source
+            continue
+        if not source.is_dir():
+            raise FileNotFoundError(f"{bundle_file}: bundled path not found: {source}")
+        for rel_path in collect_files(source, list(DEFAULT_IGNORE)):
+            bundled[f"{prefix}/{rel_path}"] = source / rel_path
+    return bundled
+
+
+def token_budget(skill_path: Path, files: list[str]) -> dict:
+    """
+    Estimated tokens per loading layer, counted like ``install.py budget``.
+    
+    None when the token_budget module is not available.
+    """
+    if TOKEN_BUDGET is None:
+        return None
+    estimate = TOKEN_BUDGET.estimate_tokens
+    
+    def read(rel_path: str) -> str:
+        try:
+            return (skill_path / rel_path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return ""
+    
+    # Layer 0 is what the agent always sees: name and description
+    skill_md = read("SKILL.md")
+    frontmatter = TOKEN_BUDGET.parse_frontmatter(skill_md)
+    desc_tokens = estimate(f"{frontmatter.get('name', skill_path.name)}: {frontmatter.get('description', '')}")
+    layer2_tokens = sum(estimate(read(rel_path)) for rel_path in files if TOKEN_BUDGET.is_doc_file(rel_path))
+    
+    return {"layer0": desc_tokens, "layer1": estimate(skill_md), "layer2": layer2_tokens}
 
 
-def generate_directory_structure(skill_path: Path, version: str) -> str:
+def generate_directory_structure(skill_path: Path, version: str, files: list[str] = None,
+                                 bundled: dict[str, Path] = None, created: str = None) -> str:
     """Generate DIRECTORY_STRUCTURE.txt content."""
+    files = collect_files(skill_path) if files is None else files
+    created = created or source_date(skill_path).strftime('%Y-%m-%d')
+    
+    # Nested dicts: directory name -> subtree, file name -> None
+    tree: dict = {}
+    # The archive always holds the generated structure file and a README
+    for rel_path in set(files) | set(bundled or {}) | {GENERATED_STRUCTURE, "README.md"}:
+        node = tree
+        parts = rel_path.split("/")
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = None
     
-    def build_tree(path: Path, prefix: str = "") -> list[str]:
+    def build_tree(node: dict, prefix: str = "") -> list[str]:
         """Recursively build directory tree."""
         lines = []
-        children = sorted(path.iterdir(), key=lambda x: (x.is_file(), x.name))
+        children = sorted(node.items(), key=lambda x: (x[1] is None, x[0]))
         
-        for i, child in enumerate(children):
+        for i, (name, child) in enumerate(children):
             is_last = i == len(children) - 1
             connector = "└── " if is_last else "├── "
-            suffix = "/" if child.is_dir() else ""
-            lines.append(f"{prefix}{connector}{child.name}{suffix}")
+            suffix = "/" if child is not None else ""
+            lines.append(f"{prefix}{connector}{name}{suffix}")
             
-            if child.is_dir():
+            if child is not None:
                 extension = "    " if is_last else "│   "
                 lines.extend(build_tree(child, prefix + extension))
         
@@ -75,46 +290,36 @@ def generate_directory_structure(skill_path: Path, version: str) -> str:
     
     # Build tree
     tree_lines = [f"{skill_path.name}/"]
-    tree_lines.extend(build_tree(skill_path))
-    
-    # Estimate tokens
-    skill_md = skill_path / "SKILL.md"
-    layer1_tokens = estimate_tokens(skill_md.read_text()) if skill_md.exists() else 0
-    
-    # Extract description token count
-    frontmatter = extract_frontmatter(skill_md) if skill_md.exists() else {}
-    desc = frontmatter.get('description', '')
-    desc_tokens = len(desc.split())
-    
-    # Layer 2 tokens
-    resources_path = skill_path / "resources"
-    layer2_tokens = 0
-    if resources_path.exists():
-        for md_file in resources_path.rglob("*.md"):
-            layer2_tokens += estimate_tokens(md_file.read_text())
+    tree_lines.extend(build_tree(tree))
     
+    budget = token_budget(skill_path, files)
     structure = "\n".join(tree_lines)
+    if budget is None:
+        budget_lines = "Token Budget: unavailable (token_budget.py not found)"
+    else:
+        budget_lines = f"""Token Budget:
+- Layer 0 (description): ~{budget['layer0']} tokens (always loaded)
+- Layer 1 (SKILL.md): ~{budget['layer1']} tokens (loaded on trigger)
+- Layer 2 (other documents): ~{budget['layer2']} tokens (loaded selectively)"""
     
     return f"""{structure}
 
-Token Budget:
-- Layer 0 (description): ~{desc_tokens} tokens (always loaded)
-- Layer 1 (SKILL.md): ~{layer1_tokens} tokens (loaded on trigger)
-- Layer 2 (resources/): ~{layer2_tokens} tokens (loaded selectively)
+{budget_lines}
 
 Version: {version}
-Created: {datetime.now().strftime('%Y-%m-%d')}
+Created: {created}
 """
 
 
-def generate_readme(skill_name: str, version: str) -> str:
+def generate_readme(skill_name: str, version: str, created: str = None) -> str:
     """Generate README.md with deployment instructions."""
     title = skill_name.replace('-', ' ').replace('_', ' ').title()
+    created = created or source_date().strftime('%Y-%m-%d')
     
     return f"""# {title}
 
 **Version:** {version}  
-**Created:** {datetime.now().strftime('%Y-%m-%d')}
+**Created:** {created}
 
 ## Quick Deploy
 
@@ -159,7 +364,111 @@ See `SKILL.md` for:
 """
 
 
-def package_skill(skill_path: Path, version: str, output_dir: Path = None) -> Path:
+def choose_compression(path: Path) -> int:
+    """ZIP_STORED for incompressible files, ZIP_DEFLATED otherwise."""
+    if path.suffix.lower() in STORED_SUFFIXES:
+        return zipfile.ZIP_STORED
+    with open(path, "rb") as f:
+        sample = f.read(SAMPLE_SIZE)
+    if not sample:
+        return zipfile.ZIP_STORED
+    saving = 1 - len(zlib.compress(sample, 1)) / len(sample)
+    return zipfile.ZIP_DEFLATED if saving >= MIN_SAVING else zipfile.ZIP_STORED
+
+
+def _zip_info(arcname: str, mode: int) -> zipfile.ZipInfo:
+    """Entry header with platform-independent, normalized metadata."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    date_time = ZIP_EPOCH
+    if epoch and epoch.isdigit():
+        date_time = max(ZIP_EPOCH, source_date().timetuple()[:6])
+    info = zipfile.ZipInfo(arcname, date_time=date_time)
+    info.create_system = 3  # Unix, so the mode bits below are honoured
+    info.external_attr = mode << 16
+    if arcname.endswith("/"):
+        info.external_attr |= 0x10  # MS-DOS directory flag
+    return info
+
+
+def write_archive(zip_path: Path, skill_path: Path, files: list[str], generated: dict[str, str],
+                  bundled: dict[str, Path] = None) -> None:
+    """
+    Stream a deterministic archive with the skill folder as root.
+    
+    Args:
+        zip_path: Archive to create (replaced atomically)
+        skill_path: Skill folder
+        files: Relative paths of the source files to include
+        generated: Relative path -> content of files injected into the archive
+        bundled: Relative path -> source file outside the skill folder
+    """
+    root = skill_path.name
+    entries = {rel_path: skill_path / rel_path for rel_path in files}
+    entries.update(bundled or {})
+    entries.update(generated)
+    directories = {"/".join(rel_path.split("/")[:i])
+                   for rel_path in entries for i in range(1, rel_path.count("/") + 1)}
+    
+    tmp_path = zip_path.with_name(f".{zip_path.name}.{os.getpid()}.tmp")
+    try:
+        with zipfile.ZipFile(tmp_path, "w") as zf:
+            zf.writestr(_zip_info(f"{root}/", 0o40755), b"")
+            for rel_path in sorted(set(entries) | directories):
+                if rel_path in directories:
+                    zf.writestr(_zip_info(f"{root}/{rel_path}/", 0o40755), b"")
+                    continue
+                source = entries[rel_path]
+                if isinstance(source, str):
+                    info = _zip_info(f"{root}/{rel_path}", 0o100644)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    zf.writestr(info, source.encode("utf-8"))
+                    continue
+                executable = os.access(source, os.X_OK)
+                info = _zip_info(f"{root}/{rel_path}", 0o100755 if executable else 0o100644)
+                info.compress_type = choose_compression(source)
+                with open(source, "rb") as src, zf.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp_path, zip_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def skill_content_hash(skill_path: Path, version: str, files: list[str],
+                       bundled: dict[str, Path] = None) -> str:
+    """
+    Hash of everything that determines a skill's archive.
+    
+    Covers every input of the archive: the packaged and bundled files
+    (path, executable bit, content), the version, SOURCE_DATE_EPOCH (entry
+    timestamps), the Created date of the generated files and this script
+    and the token estimator, so a packager change also invalidates cached
+    archives.
+    """
+    created = source_date(skill_path).strftime('%Y-%m-%d')
+    digest = hashlib.sha256()
+    digest.update(file_sha256(Path(__file__)).encode())
+    if TOKEN_BUDGET is not None:
+        digest.update(file_sha256(Path(TOKEN_BUDGET.__file__)).encode())
+    digest.update(f"\0{version}\0{os.environ.get('SOURCE_DATE_EPOCH', '')}\0{created}\n".encode())
+    sources = {rel_path: skill_path / rel_path for rel_path in files}
+    sources.update(bundled or {})
+    for rel_path, source in sorted(sources.items()):
+        executable = "x" if os.access(source, os.X_OK) else "-"
+        digest.update(f"{rel_path}\0{executable}\0{file_sha256(source)}\n".encode())
+    return digest.hexdigest()
+
+
+def package_skill(skill_path: Path, version: str, output_dir: Path = None, quiet: bool = False) -> Path:
     """
     Package skill into deployment-ready .zip file.
     
@@ -167,10 +476,12 @@ def package_skill(skill_path: Path, version: str, output_dir: Path = None) -> Pa
         skill_path: Path to skill folder
         version: Version number (e.g., "1.0")
         output_dir: Where to create .zip (default: current directory)
+        quiet: Suppress progress output (batch mode)
     
     Returns:
         Path to created .zip file
     """
+    log = (lambda *args, **kwargs: None) if quiet else print
     skill_path = skill_path.resolve()
     output_dir = (output_dir or Path.cwd()).resolve()
     
@@ -186,50 +497,198 @@ def package_skill(skill_path: Path, version: str, output_dir: Path = None) -> Pa
         raise ValueError(f"Invalid version format: {version}. Use X.Y (e.g., 1.0, 2.1)")
     
     skill_name = skill_path.name
-    print(f"📦 Packaging: {skill_name} v{version}")
-    print(f"   Source: {skill_path}")
+    log(f"📦 Packaging: {skill_name} v{version}")
+    log(f"   Source: {skill_path}")
+    
+    files = collect_files(skill_path)
+    bundled = collect_bundles(skill_path)
+    if bundled:
+        log(f"   ✓ Bundling {len(bundled)} files listed in {BUNDLE_FILE}")
+    generated = {}
+    created = source_date(skill_path).strftime('%Y-%m-%d')
     
     # Generate DIRECTORY_STRUCTURE.txt
-    structure_content = generate_directory_structure(skill_path, version)
-    (skill_path / "DIRECTORY_STRUCTURE.txt").write_text(structure_content)
-    print("   ✓ Generated DIRECTORY_STRUCTURE.txt")
+    generated[GENERATED_STRUCTURE] = generate_directory_structure(skill_path, version, files, bundled, created)
+    log("   ✓ Generated DIRECTORY_STRUCTURE.txt")
     
     # Generate README.md if missing
-    readme_path = skill_path / "README.md"
-    if not readme_path.exists():
-        readme_path.write_text(generate_readme(skill_name, version))
-        print("   ✓ Generated README.md")
+    if "README.md" not in files:
+        generated["README.md"] = generate_readme(skill_name, version, created)
+        log("   ✓ Generated README.md")
     else:
-        print("   ✓ Using existing README.md")
-    
-    # Create zip
-    zip_name = f"{skill_name}-v{version}"
-    zip_path = output_dir / f"{zip_name}.zip"
-    
-    if zip_path.exists():
-        zip_path.unlink()
+        log("   ✓ Using existing README.md")
     
     # Create zip with skill folder as root
-    shutil.make_archive(
-        str(output_dir / zip_name),
-        'zip',
-        skill_path.parent,
-        skill_name
-    )
+    output_dir.mkdir(parents=True, exist_ok=True)
+    zip_path = output_dir / f"{skill_name}-v{version}.zip"
+    write_archive(zip_path, skill_path, files, generated, bundled)
     
     size_kb = zip_path.stat().st_size / 1024
-    print(f"   ✓ Created {zip_path.name} ({size_kb:.1f} KB)")
+    log(f"   ✓ Created {zip_path.name} ({size_kb:.1f} KB, {len(files) + len(bundled)} files)")
+    log(f"   ✓ SHA-256: {file_sha256(zip_path)}")
     
-    print(f"\n✅ Package ready: {zip_path}")
-    print("\nTo deploy:")
-    print("1. Unzip the package")
-    print("2. Claude Desktop → Settings → Skills → Add Skill")
-    print("3. Select the skill folder")
+    log(f"\n✅ Package ready: {zip_path}")
+    log("\nTo deploy:")
+    log("1. Unzip the package")
+    log("2. Claude Desktop → Settings → Skills → Add Skill")
+    log("3. Select the skill folder")
     
     return zip_path
 
 
+def skill_version(skill_path: Path, default: str) -> str:
+    """Version from the SKILL.md frontmatter, if it has a valid one."""
+    version = extract_frontmatter(skill_path / "SKILL.md").get("version", "").strip("\"'")
+    return version if re.match(r'^\d+\.\d+$', version) else default
+
+
+def cache_dir() -> Path:
+    """Per-user package cache (XDG_CACHE_HOME, LOCALAPPDATA or ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    return (Path(base) if base else Path.home() / ".cache") / "skill-packages"
+
+
+def _package_cached(skill_path: Path, version: str, content_hash: str, cache: Path) -> dict:
+    """Worker: package one skill into the cache; returns its metadata."""
+    zip_path = package_skill(skill_path, version, cache / content_hash, quiet=True)
+    files = collect_files(skill_path)
+    meta = {
+        "file": zip_path.name,
+        "sha256": file_sha256(zip_path),
+        "size": zip_path.stat().st_size,
+        "files": len(files) + len(collect_bundles(skill_path)),
+        "tokens": token_budget(skill_path, files),
+    }
+    (cache / content_hash / "meta.json").write_text(json.dumps(meta, indent=2))
+    return meta
+
+
+def package_all(skills_dir: Path, output_dir: Path, jobs: int = None,
+                default_version: str = "1.0", cache: Path = None) -> dict:
+    """
+    Package every skill under a directory, reusing cached archives.
+    
+    Args:
+        skills_dir: Directory whose subfolders with SKILL.md are skills
+        output_dir: Where to put the archives and release-index.json
+        jobs: Worker processes for skills that need packaging (default: CPUs)
+        default_version: Version for skills without one in their frontmatter
+        cache: Archive cache (default: per-user cache directory)
+    
+    Returns:
+        The release index; skills that failed to package are listed under
+        "errors" (name -> message) instead of aborting the batch
+    """
+    skills_dir = skills_dir.resolve()
+    output_dir = (output_dir or Path.cwd()).resolve()
+    cache = (cache or cache_dir()).resolve()
+    skills = sorted(p for p in skills_dir.iterdir() if (p / "SKILL.md").is_file())
+    if not skills:
+        raise FileNotFoundError(f"No skill folders (with SKILL.md) in {skills_dir}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Hash every skill up front; only misses go to the pool
+    plans = []
+    errors = {}
+    for skill_path in skills:
+        try:
+            version = skill_version(skill_path, default_version)
+            content_hash = skill_content_hash(skill_path, version, collect_files(skill_path),
+                                              collect_bundles(skill_path))
+        except Exception as e:
+            errors[skill_path.name] = str(e)
+            continue
+        plans.append((skill_path, version, content_hash))
+    
+    def cached_meta(content_hash: str):
+        try:
+            meta = json.loads((cache / content_hash / "meta.json").read_text())
+        except (OSError, ValueError):
+            return None
+        return meta if (cache / content_hash / meta["file"]).is_file() else None
+    
+    entries = {}
+    misses = []
+    for skill_path, version, content_hash in plans:
+        meta = cached_meta(content_hash)
+        if meta is None:
+            misses.append((skill_path, version, content_hash))
+        else:
+            entries[skill_path.name] = (meta, True)
+    
+    if misses:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(_package_cached, skill_path, version, content_hash, cache): skill_path.name
+                       for skill_path, version, content_hash in misses}
+            for future, name in futures.items():
+                try:
+                    entries[name] = (future.result(), False)
+                except Exception as e:
+                    errors[name] = str(e)
+    
+    index = {"skills": []}
+    for skill_path, version, content_hash in plans:
+        if skill_path.name not in entries:
+            continue
+        meta, cached = entries[skill_path.name]
+        target = output_dir / meta["file"]
+        if not target.is_file() or file_sha256(target) != meta["sha256"]:
+            shutil.copyfile(cache / content_hash / meta["file"], target)
+        index["skills"].append({
+            "name": skill_path.name,
+            "version": version,
+            "hash": content_hash,
+            "file": meta["file"],
+            "sha256": meta["sha256"],
+            "size": meta["size"],
+            "tokens": meta["tokens"],
+            "cached": cached,
+        })
+        status = "cached" if cached else "packaged"
+        print(f"   ✓ {meta['file']} ({meta['size'] / 1024:.1f} KB, {status})")
+    for name, message in sorted(errors.items()):
+        print(f"   ✗ {name}: {message}", file=sys.stderr)
+    if errors:
+        index["errors"] = dict(sorted(errors.items()))
+    
+    (output_dir / RELEASE_INDEX).write_text(json.dumps(index, indent=2) + "\n")
+    return index
+
+
+def main_all(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Package every skill in a directory")
+    parser.add_argument("--all", dest="skills_dir", required=True, type=Path, help="Directory of skill folders")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Parallel packaging processes (default: CPUs)")
+    parser.add_argument("--output", "-o", type=Path, default=None, help="Output directory (default: current)")
+    parser.add_argument("--default-version", default="1.0", help="Version for skills without one (default: 1.0)")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="Archive cache (default: ~/.cache/skill-packages)")
+    args = parser.parse_args(argv)
+    
+    if not re.match(r'^\d+\.\d+$', args.default_version):
+        print(f"\n❌ Error: Invalid version format: {args.default_version}. Use X.Y", file=sys.stderr)
+        return 1
+    
+    print(f"📦 Packaging all skills in {args.skills_dir}")
+    try:
+        index = package_all(args.skills_dir, args.output, args.jobs, args.default_version, args.cache_dir)
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        return 1
+    
+    packaged = sum(1 for entry in index["skills"] if not entry["cached"])
+    output_dir = (args.output or Path.cwd()).resolve()
+    print(f"\n✅ {len(index['skills'])} packages ready ({packaged} packaged, "
+          f"{len(index['skills']) - packaged} from cache): {output_dir / RELEASE_INDEX}")
+    if index.get("errors"):
+        print(f"❌ {len(index['errors'])} skills failed", file=sys.stderr)
+        return 1
+    return 0
+
+
 def main():
+    if any(arg == "--all" or arg.startswith("--all=") for arg in sys.argv[1:]):
+        sys.exit(main_all(sys.argv[1:]))
+    
     if len(sys.argv) < 3:
         print(__doc__)
         sys.exit(1)
@@ -0,0 +1,310 @@
+"""
+技能 token 预算统计
+
+按加载层级估算每个技能占用的上下文:
+- Layer 0: frontmatter 的 name + description (始终加载)
+- Layer 1: SKILL.md 全文 (触发时加载)
+- Layer 2: 其余文档资源 references/、resources/ 等 (按需加载)
+
+默认使用本地近似 BPE 估算器 (无依赖，处理中英文、代码与 Markdown)；
+安装了 tiktoken 时可通过环境变量 SKILL_TOKENIZER=tiktoken 切换为精确计数。
+结果按文件内容哈希缓存在用户缓存目录中。
+
+latex-paper-en (scripts/latex_toolkit/) 与 claude-expert-skill-creator (scripts/)
+各带一份本文件的副本，技能单独安装或打包后仍使用同一估算器；修改本文件时同步
+更新副本 (测试会检查三者一致)。
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+# Bump when the estimator changes so cached counts are recomputed
+ESTIMATOR_VERSION = 1
+
+# Files loaded as Layer 2 context (scripts are executed, not read)
+DOC_SUFFIXES = {".md", ".txt", ".rst", ".json", ".yaml", ".yml", ".toml", ".csv", ".tex", ".bib"}
+SKIP_DIRS = {"scripts", "__pycache__", ".git"}
+
+# One alternative per token class; see estimate_tokens for the weights
+_PIECE = re.compile(
+    r"(?P<cjk>[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af\uff00-\uffef\u3000-\u303f]+)"
+    r"|(?P<word>[A-Za-z]+)"
+    r"|(?P<digits>\d+)"
+    r"|(?P<newlines>\n+)"
+    r"|(?P<spaces>[ \t]{2,})"
+    r"|(?P<punct>[!-/:-@\[-`{-~]+)"
+    r"|(?P<emoji>[\U0001F000-\U0001FFFF\u2600-\u27bf])"
+    r"|(?P<other>[^\x00-\x7f])"
+)
+# Lowercase-to-uppercase and letter runs inside identifiers (camelCase, HTTPServer)
+_SUBWORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """近似 BPE token 数 (以 cl100k/o200k 类词表为参照)
+
+    - CJK 字符: 每字约 1.2 token
+    - 英文单词: 按驼峰拆分，每段 1 token，长段每 6 个字母再加 1
+    - 数字: 每 3 位 1 token
+    - 连续换行、缩进空白: 每段 1 token (单个空格并入后一个词)
+    - 标点串 (Markdown 的 ``##``、``**``、代码中的 ``):`` 等): 每 2 个字符 1 token
+    - emoji: 每个 2 token；其他非 ASCII 字符: 每个 1 token
+
+    Args:
+        text: 任意文本
+
+    Returns:
+        估算的 token 数
+    """
+    total = 0.0
+    for match in _PIECE.finditer(text):
+        kind = match.lastgroup
+        piece = match.group()
+        if kind == "word":
+            for part in _SUBWORD.findall(piece) or [piece]:
+                total += 1 + (len(part) - 1) // 6
+        elif kind == "cjk":
+            total += 1.2 * len(piece)
+        elif kind == "digits":
+            total += (len(piece) + 2) // 3
+        elif kind == "punct":
+            total += (len(piece) + 1) // 2
+        elif kind == "emoji":
+            total += 2 * len(piece)
+        else:
+            total += 1
+    return round(total)
+
+
+def is_doc_file(rel_path: str) -> bool:
+    """技能目录内的相对路径是否计入 Layer 2
+
+    文档后缀 (DOC_SUFFIXES) 且不在 SKIP_DIRS 或隐藏目录下；SKILL.md 属于 Layer 1。
+    package_skill.py 使用同一判定。
+    """
+    parts = rel_path.replace("\\", "/").split("/")
+    if parts == ["SKILL.md"]:
+        return False
+    if any(part in SKIP_DIRS or part.startswith(".") for part in parts[:-1]):
+        return False
+    return Path(parts[-1]).suffix.lower() in DOC_SUFFIXES
+
+
+def _tiktoken_counter() -> Optional[Callable[[str], int]]:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    encoding = tiktoken.get_encoding(os.environ.get("SKILL_TOKENIZER_ENCODING", "cl100k_base"))
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+# Registered tokenizers: name -> factory returning a counter (None if unavailable)
+TOKENIZERS: dict[str, Callable[[], Optional[Callable[[str], int]]]] = {
+    "approx": lambda: estimate_tokens,
+    "tiktoken": _tiktoken_counter,
+}
+
+
+def get_tokenizer(name: Optional[str] = None) -> tuple[str, Callable[[str], int]]:
+    """获取 token 计数函数
+
+    Args:
+        name: 分词器名称 (默认读取 SKILL_TOKENIZER，未设置时为 approx)；
+            不可用时回退到 approx
+
+    Returns:
+        (实际使用的分词器名称, 计数函数)
+    """
+    name = name or os.environ.get("SKILL_TOKENIZER", "approx")
+    factory = TOKENIZERS.get(name)
+    counter = factory() if factory else None
+    if counter is None:
+        return "approx", estimate_tokens
+    return name, counter
+
+
+def parse_frontmatter(text: str) -> dict[str, str]:
+    """解析 YAML frontmatter 的顶层标量字段
+
+    支持单行值、引号字符串以及 ``|`` / ``>`` 块标量 (多行 description)。
+    """
+    if not text.startswith("---"):
+        return {}
+    end = text.find("\n---", 3)
+    if end < 0:
+        return {}
+    fields: dict[str, str] = {}
+    key = None
+    block: list[str] = []
+    folded = False
+
+    def finish():
+        if key is not None:
+            fields[key] = (" " if folded else "\n").join(line.strip() for line in block).strip()
+
+    for line in text[3:end].split("\n"):
+        if key is not None and (not line.strip() or line[:1] in (" ", "\t")):
+            block.append(line)
+            continue
+        finish()
+        key, block = None, []
+        match = re.match(r"^([A-Za-z0-9_-]+):\s*(.*)$", line)
+        if not match:
+            continue
+        value = match.group(2).strip()
+        if value[:1] in ("|", ">"):
+            key, folded = match.group(1), value[0] == ">"
+        else:
+            fields[match.group(1)] = value.strip("\"'")
+    finish()
+    return fields
+
+
+def cache_path() -> Path:
+    """token 缓存文件路径 (XDG_CACHE_HOME、LOCALAPPDATA 或 ~/.cache)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    return (Path(base) if base else Path.home() / ".cache") / "myclaude" / "tokens.json"
+
+
+class TokenCache:
+    """按文件内容哈希缓存 token 计数
+
+    ``(mtime, size)`` 未变的文件直接命中，不再读取与哈希；内容相同的文件
+    (例如复制到多个目标平台的技能) 共享同一条计数。
+
+    Attributes:
+        tokenizer: 使用的分词器名称
+    """
+
+    def __init__(self, path: Optional[Path] = None, tokenizer: Optional[str] = None):
+        self.path = path or cache_path()
+        self.tokenizer, self._count = get_tokenizer(tokenizer)
+        self._key = f"{self.tokenizer}:{ESTIMATOR_VERSION}"
+        self._files: dict[str, list] = {}
+        self._counts: dict[str, int] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("key") == self._key:
+                self._files = data.get("files", {})
+                self._counts = data.get("counts", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def count_text(self, text: str) -> int:
+        """统计文本 token 数 (按内容哈希缓存)"""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if digest not in self._counts:
+            self._counts[digest] = self._count(text)
+            self._dirty = True
+        return self._counts[digest]
+
+    def count_file(self, path: Path) -> int:
+        """统计文件 token 数；无法以 UTF-8 读取的文件计为 0"""
+        try:
+            st = path.stat()
+        except OSError:
+            return 0
+        entry = self._files.get(str(path))
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size and entry[2] in self._counts:
+            return self._counts[entry[2]]
+        try:
+            data = path.read_bytes()
+            text = data.decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            return 0
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._counts:
+            self._counts[digest] = self._count(text)
+        self._files[str(path)] = [st.st_mtime_ns, st.st_size, digest]
+        self._dirty = True
+        return self._counts[digest]
+
+    def save(self):
+        """写回缓存文件 (无变更时跳过)"""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"key": self._key, "files": self._files, "counts": self._counts}),
+                           encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+        self._dirty = False
+
+
+@dataclass
+class SkillBudget:
+    """单个技能的 token 预算
+
+    Attributes:
+        name: 技能名称
+        layer0: name + description (始终加载)
+        layer1: SKILL.md 全文 (触发时加载)
+        layer2: 其余文档资源 (按需加载)
+        files: 计入 Layer 2 的文件数
+    """
+    name: str
+    layer0: int = 0
+    layer1: int = 0
+    layer2: int = 0
+    files: int = 0
+
+    @property
+    def total(self) -> int:
+        """三层合计"""
+        return self.layer0 + self.layer1 + self.layer2
+
+    def as_tuple(self) -> tuple[int, int, int]:
+        return self.layer0, self.layer1, self.layer2
+
+
+def skill_budget(skill_dir: Path, cache: Optional[TokenCache] = None) -> SkillBudget:
+    """统计单个技能目录的各层 token 预算"""
+    cache = cache or TokenCache()
+    budget = SkillBudget(name=skill_dir.name)
+    skill_md = skill_dir / "SKILL.md"
+    if skill_md.is_file():
+        budget.layer1 = cache.count_file(skill_md)
+        try:
+            frontmatter = parse_frontmatter(skill_md.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            frontmatter = {}
+        layer0_text = f"{frontmatter.get('name', skill_dir.name)}: {frontmatter.get('description', '')}"
+        budget.layer0 = cache.count_text(layer0_text)
+
+    for root, dirs, names in os.walk(skill_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        for name in sorted(names):
+            path = Path(root) / name
+            if not is_doc_file(path.relative_to(skill_dir).as_posix()):
+                continue
+            budget.layer2 += cache.count_file(path)
+            budget.files += 1
+    return budget
+
+
+def skill_budgets(skills_dir: Path, cache: Optional[TokenCache] = None) -> list[SkillBudget]:
+    """一次统计目录下所有技能的 token 预算 (按名称排序)
+
+    Args:
+        skills_dir: 技能根目录 (每个子目录一个技能)
+        cache: 共享的 TokenCache (默认新建并在结束时保存)
+    """
+    own_cache = cache is None
+    cache = cache or TokenCache()
+    budgets = []
+    if skills_dir.exists():
+        for skill_dir in sorted(d for d in skills_dir.iterdir() if d.is_dir()):
+            budgets.append(skill_budget(skill_dir, cache))
+    if own_cache:
+        cache.save()
+    return budgets
@@ -9,13 +9,12 @@ Usage:
 """
 
 import argparse
-import os
-import re
-import shutil
-import subprocess
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple
+
+from latex_toolkit import chktex_available, run_chktex
+from latex_toolkit.daemon import run_in_daemon
 
 
 class FormatChecker:
@@ -42,7 +41,7 @@ class FormatChecker:
 
     def _check_chktex(self) -> Tuple[bool, str]:
         """Check if chktex is available."""
-        if shutil.which('chktex'):
+        if chktex_available():
             return True, "chktex is available"
         return False, "chktex not found. Install with: apt-get install chktex (Linux) or via TeX Live/MiKTeX"
 
@@ -65,33 +64,8 @@ class FormatChecker:
                 'fallback': True
             }
 
-        # Build command
-        cmd = ['chktex']
-
-        # Verbosity level
-        if strict:
-            cmd.extend(['-v3'])  # More warnings
-        else:
-            cmd.extend(['-v0', '-q'])  # Quiet mode
-
-        # Config file
-        if self.config:
-            cmd.extend(['-l', self.config])
-
-        # Add input file
-        cmd.append(str(self.tex_file))
-
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=self.work_dir,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-
-            issues = self._parse_output(result.stdout + result.stderr)
+            issues = [self._to_issue(raw) for raw in run_chktex(self.tex_file, strict, self.config)]
 
             return {
                 'status': 'PASS' if not issues else 'WARNING',
@@ -108,26 +82,17 @@ class FormatChecker:
                 'fallback': False
             }
 
-    def _parse_output(self, output: str) -> List[Dict]:
-        """Parse chktex output into structured format."""
-        issues = []
-        # Pattern: filename:line:col: Warning N: message
-        pattern = r'(.+?):(\d+):(\d+):\s*(Warning|Error)\s*(\d+):\s*(.+)'
-
-        for line in output.split('\n'):
-            match = re.match(pattern, line.strip())
-            if match:
-                issues.append({
-                    'file': match.group(1),
-                    'line': int(match.group(2)),
-                    'column': int(match.group(3)),
-                    'level': match.group(4).upper(),
-                    'code': int(match.group(5)),
-                    'message': match.group(6),
-                    'category': self._categorize(int(match.group(5)))
-                })
-
-        return issues
+    def _to_issue(self, raw: Dict) -> Dict:
+        """Convert a parsed chktex line into this report's issue format."""
+        return {
+            'file': raw['file'],
+            'line': raw['line'],
+            'column': raw['column'],
+            'level': raw['kind'].upper(),
+            'code': raw['code'],
+            'message': raw['message'],
+            'category': self._categorize(raw['code'])
+        }
 
     def _categorize(self, code: int) -> str:
         """Categorize warning by code."""
@@ -223,4 +188,7 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    returncode = run_in_daemon(__file__)
+    if returncode is None:
+        main()
+    sys.exit(returncode)
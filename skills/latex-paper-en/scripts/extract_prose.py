@@ -6,13 +6,18 @@ Usage:
     python extract_prose.py main.tex
     python extract_prose.py main.tex --output prose.txt
     python extract_prose.py main.tex --keep-structure
+    python extract_prose.py main.tex --chunks --budget 2000 > chunks.jsonl
 """
 
 import argparse
+import json
 import re
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from latex_toolkit import IncludeGraph, documents, estimate_tokens, split_sentences
+from latex_toolkit.daemon import run_in_daemon
 
 
 class ProseExtractor:
@@ -32,8 +37,18 @@ class ProseExtractor:
         'textsf', 'texttt', 'textup', 'textsl',
     ]
 
+    HEADING_RANKS = {'part': 0, 'chapter': 1, 'section': 2, 'subsection': 3, 'subsubsection': 4}
+    HEADING = re.compile(
+        r'\\(?P<level>part|chapter|section|subsection|subsubsection)\*?\s*'
+        r'(?:\[[^\]]*\])?\s*\{'
+    )
+
     def __init__(self, tex_file: str):
         self.tex_file = Path(tex_file).resolve()
+        self.skip_env = re.compile(
+            r'\\(?P<kind>begin|end)\{(?P<env>'
+            + '|'.join(re.escape(env) for env in self.SKIP_ENVIRONMENTS) + r')\}'
+        )
 
     def extract(self, keep_structure: bool = False) -> str:
         """
@@ -45,10 +60,9 @@ class ProseExtractor:
         Returns:
             Extracted plain text
         """
-        try:
-            content = self.tex_file.read_text(encoding='utf-8', errors='ignore')
-        except Exception as e:
-            raise RuntimeError(f"Cannot read file: {e}")
+        content = documents.read(self.tex_file)
+        if content is None:
+            raise RuntimeError(f"Cannot read file: {self.tex_file}")
 
         # Process the content
         text = self._process(content, keep_structure)
@@ -118,15 +132,170 @@ class ProseExtractor:
     def extract_sentences(self) -> List[str]:
         """Extract individual sentences from prose."""
         text = self.extract(keep_structure=False)
+        return split_sentences(' '.join(text.split()))
+
+    def _strip_skipped(self, line: str, skip: Optional[str]) -> Tuple[str, Optional[str]]:
+        """Remove skipped-environment spans from one line.
+
+        Returns the remaining text and the environment still open at the
+        end of the line (None if none).
+        """
+        kept = []
+        last = 0
+        for match in self.skip_env.finditer(line):
+            if skip is None and match.group('kind') == 'begin':
+                kept.append(line[last:match.start()])
+                skip = match.group('env')
+            elif skip == match.group('env') and match.group('kind') == 'end':
+                skip = None
+                last = match.end()
+        if skip is None:
+            kept.append(line[last:])
+        return ''.join(kept), skip
+
+    @staticmethod
+    def _closing_brace(line: str, start: int) -> int:
+        """Index of the brace closing a group opened just before ``start``."""
+        depth = 1
+        for i in range(start, len(line)):
+            if line[i] == '{':
+                depth += 1
+            elif line[i] == '}':
+                depth -= 1
+                if depth == 0:
+                    return i
+        return len(line)
+
+    def paragraphs(self) -> Iterator[Tuple[str, str, str, str]]:
+        """
+        Prose paragraphs of the whole document, following includes.
+
+        Yields:
+            (section path, start 'file:line', end 'file:line', text)
+        """
+        graph = IncludeGraph(self.tex_file)
+        main = documents.masked(graph.main_file) or ''
+        in_body = '\\begin{document}' not in main
+        raw_lines: Dict[Path, List[str]] = {}
+        titles: List[Tuple[int, str]] = []
+        buffer: List[str] = []
+        start = end = None
+        skip = None
+
+        def flush():
+            nonlocal buffer, start
+            text = ' '.join(self._process('\n'.join(buffer), False).split()) if buffer else ''
+            section = ' > '.join(title for _, title in titles)
+            buffer, first = [], start
+            start = None
+            return (section, first, end, text) if text else None
+
+        for path, number, line in graph.walk():
+            if not in_body:
+                begin = line.find('\\begin{document}')
+                if begin < 0:
+                    continue
+                in_body = True
+                line = line[begin + len('\\begin{document}'):]
+            finish = line.find('\\end{document}')
+            if finish >= 0:
+                line = line[:finish]
+            position = f"{graph.relative(path)}:{number}"
+
+            if skip or '\\begin' in line:
+                line, skip = self._strip_skipped(line, skip)
+            if start is not None and not start.startswith(f"{graph.relative(path)}:"):
+                # Paragraphs do not span files
+                paragraph = flush()
+                if paragraph:
+                    yield paragraph
+
+            if not line.strip():
+                if path not in raw_lines:
+                    raw_lines[path] = documents.lines(path)
+                raw = raw_lines[path]
+                # A comment-only line does not end a paragraph; a blank one does
+                if not skip and number <= len(raw) and not raw[number - 1].strip():
+                    paragraph = flush()
+                    if paragraph:
+                        yield paragraph
+            else:
+                last = 0
+                for match in self.HEADING.finditer(line):
+                    if line[last:match.start()].strip():
+                        buffer.append(line[last:match.start()])
+                        start = start or position
+                        end = position
+                    paragraph = flush()
+                    if paragraph:
+                        yield paragraph
+                    rank = self.HEADING_RANKS[match.group('level')]
+                    while titles and titles[-1][0] >= rank:
+                        titles.pop()
+                    last = self._closing_brace(line, match.end())
+                    titles.append((rank, ' '.join(self._process(line[match.end():last], False).split())))
+                    last = min(last + 1, len(line))
+                if line[last:].strip():
+                    buffer.append(line[last:])
+                    start = start or position
+                    end = position
+            if finish >= 0:
+                break
+        paragraph = flush()
+        if paragraph:
+            yield paragraph
+
+    def extract_chunks(self, budget: int = 2000) -> List[Dict]:
+        """
+        Split the document's prose into chunks of at most ``budget`` tokens.
 
-        # Split on sentence boundaries
-        # This is a simplified approach; for better results, use nltk
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        Chunks never cross a section heading and are packed from whole
+        paragraphs; a paragraph over the budget is split between sentences
+        (a single sentence over the budget becomes its own chunk).
 
-        # Filter empty sentences and clean
-        sentences = [s.strip() for s in sentences if s.strip()]
+        Args:
+            budget: Token budget per chunk (see ``estimate_tokens``)
 
-        return sentences
+        Returns:
+            Chunk dicts: id, section, start, end, tokens, text
+        """
+        chunks: List[Dict] = []
+        current: Optional[Dict] = None
+
+        def close():
+            nonlocal current
+            if current:
+                current['text'] = '\n\n'.join(current['text'])
+                chunks.append(current)
+            current = None
+
+        for section, start, end, text in self.paragraphs():
+            if current and current['section'] != section:
+                close()
+            tokens = estimate_tokens(text)
+            pieces = [(text, tokens)]
+            if tokens > budget:
+                pieces = []
+                for sentence in split_sentences(text):
+                    if pieces:
+                        # Estimate the joined text: counts are not additive across the join
+                        merged = f"{pieces[-1][0]} {sentence}"
+                        count = estimate_tokens(merged)
+                        if count <= budget:
+                            pieces[-1] = (merged, count)
+                            continue
+                    pieces.append((sentence, estimate_tokens(sentence)))
+            for piece, count in pieces:
+                if current and current['tokens'] + count > budget:
+                    close()
+                if current is None:
+                    current = {'id': len(chunks) + 1, 'section': section, 'start': start,
+                               'end': end, 'tokens': 0, 'text': []}
+                current['end'] = end
+                current['tokens'] += count
+                current['text'].append(piece)
+        close()
+        return chunks
 
 
 def main():
@@ -148,6 +317,17 @@ def main():
         action='store_true',
         help='Output as list of sentences'
     )
+    parser.add_argument(
+        '--chunks', '-c',
+        action='store_true',
+        help='Output token-budgeted chunks as JSON lines (follows \\input/\\include)'
+    )
+    parser.add_argument(
+        '--budget', '-b',
+        type=int,
+        default=2000,
+        help='Estimated tokens per chunk (default: 2000)'
+    )
 
     args = parser.parse_args()
 
@@ -160,7 +340,10 @@ def main():
     extractor = ProseExtractor(args.tex_file)
 
     try:
-        if args.sentences:
+        if args.chunks:
+            chunks = extractor.extract_chunks(budget=args.budget)
+            output = '\n'.join(json.dumps(chunk, ensure_ascii=False) for chunk in chunks)
+        elif args.sentences:
             sentences = extractor.extract_sentences()
             output = '\n'.join(f"{i+1}. {s}" for i, s in enumerate(sentences))
         else:
@@ -178,4 +361,7 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    returncode = run_in_daemon(__file__)
+    if returncode is None:
+        main()
+    sys.exit(returncode)
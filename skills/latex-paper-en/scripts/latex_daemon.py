@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+LaTeX Analysis Daemon - keep the skill scripts warm between calls
+
+Usage:
+    python latex_daemon.py start              # Start in the background
+    python latex_daemon.py start --idle 3600  # Exit after an idle hour
+    python latex_daemon.py status
+    python latex_daemon.py stop
+    python latex_daemon.py serve              # Run in the foreground
+
+While the daemon runs, check_format.py, verify_bib.py, extract_prose.py,
+map_structure.py and check_consistency.py forward their arguments to it and
+print its output; otherwise they run in-process as usual. Set
+LATEX_TOOLKIT_NO_DAEMON=1 to bypass a running daemon; a daemon that does not
+answer within LATEX_TOOLKIT_DAEMON_TIMEOUT seconds (default 120) is bypassed
+too. Only the skills' own scripts are run, with the caller's environment.
+compile.py always runs in-process.
+"""
+
+import argparse
+import json
+import sys
+
+from latex_toolkit import daemon
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='LaTeX analysis daemon (Unix socket, JSON requests)'
+    )
+    parser.add_argument('action', choices=['start', 'stop', 'status', 'serve'])
+    parser.add_argument(
+        '--idle',
+        type=float, metavar='SECONDS',
+        help='Exit after SECONDS without requests'
+    )
+
+    args = parser.parse_args()
+
+    if args.action == 'start':
+        sys.exit(daemon.start(__file__, idle_timeout=args.idle))
+    if args.action == 'serve':
+        sys.exit(daemon.serve(idle_timeout=args.idle))
+    if args.action == 'stop':
+        sys.exit(daemon.stop())
+
+    status = daemon.status()
+    if status is None:
+        print("[INFO] No daemon running")
+        sys.exit(1)
+    print(json.dumps(status, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Shared LaTeX toolkit for the latex-paper-en and latex-thesis-zh skills.
+
+The skill scripts (compile.py, check_format.py, ...) are thin command-line
+wrappers around this package, so a long-running process imports it once
+and shares its caches across calls.
+
+Modules:
+    compiler    LaTeXCompiler, recipe planning, preamble formats, batch builds
+    log_parser  Streaming TeX log parser
+    chktex      ChkTeX wrapper
+    files       Dependency walker / watcher (SourceWatcher)
+    graph       Cached include graph (IncludeGraph)
+    outline     Chapter/section outline with statistics
+    xref        Label/reference cross-reference index
+    prose       Sentence splitting and token estimation
+    token_budget  Copy of the repository's token_budget.py (shared estimator)
+    cache       Document cache and per-user cache directory
+    daemon      Optional warm daemon and its client
+"""
+
+import importlib
+
+# Public names and the submodule defining them. Submodules are imported on
+# first access, so a script that only needs the document cache or the daemon
+# client does not pay for the compiler's imports.
+_EXPORTS = {
+    'DocumentCache': 'cache',
+    'cache_root': 'cache',
+    'documents': 'cache',
+    'file_digest': 'cache',
+    'chktex_available': 'chktex',
+    'parse_chktex_output': 'chktex',
+    'run_chktex': 'chktex',
+    'BIB_STEPS': 'compiler',
+    'BUILD_CANCELLED': 'compiler',
+    'BUILD_TIMEOUT': 'compiler',
+    'ENGINE_STEPS': 'compiler',
+    'BuildCache': 'compiler',
+    'LaTeXCompiler': 'compiler',
+    'PreambleFormat': 'compiler',
+    'RecipePlanner': 'compiler',
+    'format_batch_summary': 'compiler',
+    'read_batch_file': 'compiler',
+    'run_batch': 'compiler',
+    'SourceWatcher': 'files',
+    'IncludeGraph': 'graph',
+    'OutlineBuilder': 'outline',
+    'count_words': 'outline',
+    'CrossReferenceIndex': 'xref',
+    'estimate_tokens': 'prose',
+    'split_sentences': 'prose',
+    'LogParser': 'log_parser',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
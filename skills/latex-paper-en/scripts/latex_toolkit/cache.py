@@ -0,0 +1,86 @@
+"""
+Caches shared by the LaTeX skill scripts.
+
+``documents`` is a process-wide cache of source files keyed by path and
+validated against (mtime, size), so a long-running process reads and
+comment-strips each file once until it changes.
+"""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """Return the SHA-1 of a file's bytes, or None if it does not exist."""
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def cache_root() -> Path:
+    """Per-user cache directory shared by the LaTeX skill scripts."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+    return (Path(base) if base else Path.home() / '.cache') / 'latex-skills'
+
+
+class DocumentCache:
+    """Text of source files, re-read only when their (mtime, size) changes."""
+
+    COMMENT = re.compile(r'(?<!\\)%.*')
+
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[Tuple[int, int], str, Optional[str]]] = {}
+
+    def _signature(self, path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def read(self, path: Path) -> Optional[str]:
+        """File content (UTF-8, undecodable bytes dropped), or None if unreadable."""
+        path = Path(path)
+        signature = self._signature(path)
+        if signature is None:
+            self._entries.pop(path, None)
+            return None
+        entry = self._entries.get(path)
+        if entry and entry[0] == signature:
+            return entry[1]
+        try:
+            text = path.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            return None
+        self._entries[path] = (signature, text, None)
+        return text
+
+    def masked(self, path: Path) -> Optional[str]:
+        """Content with ``%`` comments removed (line structure preserved)."""
+        path = Path(path)
+        text = self.read(path)
+        if text is None:
+            return None
+        signature, _, masked = self._entries[path]
+        if masked is None:
+            masked = self.COMMENT.sub('', text)
+            self._entries[path] = (signature, text, masked)
+        return masked
+
+    def lines(self, path: Path) -> List[str]:
+        """Content split into lines (empty if unreadable)."""
+        text = self.read(path)
+        return text.split('\n') if text is not None else []
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+documents = DocumentCache()
@@ -0,0 +1,69 @@
+"""
+ChkTeX wrapper shared by the format checkers.
+"""
+
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Pattern: filename:line:col: Warning N: message
+OUTPUT_LINE = re.compile(r'(.+?):(\d+):(\d+):\s*(Warning|Error)\s*(\d+):\s*(.+)')
+
+
+def chktex_available() -> bool:
+    """Whether the chktex binary is on PATH."""
+    return shutil.which('chktex') is not None
+
+
+def parse_chktex_output(output: str) -> List[Dict]:
+    """Parse chktex output into ``file/line/column/kind/code/message`` dicts."""
+    issues = []
+    for line in output.split('\n'):
+        match = OUTPUT_LINE.match(line.strip())
+        if match:
+            issues.append({
+                'file': match.group(1),
+                'line': int(match.group(2)),
+                'column': int(match.group(3)),
+                'kind': match.group(4),
+                'code': int(match.group(5)),
+                'message': match.group(6),
+            })
+    return issues
+
+
+def run_chktex(tex_file: Path, strict: bool = False, config: Optional[str] = None) -> List[Dict]:
+    """
+    Run chktex on a document.
+
+    Args:
+        tex_file: Document to check (chktex runs in its directory)
+        strict: Enable all warnings (-v3) instead of quiet mode
+        config: Optional .chktexrc passed with -l
+
+    Returns:
+        Parsed issues
+
+    Raises:
+        OSError: If chktex cannot be started
+    """
+    cmd = ['chktex']
+    if strict:
+        cmd.extend(['-v3'])  # More warnings
+    else:
+        cmd.extend(['-v0', '-q'])  # Quiet mode
+    if config:
+        cmd.extend(['-l', config])
+    cmd.append(str(tex_file))
+
+    result = subprocess.run(
+        cmd,
+        cwd=tex_file.parent,
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+    return parse_chktex_output(result.stdout + result.stderr)
@@ -0,0 +1,183 @@
+"""
+Command-line interface of compile.py.
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+from pathlib import Path
+
+from .compiler import LaTeXCompiler, format_batch_summary, read_batch_file, run_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='LaTeX Compilation Script - Unified compiler for pdflatex/xelatex/lualatex',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Recipes (matching VS Code LaTeX Workshop):
+  xelatex          XeLaTeX only
+  pdflatex         PDFLaTeX only
+  latexmk          LaTeXmk auto
+  xelatex-bibtex   xelatex -> bibtex -> xelatex*2
+  xelatex-biber    xelatex -> biber -> xelatex*2
+  pdflatex-bibtex  pdflatex -> bibtex -> pdflatex*2
+  pdflatex-biber   pdflatex -> biber -> pdflatex*2
+
+Multi-step recipes are incremental: bibtex/biber is skipped when citations
+and .bib files are unchanged, and extra passes stop once the .aux/.toc files
+reach a fixed point. Use --force to run every step. Passes known to be
+intermediate run with -draftmode (xelatex: -no-pdf); only the final pass
+writes the PDF.
+
+Examples:
+  python compile.py main.tex                        # Auto-detect
+  python compile.py main.tex --recipe xelatex-biber # Full workflow
+  python compile.py main.tex --watch                # Watch mode
+  python compile.py --batch projects.txt --jobs 8 --timeout 600
+        """
+    )
+    parser.add_argument('tex_file', nargs='?', help='Main .tex file to compile')
+    parser.add_argument(
+        '--compiler', '-c',
+        choices=['pdflatex', 'xelatex', 'lualatex'],
+        help='Compiler to use (auto-detected if not specified)'
+    )
+    parser.add_argument(
+        '--recipe', '-r',
+        choices=['xelatex', 'pdflatex', 'latexmk', 'xelatex-bibtex',
+                 'xelatex-biber', 'pdflatex-bibtex', 'pdflatex-biber'],
+        help='Use predefined recipe (VS Code LaTeX Workshop style)'
+    )
+    parser.add_argument(
+        '--watch', '-w',
+        action='store_true',
+        help='Rebuild whenever the document, its includes or .bib files change (works with --recipe)'
+    )
+    parser.add_argument(
+        '--biber', '-b',
+        action='store_true',
+        help='Use biber for bibliography processing'
+    )
+    parser.add_argument(
+        '--force', '-f',
+        action='store_true',
+        help='Run every recipe step, even when aux/bbl files are up to date'
+    )
+    parser.add_argument(
+        '--fmt',
+        action='store_true',
+        help='Precompile the preamble into a cached format file (pdflatex/xelatex, needs mylatexformat)'
+    )
+    parser.add_argument(
+        '--json', '-j',
+        nargs='?', const='-', metavar='FILE',
+        help='Write a JSON compile report (errors, warnings, boxes, undefined refs/cites, '
+             'per-step timing) to FILE, or to stdout if no FILE is given'
+    )
+    parser.add_argument(
+        '--output-dir', '-o',
+        metavar='DIR',
+        help='Write auxiliary files and the PDF to DIR (-output-directory); '
+             'with --batch, parent of the per-project directories'
+    )
+    parser.add_argument(
+        '--build-dir',
+        action='store_true',
+        help='Build in a per-project, per-engine cache directory; aux/bbl state is '
+             'snapshotted by source content and restored after branch or engine switches '
+             '(with --batch, every project gets its own cache directory)'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float, metavar='SECONDS',
+        help='Abort a build that runs longer than SECONDS'
+    )
+    parser.add_argument(
+        '--batch',
+        metavar='LIST',
+        help='Compile every main .tex file listed in LIST (one per line) on a process pool'
+    )
+    parser.add_argument(
+        '--jobs', '-J',
+        type=int, metavar='N',
+        help='Worker processes for --batch (default: CPU count)'
+    )
+    parser.add_argument(
+        '--clean',
+        action='store_true',
+        help='Clean auxiliary files'
+    )
+    parser.add_argument(
+        '--clean-all',
+        action='store_true',
+        help='Clean all generated files including PDF'
+    )
+
+    args = parser.parse_args()
+
+    if args.build_dir and args.output_dir:
+        parser.error('--build-dir and --output-dir are mutually exclusive')
+
+    if args.batch:
+        batch_file = Path(args.batch)
+        if not batch_file.exists():
+            print(f"[ERROR] File not found: {args.batch}")
+            sys.exit(1)
+        projects = read_batch_file(batch_file)
+        missing = [p for p in projects if not p.exists()]
+        for path in missing:
+            print(f"[WARNING] Skipping missing project: {path}")
+        output_root = Path(args.output_dir).resolve() if args.output_dir else None
+        with contextlib.redirect_stdout(sys.stderr if args.json == '-' else sys.stdout):
+            summary = run_batch([p for p in projects if p.exists()], jobs=args.jobs,
+                                output_root=output_root, compiler=args.compiler,
+                                recipe=args.recipe, force=args.force, use_fmt=args.fmt,
+                                timeout=args.timeout, build_dir=args.build_dir)
+        if args.json:
+            text = json.dumps(summary, indent=2, ensure_ascii=False)
+            if args.json == '-':
+                print(text)
+            else:
+                Path(args.json).write_text(text, encoding='utf-8')
+        if args.json != '-':
+            print(format_batch_summary(summary))
+        sys.exit(0 if summary['failed'] == 0 and not missing else 1)
+
+    if not args.tex_file:
+        parser.error('tex_file is required unless --batch is given')
+
+    # Validate input file
+    tex_path = Path(args.tex_file)
+    if not tex_path.exists():
+        print(f"[ERROR] File not found: {args.tex_file}")
+        sys.exit(1)
+
+    if not tex_path.suffix == '.tex':
+        print(f"[WARNING] File does not have .tex extension: {args.tex_file}")
+
+    # Create compiler instance
+    compiler = LaTeXCompiler(args.tex_file, args.compiler, args.recipe,
+                             force=args.force, use_fmt=args.fmt,
+                             output_dir=args.output_dir, timeout=args.timeout,
+                             build_dir=args.build_dir)
+
+    # Execute requested action
+    if args.clean or args.clean_all:
+        sys.exit(compiler.clean(full=args.clean_all))
+
+    if args.json == '-':
+        if args.watch:
+            print("[ERROR] --watch needs --json FILE (stdout is used for build output)")
+            sys.exit(1)
+        # Keep stdout clean for the report; build output goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            returncode = compiler.compile(biber=args.biber)
+        report = compiler.report or compiler.build_report(returncode, 0.0)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        sys.exit(returncode)
+
+    if args.json:
+        compiler.report_file = Path(args.json).resolve()
+    sys.exit(compiler.compile(watch=args.watch, biber=args.biber))
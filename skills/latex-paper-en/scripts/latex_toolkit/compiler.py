@@ -0,0 +1,1360 @@
+"""
+LaTeX compilation: recipes, incremental planning, precompiled preambles,
+out-of-tree builds, watch mode and batch builds.
+"""
+
+import codecs
+import concurrent.futures
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .cache import cache_root, file_digest
+from .files import SourceWatcher
+from .log_parser import LogParser
+
+
+ENGINE_STEPS = ('pdflatex', 'xelatex', 'lualatex')
+BIB_STEPS = ('bibtex', 'biber')
+
+# Return code of a step terminated because a newer change arrived in watch mode
+BUILD_CANCELLED = -1
+# Return code of a build killed by its timeout (same as coreutils timeout)
+BUILD_TIMEOUT = 124
+
+
+class RecipePlanner:
+    """Decide which recipe steps actually need to run.
+
+    The planner hashes the auxiliary files an engine pass reads back
+    (.aux, .toc, .lof, .lot, .out) together with the bibliography inputs
+    (.bib, and the citation data in .aux/.bcf) and outputs (.bbl):
+
+    - bibtex/biber are skipped when the citation data and .bib files are
+      identical to the last successful bibliography run and a .bbl exists.
+    - Engine passes after the first are skipped once the aux files reach a
+      fixed point and the .bbl has not changed since the previous pass.
+
+    State between invocations is kept in ``<jobname>.fdb_recipe`` next to
+    the auxiliary files.
+    """
+
+    RERUN_SUFFIXES = ('.aux', '.toc', '.lof', '.lot', '.out')
+
+    # Lines of a .aux file that bibtex actually reads
+    BIBTEX_AUX_LINE = re.compile(r'^\\(?:citation|bibdata|bibstyle)\{')
+    AUX_INPUT = re.compile(r'^\\@input\{([^}]+)\}', re.MULTILINE)
+    BIBDATA = re.compile(r'^\\bibdata\{([^}]+)\}', re.MULTILINE)
+    BCF_DATASOURCE = re.compile(r'<bcf:datasource[^>]*>([^<]+)</bcf:datasource>')
+
+    def __init__(self, aux_dir: Path, jobname: str, source_dir: Optional[Path] = None):
+        self.aux_dir = aux_dir
+        self.jobname = jobname
+        self.source_dir = source_dir or aux_dir
+        self.state_file = aux_dir / f"{jobname}.fdb_recipe"
+        self.state = self._load_state()
+        self._engine_runs = 0
+        self._rerun_needed = True
+        self._before: Dict[str, Optional[str]] = {}
+        self._bbl_at_last_engine: Optional[str] = None
+
+    def _load_state(self) -> Dict:
+        try:
+            return json.loads(self.state_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Persist planner state for the next invocation."""
+        try:
+            self.state_file.write_text(json.dumps(self.state, indent=2), encoding='utf-8')
+        except OSError:
+            pass
+
+    def _aux_files(self) -> List[Path]:
+        """Main .aux plus the child .aux files pulled in by \\include."""
+        main_aux = self.aux_dir / f"{self.jobname}.aux"
+        files = [main_aux]
+        try:
+            content = main_aux.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            return files
+        for match in self.AUX_INPUT.finditer(content):
+            files.append(self.aux_dir / match.group(1))
+        return files
+
+    def _rerun_fingerprint(self) -> Dict[str, Optional[str]]:
+        """Hashes of everything an engine pass reads back on the next pass."""
+        files = self._aux_files()
+        files.extend(self.aux_dir / f"{self.jobname}{suffix}"
+                     for suffix in self.RERUN_SUFFIXES if suffix != '.aux')
+        return {str(f): file_digest(f) for f in files}
+
+    def _bbl_digest(self) -> Optional[str]:
+        return file_digest(self.aux_dir / f"{self.jobname}.bbl")
+
+    def _resolve_bib(self, name: str) -> Path:
+        name = name.strip()
+        if not name.endswith('.bib'):
+            name += '.bib'
+        path = Path(name)
+        if path.is_absolute():
+            return path
+        for base in (self.source_dir, self.aux_dir):
+            if (base / path).exists():
+                return base / path
+        return self.source_dir / path
+
+    def _bib_fingerprint(self, step: str) -> str:
+        """Hash of the citation data and .bib files a bibliography run reads."""
+        digest = hashlib.sha1(step.encode())
+        bib_names: List[str] = []
+
+        if step == 'biber':
+            bcf = self.aux_dir / f"{self.jobname}.bcf"
+            try:
+                content = bcf.read_text(encoding='utf-8', errors='ignore')
+            except OSError:
+                content = ''
+            digest.update(content.encode('utf-8'))
+            bib_names.extend(self.BCF_DATASOURCE.findall(content))
+        else:
+            for aux in self._aux_files():
+                try:
+                    content = aux.read_text(encoding='utf-8', errors='ignore')
+                except OSError:
+                    continue
+                for line in content.splitlines():
+                    if self.BIBTEX_AUX_LINE.match(line):
+                        digest.update(line.encode('utf-8'))
+                for match in self.BIBDATA.finditer(content):
+                    bib_names.extend(match.group(1).split(','))
+
+        for name in sorted(set(bib_names)):
+            path = self._resolve_bib(name)
+            digest.update(f"{path}:{file_digest(path)}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def should_run(self, step: str) -> Tuple[bool, str]:
+        """Return (run, reason) for the next recipe step."""
+        if step in ENGINE_STEPS:
+            if self._engine_runs == 0:
+                return True, "first pass"
+            if self._bbl_digest() != self._bbl_at_last_engine:
+                return True, "bibliography changed"
+            if self._rerun_needed:
+                return True, "auxiliary files changed"
+            return False, "auxiliary files reached a fixed point"
+
+        if step in BIB_STEPS:
+            if self._bbl_digest() is None:
+                return True, "no .bbl yet"
+            if self.state.get('bib', {}).get(step) != self._bib_fingerprint(step):
+                return True, "citations or .bib files changed"
+            return False, "citations and .bib files unchanged"
+
+        return True, "not tracked"
+
+    def expects_rerun(self) -> bool:
+        """Whether the next engine pass is certain to be followed by another.
+
+        True on a cold build (no .aux yet) and right after the .bbl changed:
+        the pass writes new \\bibcite entries that the next pass must read.
+        """
+        if not (self.aux_dir / f"{self.jobname}.aux").exists():
+            return True
+        return self._engine_runs > 0 and self._bbl_digest() != self._bbl_at_last_engine
+
+    def before_step(self, step: str):
+        """Snapshot state before running a step."""
+        if step in ENGINE_STEPS:
+            self._before = self._rerun_fingerprint()
+
+    def after_step(self, step: str, returncode: int):
+        """Record the effect of a step that has just run."""
+        if step in ENGINE_STEPS:
+            self._engine_runs += 1
+            self._rerun_needed = self._rerun_fingerprint() != self._before
+            self._bbl_at_last_engine = self._bbl_digest()
+        elif step in BIB_STEPS:
+            bib_state = self.state.setdefault('bib', {})
+            # bibtex exits with 1 on warnings; anything worse means the .bbl is suspect
+            ok = returncode == 0 or (step == 'bibtex' and returncode == 1)
+            if ok and self._bbl_digest() is not None:
+                bib_state[step] = self._bib_fingerprint(step)
+            else:
+                bib_state.pop(step, None)
+
+
+class PreambleFormat:
+    """Precompiled preamble (mylatexformat) cached per preamble hash and engine.
+
+    Everything before ``\\begin{document}`` -- or before an ``%endofdump`` /
+    ``\\endofdump`` marker, for preambles that load material which cannot be
+    dumped -- is compiled once into a custom .fmt. Later runs pass
+    ``-fmt=<name>`` and skip the preamble. The cache key covers the preamble
+    text, local .sty/.cls/.tex files it loads and the engine binary, so the
+    format is rebuilt automatically whenever any of them change.
+    """
+
+    ENGINES = ('pdflatex', 'xelatex')
+    END_OF_DUMP = re.compile(r'^[ \t]*(?:%[ \t]*endofdump\b|\\endofdump\b)|\\begin\{document\}', re.MULTILINE)
+    LOCAL_INPUT = re.compile(r'\\(usepackage|RequirePackage|documentclass|input)(?:\[[^\]]*\])?\{([^}]+)\}')
+
+    def __init__(self, tex_file: Path, engine: str, cache_dir: Optional[Path] = None):
+        self.tex_file = tex_file
+        self.engine = engine
+        self.cache_dir = cache_dir or cache_root() / 'fmt'
+        project = hashlib.sha1(str(tex_file).encode('utf-8')).hexdigest()[:8]
+        self.prefix = f"{tex_file.stem}-{project}-{engine}"
+        self.name: Optional[str] = None
+
+    def _preamble(self) -> Optional[str]:
+        try:
+            content = self.tex_file.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            return None
+        match = self.END_OF_DUMP.search(content)
+        return content[:match.start()] if match else None
+
+    def _key(self, preamble: str) -> str:
+        digest = hashlib.sha1(preamble.encode('utf-8'))
+        engine_path = shutil.which(self.engine)
+        if engine_path:
+            st = os.stat(engine_path)
+            digest.update(f"{engine_path}:{st.st_mtime_ns}".encode('utf-8'))
+        for cmd, names in self.LOCAL_INPUT.findall(preamble):
+            suffix = {'documentclass': '.cls', 'input': '.tex'}.get(cmd, '.sty')
+            for name in names.split(','):
+                name = name.strip()
+                local = self.tex_file.parent / (name if Path(name).suffix else name + suffix)
+                digest.update(f"{name}:{file_digest(local)}".encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    def ensure(self, run) -> Optional[str]:
+        """Return the format name to pass as ``-fmt``, dumping it if needed.
+
+        Args:
+            run: Callable executing a command list in the document directory
+
+        Returns:
+            Format name, or None if the preamble cannot be precompiled
+        """
+        if self.engine not in self.ENGINES:
+            return None
+        preamble = self._preamble()
+        if preamble is None:
+            return None
+
+        name = f"{self.prefix}-{self._key(preamble)}"
+        fmt_file = self.cache_dir / f"{name}.fmt"
+        failed_marker = self.cache_dir / f"{name}.failed"
+        if fmt_file.exists():
+            self.name = name
+            return name
+        if failed_marker.exists():
+            return None
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.cache_dir.glob(f"{self.prefix}-*"):
+            stale.unlink(missing_ok=True)
+
+        print(f"[INFO] Precompiling preamble into {fmt_file.name}...")
+        cmd = [self.engine, '-ini', '-interaction=nonstopmode',
+               f'-output-directory={self.cache_dir}', f'-jobname={name}',
+               f'&{self.engine}', 'mylatexformat.ltx', str(self.tex_file)]
+        returncode = run(cmd)
+        if returncode == BUILD_CANCELLED:
+            return None
+        if returncode != 0 or not fmt_file.exists():
+            failed_marker.touch()
+            print(f"[WARNING] Could not precompile preamble (is mylatexformat installed?), "
+                  f"see {self.cache_dir / (name + '.log')}; compiling without a format")
+            return None
+
+        self.name = name
+        return name
+
+    def env(self) -> Dict[str, str]:
+        """Environment that lets the engine find the cached format."""
+        env = dict(os.environ)
+        # Trailing separator keeps kpathsea's default search path
+        env['TEXFORMATS'] = f"{self.cache_dir}{os.pathsep}{env.get('TEXFORMATS', '')}"
+        return env
+
+
+class BuildCache:
+    """Out-of-tree build directory with content-addressed aux snapshots.
+
+    Each project/engine pair gets its own build directory under
+    ``<cache>/build``, so switching engines never clobbers warm aux state.
+    After a successful build the aux family (.aux, .bbl, .toc, ...) is
+    stored by content hash under ``<cache>/aux/objects`` and indexed by a
+    digest of the sources. When a later build starts from sources that
+    match a stored state -- e.g. after switching back to a git branch --
+    that state is restored first and the recipe resumes warm. Objects are
+    deleted once the states referencing them are trimmed or forgotten.
+    """
+
+    AUX_SUFFIXES = ('.aux', '.bbl', '.bcf', '.run.xml', '.toc', '.lof', '.lot', '.out',
+                    '.nav', '.snm', '.idx', '.ind', '.glo', '.gls', '.fdb_recipe')
+    # Source states remembered per project and engine
+    MAX_STATES = 16
+    # Seconds an unreferenced object survives garbage collection
+    GC_GRACE = 3600
+
+    def __init__(self, tex_file: Path, engine: str, cache_dir: Optional[Path] = None):
+        self.tex_file = tex_file
+        self.engine = engine
+        root = cache_dir or cache_root()
+        project = hashlib.sha1(str(tex_file).encode('utf-8')).hexdigest()[:8]
+        name = f"{tex_file.stem}-{project}-{engine}"
+        self.build_dir = root / 'build' / name
+        self.objects_dir = root / 'aux' / 'objects'
+        self.index_file = root / 'aux' / f"{name}.json"
+        # Source digest the build directory's aux files currently belong to
+        self.state_file = self.build_dir / f"{tex_file.stem}.aux_state"
+
+    def source_key(self) -> str:
+        """Digest of every source file the document depends on."""
+        digest = hashlib.sha1()
+        for path in sorted(SourceWatcher(self.tex_file).files):
+            digest.update(str(path).encode('utf-8'))
+            digest.update((file_digest(path) or '-').encode('ascii'))
+        return digest.hexdigest()
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        try:
+            return json.loads(self.index_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _aux_files(self) -> List[Path]:
+        return [path for path in self.build_dir.rglob('*')
+                if path.is_file() and path.name.endswith(self.AUX_SUFFIXES)]
+
+    def restore(self, key: str) -> bool:
+        """Restore the aux snapshot stored for ``key`` unless it is already in place.
+
+        Returns:
+            True if files were restored
+        """
+        try:
+            if self.state_file.read_text(encoding='utf-8').strip() == key:
+                return False
+        except OSError:
+            pass
+        snapshot = self._load_index().get(key)
+        if not snapshot:
+            return False
+        for relative, digest in snapshot.items():
+            source = self.objects_dir / digest[:2] / digest
+            target = self.build_dir / relative
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, target)
+            except OSError:
+                return False
+        self.state_file.write_text(key, encoding='utf-8')
+        print(f"[INFO] Restored {len(snapshot)} cached aux files for these sources")
+        return True
+
+    def store(self, key: str):
+        """Snapshot the build directory's aux files under ``key``."""
+        snapshot = {}
+        for path in self._aux_files():
+            digest = file_digest(path)
+            if digest is None:
+                continue
+            target = self.objects_dir / digest[:2] / digest
+            try:
+                # Reused objects are touched so a concurrent collection spares them
+                os.utime(target)
+            except FileNotFoundError:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(f"{digest}.{os.getpid()}.tmp")
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, target)
+            snapshot[path.relative_to(self.build_dir).as_posix()] = digest
+
+        index = self._load_index()
+        index.pop(key, None)
+        index[key] = snapshot
+        # Dicts keep insertion order: drop the least recently stored states
+        stale = list(index)[:-self.MAX_STATES]
+        for old_key in stale:
+            del index[old_key]
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_file.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(index), encoding='utf-8')
+        os.replace(tmp, self.index_file)
+        self.state_file.write_text(key, encoding='utf-8')
+        if stale:
+            self.collect_garbage()
+
+    def forget(self):
+        """Drop the stored snapshots of this project and engine."""
+        self.index_file.unlink(missing_ok=True)
+        self.collect_garbage()
+
+    def collect_garbage(self) -> int:
+        """Delete objects that no project's index references any more.
+
+        The object store is shared by every project and engine, so all
+        indexes are consulted. Objects written or reused within the last
+        ``GC_GRACE`` seconds are kept: a concurrent build may not have
+        written the index that references them yet.
+
+        Returns:
+            Number of objects removed
+        """
+        live = set()
+        for index_file in self.index_file.parent.glob('*.json'):
+            try:
+                index = json.loads(index_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                # An unreadable index may still reference objects
+                return 0
+            for snapshot in index.values():
+                live.update(snapshot.values())
+        removed = 0
+        cutoff = time.time() - self.GC_GRACE
+        for path in self.objects_dir.glob('*/*'):
+            try:
+                if path.name in live or path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+class LaTeXCompiler:
+    """Unified LaTeX compilation with multiple recipes."""
+
+    COMPILERS = {
+        'pdflatex': ['-pdf', '-pdflatex=pdflatex -interaction=nonstopmode -shell-escape %O %S'],
+        'xelatex': ['-xelatex', '-pdfxe', '-xelatex=xelatex -interaction=nonstopmode -shell-escape %O %S'],
+        'lualatex': ['-lualatex', '-pdflua', '-lualatex=lualatex -interaction=nonstopmode -shell-escape %O %S'],
+    }
+
+    # Recipes matching VS Code LaTeX Workshop configuration
+    RECIPES = {
+        'xelatex': ['xelatex'],
+        'pdflatex': ['pdflatex'],
+        'bibtex': ['bibtex'],
+        'biber': ['biber'],
+        'latexmk': ['latexmk'],
+        'xelatex-bibtex': ['xelatex', 'bibtex', 'xelatex', 'xelatex'],
+        'xelatex-biber': ['xelatex', 'biber', 'xelatex', 'xelatex'],
+        'pdflatex-bibtex': ['pdflatex', 'bibtex', 'pdflatex', 'pdflatex'],
+        'pdflatex-biber': ['pdflatex', 'biber', 'pdflatex', 'pdflatex'],
+    }
+
+    # Engine options that skip PDF output on intermediate recipe passes
+    DRAFT_OPTIONS = {
+        'pdflatex': '-draftmode',
+        'lualatex': '-draftmode',
+        'xelatex': '-no-pdf',
+    }
+
+    # Patterns indicating Chinese content
+    CHINESE_PATTERNS = [
+        r'\\(?:usepackage|RequirePackage).*{ctex}',
+        r'\\(?:usepackage|RequirePackage).*{xeCJK}',
+        r'\\(?:documentclass|LoadClass).*{ctexart}',
+        r'\\(?:documentclass|LoadClass).*{ctexbook}',
+        r'\\(?:documentclass|LoadClass).*{ctexrep}',
+        r'\\documentclass.*{thuthesis}',
+        r'\\documentclass.*{pkuthss}',
+        r'\\documentclass.*{ustcthesis}',
+        r'\\documentclass.*{fduthesis}',
+        r'[\u4e00-\u9fff]',  # Chinese characters
+    ]
+
+    # Everything _detect_compiler looks for, as one alternation scanned once per line
+    MAGIC_COMMENT = re.compile(r'^\s*%\s*!TEX\s+(?:TS-)?program\s*=\s*(\w+)', re.IGNORECASE)
+    DETECT_PATTERN = re.compile(
+        '(?P<chinese>' + '|'.join(CHINESE_PATTERNS) + ')'
+        r'|(?P<fontspec>\\usepackage.*{fontspec})'
+        r'|(?P<input>\\input\{(?P<input_name>[^}]+)\})'
+        r'|(?P<local>\\(?:documentclass|usepackage|RequirePackage|LoadClass)'
+        r'(?:\[[^\]]*\])?\{(?P<local_name>[^}]+)\})'
+        r'|(?P<begin>\\begin\{document\})'
+    )
+    COMMENT = re.compile(r'(?<!\\)%.*')
+
+    # Suffixes of the files a build writes under the job name (main.aux, main.pdf, ...)
+    GENERATED_SUFFIXES = BuildCache.AUX_SUFFIXES + (
+        '.log', '.blg', '.ilg', '.glg', '.fls', '.fdb_latexmk', '.synctex.gz', '.synctex',
+        '.xdv', '.dvi', '.pdf', '.loa', '.lol', '.acn', '.acr', '.alg', '.ist', '.nlo', '.nls',
+        '.aux_state',
+    )
+
+    # Detection results keyed by main file; validated against file signatures
+    _detect_cache: Dict[str, Dict] = {}
+
+    def __init__(self, tex_file: str, compiler: Optional[str] = None, recipe: Optional[str] = None,
+                 force: bool = False, use_fmt: bool = False, output_dir: Optional[str] = None,
+                 timeout: Optional[float] = None, build_dir: bool = False):
+        self.tex_file = Path(tex_file).resolve()
+        self.work_dir = self.tex_file.parent
+        # Auxiliary files and the PDF go here (-output-directory); sources stay in work_dir
+        self.output_dir = Path(output_dir).resolve() if output_dir else self.work_dir
+        self.timeout = timeout
+        self.compiler = compiler or self._detect_compiler()
+        self.recipe = recipe
+        # --build-dir: per-project, per-engine directory in the user cache
+        self.build_cache: Optional[BuildCache] = None
+        if build_dir:
+            self.build_cache = BuildCache(self.tex_file, self._engine())
+            self.output_dir = self.build_cache.build_dir
+        self.force = force
+        self.use_fmt = use_fmt
+        self.report_file: Optional[Path] = None
+        self.report: Optional[Dict] = None
+        self._cancel = threading.Event()
+        self._steps: List[Dict] = []
+        self._log: Optional[LogParser] = None
+        self._deadline: Optional[float] = None
+        self._timed_out = False
+
+    @property
+    def pdf_file(self) -> Path:
+        """Where the engine writes the PDF."""
+        return self.output_dir / f"{self.tex_file.stem}.pdf"
+
+    @property
+    def manifest_file(self) -> Path:
+        """Files the builds have written, relative to the output directory."""
+        return self.output_dir / f"{self.tex_file.stem}.build_manifest"
+
+    def _engine(self) -> str:
+        """TeX engine the configured recipe (or latexmk) runs."""
+        for step in self.RECIPES.get(self.recipe or '', []):
+            if step in ENGINE_STEPS:
+                return step
+        return self.compiler
+
+    def _output_args(self) -> List[str]:
+        """Engine options that redirect output away from the source tree."""
+        if self.output_dir == self.work_dir:
+            return []
+        return [f'-output-directory={self.output_dir}']
+
+    def _prepare_output_dir(self):
+        """Create the output directory, mirroring source subdirectories.
+
+        TeX writes the .aux of ``\\include{chap/one}`` to ``chap/one.aux``
+        under -output-directory but does not create ``chap/`` itself.
+        """
+        if self.output_dir == self.work_dir:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for path in SourceWatcher(self.tex_file).files:
+            try:
+                relative = path.parent.relative_to(self.work_dir)
+            except ValueError:
+                continue
+            (self.output_dir / relative).mkdir(parents=True, exist_ok=True)
+
+    def _detect_compiler(self) -> str:
+        """Auto-detect appropriate compiler based on the document preamble.
+
+        Decisions are cached (in-process and under the user cache directory)
+        together with the (mtime, size) signature of every file consulted,
+        so unchanged documents skip detection entirely.
+        """
+        key = str(self.tex_file)
+        entry = self._detect_cache.get(key) or self._load_detect_cache().get(key)
+        if not entry or not self._signatures_match(entry['files']):
+            engine, message, files = self._scan_preamble()
+            entry = {'engine': engine, 'message': message, 'files': files}
+            if files:
+                self._save_detect_cache(key, entry)
+        self._detect_cache[key] = entry
+
+        if entry['message']:
+            print(f"[INFO] {entry['message']}")
+        return entry['engine']
+
+    def _scan_preamble(self) -> Tuple[str, Optional[str], Dict[str, List[int]]]:
+        """Stream the preamble (and preamble \\input files / local .cls/.sty).
+
+        A ``% !TEX program = ...`` magic comment wins outright; otherwise
+        Chinese markers, then fontspec, select xelatex. Reading stops at
+        ``\\begin{document}``.
+
+        Returns:
+            (engine, message, {file: [mtime_ns, size]} of files consulted)
+        """
+        files: Dict[str, List[int]] = {}
+        found: Dict[str, bool] = {}
+        queue = [self.tex_file]
+        seen = set()
+
+        while queue:
+            path = queue.pop(0)
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                st = path.stat()
+                handle = open(path, 'r', encoding='utf-8', errors='ignore')
+            except OSError:
+                continue
+            files[str(path)] = [st.st_mtime_ns, st.st_size]
+
+            with handle:
+                for line in handle:
+                    if '%' in line:
+                        magic = self.MAGIC_COMMENT.match(line)
+                        if magic and magic.group(1).lower() in ENGINE_STEPS:
+                            return magic.group(1).lower(), None, files
+                        line = self.COMMENT.sub('', line)
+                    stop = False
+                    for match in self.DETECT_PATTERN.finditer(line):
+                        kind = match.lastgroup
+                        if kind == 'begin':
+                            stop = True
+                            break
+                        if kind in ('chinese', 'fontspec'):
+                            found[kind] = True
+                        elif kind == 'input':
+                            name = match.group('input_name').strip()
+                            queue.append(self.work_dir / (name if name.endswith('.tex') else name + '.tex'))
+                        elif kind == 'local':
+                            command = match.group(0)
+                            suffix = '.cls' if 'documentclass' in command or 'LoadClass' in command else '.sty'
+                            for name in match.group('local_name').split(','):
+                                local = self.work_dir / f"{name.strip()}{suffix}"
+                                if local.exists():
+                                    queue.append(local)
+                    if stop:
+                        break
+
+        if found.get('chinese'):
+            return 'xelatex', "Detected Chinese content, using xelatex", files
+        if found.get('fontspec'):
+            return 'xelatex', "Detected fontspec package, using xelatex", files
+        return 'pdflatex', None, files
+
+    @staticmethod
+    def _signatures_match(files: Dict[str, List[int]]) -> bool:
+        for path, signature in files.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if [st.st_mtime_ns, st.st_size] != signature:
+                return False
+        return True
+
+    @staticmethod
+    def _detect_cache_file() -> Path:
+        return cache_root() / 'detect.json'
+
+    def _load_detect_cache(self) -> Dict[str, Dict]:
+        try:
+            return json.loads(self._detect_cache_file().read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_detect_cache(self, key: str, entry: Dict):
+        cache_file = self._detect_cache_file()
+        cache = self._load_detect_cache()
+        cache[key] = entry
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps(cache), encoding='utf-8')
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass
+
+    def _check_tools(self) -> Tuple[bool, str]:
+        """Check if required tools are available."""
+        # Check latexmk
+        if not shutil.which('latexmk'):
+            return False, "latexmk not found. Install TeX Live or MiKTeX."
+
+        # Check selected compiler
+        compiler_cmd = self.compiler
+        if not shutil.which(compiler_cmd):
+            return False, f"{compiler_cmd} not found. Install TeX Live or MiKTeX."
+
+        return True, "All tools available"
+
+    def compile(self, watch: bool = False, biber: bool = False) -> int:
+        """
+        Compile the LaTeX document.
+
+        Args:
+            watch: Enable continuous compilation mode
+            biber: Use biber instead of bibtex
+
+        Returns:
+            Exit code (0 for success)
+        """
+        # Check tools
+        ok, msg = self._check_tools()
+        if not ok:
+            print(f"[ERROR] {msg}")
+            return 1
+
+        if watch:
+            return self.watch(biber=biber)
+        return self._compile_once(biber=biber)
+
+    def _run(self, cmd: List[str], env: Optional[Dict[str, str]] = None,
+             step: Optional[str] = None, log: Optional[LogParser] = None,
+             cwd: Optional[Path] = None) -> int:
+        """Run one command in the working directory, piping its output through.
+
+        Output is echoed to stdout as it arrives and, when ``log`` is given,
+        fed to the streaming log parser. The command is terminated if the
+        current build is cancelled (a newer change arrived in watch mode) or
+        runs past the build timeout. Runs with a ``step`` label are timed and
+        added to the build report.
+
+        Returns:
+            The command's exit code, BUILD_CANCELLED or BUILD_TIMEOUT
+        """
+        env = dict(env or os.environ)
+        # Stop TeX from hard-wrapping messages at 79 columns
+        env.setdefault('max_print_line', '10000')
+
+        started = time.monotonic()
+        proc = subprocess.Popen(cmd, cwd=cwd or self.work_dir, env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        killer = threading.Thread(target=self._terminate_on_cancel, args=(proc,), daemon=True)
+        killer.start()
+
+        # Multibyte characters may straddle two chunks
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        while True:
+            chunk = proc.stdout.read1(65536)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                if log is not None:
+                    log.feed(text)
+            if not chunk:
+                break
+        returncode = proc.wait()
+        if log is not None:
+            log.close()
+
+        if self._timed_out:
+            returncode = BUILD_TIMEOUT
+        elif self._cancel.is_set():
+            returncode = BUILD_CANCELLED
+        if step is not None:
+            self._steps.append({
+                'step': step,
+                'command': cmd,
+                'returncode': returncode,
+                'duration': round(time.monotonic() - started, 3),
+            })
+        return returncode
+
+    def _terminate_on_cancel(self, proc: subprocess.Popen):
+        """Terminate ``proc`` if the build is cancelled or times out before it exits."""
+        while proc.poll() is None:
+            if not self._cancel.wait(0.1):
+                if self._deadline is None or time.monotonic() < self._deadline:
+                    continue
+                self._timed_out = True
+            if proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                return
+
+    def _preamble_format(self, engine: str) -> Optional[PreambleFormat]:
+        """Ready-to-use precompiled preamble for ``engine``, if enabled and possible."""
+        if not self.use_fmt:
+            return None
+        fmt = PreambleFormat(self.tex_file, engine)
+        return fmt if fmt.ensure(lambda cmd: self._run(cmd, step='fmt')) else None
+
+    def _compile_once(self, biber: bool = False) -> int:
+        """Run a single build and record its report."""
+        self._steps = []
+        self._log = None
+        self._timed_out = False
+        started = time.monotonic()
+        self._deadline = started + self.timeout if self.timeout else None
+        self._prepare_output_dir()
+        source_key = None
+        if self.build_cache:
+            source_key = self.build_cache.source_key()
+            self.build_cache.restore(source_key)
+        returncode = self._build(biber=biber)
+        if returncode == 0 and source_key:
+            self.build_cache.store(source_key)
+        self._record_outputs()
+        if returncode == BUILD_TIMEOUT:
+            print(f"\n[ERROR] Build timed out after {self.timeout:g}s")
+        self.report = self.build_report(returncode, time.monotonic() - started)
+        if self.report_file is not None and returncode != BUILD_CANCELLED:
+            self.report_file.write_text(json.dumps(self.report, indent=2, ensure_ascii=False),
+                                        encoding='utf-8')
+        return returncode
+
+    def build_report(self, returncode: int, duration: float) -> Dict:
+        """Machine-readable report of the last build.
+
+        Issues come from the last engine pass that ran; earlier passes'
+        warnings (e.g. references resolved later) are not repeated.
+        """
+        pdf_file = self.pdf_file
+        log = self._log or LogParser(self.work_dir)
+        return {
+            'file': str(self.tex_file),
+            'compiler': self.compiler,
+            'recipe': self.recipe,
+            'success': returncode == 0,
+            'returncode': returncode,
+            'pdf': str(pdf_file) if returncode == 0 and pdf_file.exists() else None,
+            'duration': round(duration, 3),
+            'steps': self._steps,
+            **log.to_dict(),
+        }
+
+    def _build(self, biber: bool = False) -> int:
+        """Run a single build with the configured recipe or latexmk."""
+        # If recipe is specified, use recipe-based compilation
+        if self.recipe:
+            return self._compile_with_recipe()
+
+        print(f"[INFO] Compiling {self.tex_file.name} with {self.compiler}")
+        print(f"[INFO] Working directory: {self.work_dir}")
+
+        # Build latexmk command
+        cmd = ['latexmk']
+
+        # Add compiler-specific options
+        fmt = None
+        if self.compiler in self.COMPILERS:
+            options = list(self.COMPILERS[self.compiler])
+            fmt = self._preamble_format(self.compiler)
+            if fmt:
+                engine_opt = f'-{self.compiler}={self.compiler} '
+                options = [o.replace(engine_opt, f'{engine_opt}-fmt={fmt.name} ') for o in options]
+            cmd.extend(options)
+        else:
+            cmd.append('-pdf')
+
+        # Add common options
+        cmd.extend([
+            '-interaction=nonstopmode',
+            '-file-line-error',
+            '-synctex=1',
+        ])
+
+        # Biber support
+        if biber:
+            cmd.append('-bibtex')
+
+        if self.output_dir != self.work_dir:
+            cmd.append(f'-outdir={self.output_dir}')
+
+        # Add input file
+        cmd.append(str(self.tex_file))
+
+        # Run compilation
+        try:
+            self._log = LogParser(self.work_dir)
+            returncode = self._run(cmd, env=fmt.env() if fmt else None,
+                                   step='latexmk', log=self._log)
+            if returncode == BUILD_CANCELLED:
+                print("\n[INFO] Compilation cancelled")
+            elif returncode == 0:
+                print(f"\n[SUCCESS] PDF generated: {self.pdf_file}")
+            else:
+                print(f"\n[ERROR] Compilation failed with exit code {returncode}")
+            return returncode
+
+        except KeyboardInterrupt:
+            print("\n[INFO] Compilation stopped by user")
+            return 0
+        except Exception as e:
+            print(f"[ERROR] {e}")
+            return 1
+
+    def watch(self, biber: bool = False, interval: float = 0.5, debounce: float = 0.3) -> int:
+        """
+        Rebuild whenever a source file changes.
+
+        Builds run in a background thread; a change that arrives while a
+        build is still running cancels it and starts a fresh one.
+
+        Args:
+            biber: Use biber instead of bibtex (latexmk mode)
+            interval: Seconds between polls
+            debounce: Seconds the sources must stay unchanged before rebuilding
+
+        Returns:
+            Exit code (0 when stopped by the user)
+        """
+        watcher = SourceWatcher(self.tex_file)
+        print(f"[INFO] Watch mode enabled ({len(watcher.files)} files tracked). Press Ctrl+C to stop.")
+
+        worker: Optional[threading.Thread] = None
+        try:
+            while True:
+                self._cancel.clear()
+                worker = threading.Thread(target=self._compile_once, args=(biber,), daemon=True)
+                worker.start()
+
+                changed = watcher.wait_for_change(interval, debounce)
+                names = ', '.join(sorted({p.name for p in changed}))
+                print(f"\n[INFO] Change detected: {names}")
+                if worker.is_alive():
+                    print("[INFO] Cancelling in-flight compile")
+                    self._cancel.set()
+                worker.join()
+        except KeyboardInterrupt:
+            self._cancel.set()
+            if worker is not None:
+                worker.join()
+            print("\n[INFO] Watch mode stopped by user")
+            return 0
+
+    def _compile_with_recipe(self) -> int:
+        """Compile using a predefined recipe (VS Code LaTeX Workshop style)."""
+        if self.recipe not in self.RECIPES:
+            print(f"[ERROR] Unknown recipe: {self.recipe}")
+            print(f"[INFO] Available recipes: {', '.join(self.RECIPES.keys())}")
+            return 1
+
+        steps = self.RECIPES[self.recipe]
+        print(f"[INFO] Using recipe: {self.recipe}")
+        print(f"[INFO] Steps: {' -> '.join(steps)}")
+        print(f"[INFO] Working directory: {self.work_dir}")
+        if self.output_dir != self.work_dir:
+            print(f"[INFO] Output directory: {self.output_dir}")
+
+        tex_base = self.tex_file.stem
+        planner = RecipePlanner(self.output_dir, tex_base, source_dir=self.work_dir)
+        # bibtex runs next to the .aux; point it back at the sources for .bib/.bst
+        bib_env = None
+        if self.output_dir != self.work_dir:
+            bib_env = dict(os.environ)
+            for var in ('BIBINPUTS', 'BSTINPUTS'):
+                bib_env[var] = f"{self.work_dir}{os.pathsep}{bib_env.get(var, '')}"
+
+        formats: Dict[str, Optional[PreambleFormat]] = {}
+
+        # Engine whose most recent pass ran in draft mode and wrote no PDF
+        draft_pending: Optional[str] = None
+
+        for i, step in enumerate(steps, 1):
+            if not self.force:
+                run, reason = planner.should_run(step)
+                if not run:
+                    print(f"\n[STEP {i}/{len(steps)}] Skipping {step} ({reason})")
+                    self._steps.append({'step': step, 'skipped': True, 'reason': reason})
+                    continue
+
+            # Intermediate passes only feed .aux/.bbl to the next pass
+            draft = (step in self.DRAFT_OPTIONS
+                     and any(s in ENGINE_STEPS for s in steps[i:])
+                     and (self.force or planner.expects_rerun()))
+            mode = " (draft)" if draft else ""
+            print(f"\n[STEP {i}/{len(steps)}] Running {step}{mode}...")
+
+            if step == 'latexmk':
+                cmd = ['latexmk', '-pdf', '-interaction=nonstopmode', '-synctex=1']
+                if self.output_dir != self.work_dir:
+                    cmd.append(f'-outdir={self.output_dir}')
+                cmd.append(str(self.tex_file))
+            elif step in ('pdflatex', 'xelatex', 'lualatex'):
+                if step not in formats:
+                    formats[step] = self._preamble_format(step)
+                cmd = self._engine_cmd(step, formats[step], draft=draft)
+            elif step == 'bibtex':
+                cmd = ['bibtex', tex_base]
+            elif step == 'biber':
+                cmd = ['biber', tex_base]
+                if self.output_dir != self.work_dir:
+                    cmd[1:1] = [f'--input-directory={self.work_dir}',
+                                f'--output-directory={self.output_dir}']
+            else:
+                print(f"[ERROR] Unknown step: {step}")
+                return 1
+
+            try:
+                planner.before_step(step)
+                fmt = formats.get(step)
+                log = None
+                if step in ENGINE_STEPS or step == 'latexmk':
+                    log = self._log = LogParser(self.work_dir)
+                if step == 'bibtex':
+                    returncode = self._run(cmd, env=bib_env, step=step, cwd=self.output_dir)
+                else:
+                    returncode = self._run(cmd, env=fmt.env() if fmt else None, step=step, log=log)
+                if draft:
+                    self._steps[-1]['draft'] = True
+                if returncode in (BUILD_CANCELLED, BUILD_TIMEOUT):
+                    if returncode == BUILD_CANCELLED:
+                        print(f"[INFO] Recipe cancelled during {step}")
+                    return returncode
+                planner.after_step(step, returncode)
+                if returncode != 0:
+                    # bibtex/biber may return non-zero for warnings, continue anyway
+                    if step not in ('bibtex', 'biber'):
+                        print(f"[ERROR] Step {step} failed with exit code {returncode}")
+                        return returncode
+                    else:
+                        print(f"[WARNING] {step} returned {returncode}, continuing...")
+
+            except FileNotFoundError:
+                print(f"[ERROR] {step} not found. Please install it.")
+                return 1
+            except Exception as e:
+                print(f"[ERROR] {e}")
+                return 1
+
+            if step in ENGINE_STEPS:
+                draft_pending = step if draft else None
+
+        if draft_pending:
+            returncode = self._finish_draft(draft_pending, formats.get(draft_pending))
+            if returncode != 0:
+                return returncode
+
+        planner.save()
+
+        pdf_file = self.pdf_file
+        if pdf_file.exists():
+            print(f"\n[SUCCESS] PDF generated: {pdf_file}")
+            return 0
+        else:
+            print(f"\n[ERROR] PDF not found: {pdf_file}")
+            return 1
+
+    def _engine_cmd(self, engine: str, fmt: Optional[PreambleFormat] = None,
+                    draft: bool = False) -> List[str]:
+        """Command line for one engine pass."""
+        cmd = [engine]
+        if fmt:
+            cmd.append(f'-fmt={fmt.name}')
+        if draft:
+            cmd.append(self.DRAFT_OPTIONS[engine])
+        cmd.extend(self._output_args())
+        # -recorder writes the .fls that tells --clean which files the pass created
+        cmd.extend(['-interaction=nonstopmode', '-shell-escape', '-file-line-error',
+                    '-synctex=1', '-recorder', str(self.tex_file)])
+        return cmd
+
+    def _finish_draft(self, engine: str, fmt: Optional[PreambleFormat]) -> int:
+        """Write the PDF when the last pass that ran was a draft pass.
+
+        xelatex leaves an .xdv behind, so only the xdvipdfmx conversion is
+        needed; other engines get one more (non-draft) pass.
+        """
+        if engine == 'xelatex':
+            print("\n[STEP] Converting .xdv to PDF with xdvipdfmx...")
+            xdv_file = self.output_dir / f"{self.tex_file.stem}.xdv"
+            cmd = ['xdvipdfmx', '-q', '-o', str(self.pdf_file), str(xdv_file)]
+        else:
+            print(f"\n[STEP] Running {engine} to write the PDF...")
+            cmd = self._engine_cmd(engine, fmt)
+
+        try:
+            log = None
+            if engine != 'xelatex':
+                log = self._log = LogParser(self.work_dir)
+            returncode = self._run(cmd, env=fmt.env() if fmt else None, step=cmd[0], log=log)
+        except FileNotFoundError:
+            print(f"[ERROR] {cmd[0]} not found. Please install it.")
+            return 1
+        if returncode not in (0, BUILD_CANCELLED, BUILD_TIMEOUT):
+            print(f"[ERROR] {cmd[0]} failed with exit code {returncode}")
+        return returncode
+
+    def _fls_outputs(self) -> List[Path]:
+        """Files the engine's .fls recorder file lists as OUTPUT."""
+        fls_file = self.output_dir / f"{self.tex_file.stem}.fls"
+        pwd = self.work_dir
+        outputs = []
+        try:
+            with open(fls_file, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    kind, _, value = line.rstrip('\n').partition(' ')
+                    if kind == 'PWD':
+                        pwd = Path(value)
+                    elif kind == 'OUTPUT':
+                        outputs.append(pwd / value)
+        except OSError:
+            pass
+        return outputs
+
+    def _generated_files(self) -> List[Path]:
+        """Files the builds wrote to the output directory.
+
+        Only files known to be generated count: ``<jobname>`` with a
+        generated suffix, the .aux files of ``\\include``d chapters and
+        whatever the .fls lists as OUTPUT. Anything else in the directory
+        -- sources, editor swap files, files edited during a watch build --
+        is never touched by --clean.
+        """
+        stem = self.tex_file.stem
+        candidates = {self.output_dir / f"{stem}{suffix}" for suffix in self.GENERATED_SUFFIXES}
+        try:
+            aux = (self.output_dir / f"{stem}.aux").read_text(encoding='utf-8', errors='ignore')
+            candidates.update(self.output_dir / name for name in RecipePlanner.AUX_INPUT.findall(aux))
+        except OSError:
+            pass
+        candidates.update(self._fls_outputs())
+        return [path for path in candidates if path.is_file()]
+
+    def _load_manifest(self) -> Optional[List[str]]:
+        try:
+            return json.loads(self.manifest_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def _record_outputs(self):
+        """Add the files the build generated to the clean manifest."""
+        manifest = set(self._load_manifest() or [])
+        for path in self._generated_files():
+            try:
+                manifest.add(path.resolve().relative_to(self.output_dir).as_posix())
+            except ValueError:
+                continue
+        manifest.discard(self.manifest_file.name)
+        try:
+            self.manifest_file.write_text(json.dumps(sorted(manifest), indent=1), encoding='utf-8')
+        except OSError:
+            pass
+
+    def clean(self, full: bool = False) -> int:
+        """
+        Clean auxiliary files.
+
+        Removes exactly the files recorded in the build manifest; projects
+        built before manifests existed fall back to ``latexmk -c``.
+
+        Args:
+            full: Also remove output PDF
+
+        Returns:
+            Exit code (0 for success)
+        """
+        print(f"[INFO] Cleaning auxiliary files in {self.output_dir}")
+
+        manifest = self._load_manifest()
+        if manifest is not None:
+            return self._clean_manifest(manifest, full)
+
+        cmd = ['latexmk', '-c']
+        if full:
+            cmd = ['latexmk', '-C']
+
+        if self.output_dir != self.work_dir:
+            cmd.append(f'-outdir={self.output_dir}')
+        cmd.append(str(self.tex_file))
+
+        try:
+            result = subprocess.run(cmd, cwd=self.work_dir, capture_output=True)
+            (self.output_dir / f"{self.tex_file.stem}.fdb_recipe").unlink(missing_ok=True)
+            if result.returncode == 0:
+                print("[SUCCESS] Auxiliary files cleaned")
+            return result.returncode
+        except Exception as e:
+            print(f"[ERROR] {e}")
+            return 1
+
+    def _clean_manifest(self, manifest: List[str], full: bool) -> int:
+        """Remove the manifest's files (keeping the PDF unless ``full``)."""
+        keep = [] if full else [f"{self.tex_file.stem}.pdf"]
+        removed = 0
+        for relative in manifest:
+            if relative in keep:
+                continue
+            path = self.output_dir / relative
+            if path.is_file():
+                path.unlink()
+                removed += 1
+
+        if self.output_dir != self.work_dir:
+            # Drop the subdirectories mirrored for \include, deepest first
+            for root, dirs, files in os.walk(self.output_dir, topdown=False):
+                if root != str(self.output_dir) and not os.listdir(root):
+                    os.rmdir(root)
+
+        remaining = [relative for relative in manifest if relative in keep]
+        if remaining:
+            self.manifest_file.write_text(json.dumps(remaining, indent=1), encoding='utf-8')
+        else:
+            self.manifest_file.unlink(missing_ok=True)
+        if full and self.build_cache:
+            self.build_cache.forget()
+            with contextlib.suppress(OSError):
+                self.output_dir.rmdir()
+        print(f"[SUCCESS] Removed {removed} generated files")
+        return 0
+
+
+def _compile_project(job: Dict) -> Dict:
+    """Compile one batch project in a worker process.
+
+    All build output goes to ``compile.log`` in the project's output
+    directory so parallel builds do not interleave on the terminal. With
+    ``build_dir`` the output directory is the project's build cache
+    directory, known only once the engine has been detected.
+    """
+    started = time.monotonic()
+    report = None
+    compiler = None
+    # Engine detection messages, written to the log once its location is known
+    setup = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(setup):
+            compiler = LaTeXCompiler(job['tex_file'], job['compiler'], job['recipe'],
+                                     force=job['force'], use_fmt=job['use_fmt'],
+                                     output_dir=None if job['build_dir'] else job['output_dir'],
+                                     timeout=job['timeout'], build_dir=job['build_dir'])
+    except Exception as e:
+        print(f"[ERROR] {e}", file=setup)
+    output_dir = compiler.output_dir if compiler else Path(job['output_dir'])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    log_file = output_dir / 'compile.log'
+
+    with open(log_file, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        log.write(setup.getvalue())
+        returncode = 1
+        if compiler is not None:
+            try:
+                returncode = compiler.compile()
+                report = compiler.report
+            except Exception as e:
+                print(f"[ERROR] {e}")
+                returncode = 1
+
+    return {
+        'project': job['tex_file'],
+        'success': returncode == 0,
+        'returncode': returncode,
+        'timed_out': returncode == BUILD_TIMEOUT,
+        'duration': round(time.monotonic() - started, 3),
+        'output_dir': str(output_dir),
+        'log': str(log_file),
+        'pdf': report['pdf'] if report else None,
+        'summary': report['summary'] if report else None,
+    }
+
+
+def read_batch_file(batch_file: Path) -> List[Path]:
+    """Read project main files (one per line, ``#`` comments) from a batch list.
+
+    Relative paths are resolved against the list file's directory.
+    """
+    projects = []
+    for line in batch_file.read_text(encoding='utf-8').splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line:
+            path = Path(line)
+            projects.append((path if path.is_absolute() else batch_file.parent / path).resolve())
+    return projects
+
+
+def run_batch(projects: List[Path], jobs: Optional[int] = None, output_root: Optional[Path] = None,
+              compiler: Optional[str] = None, recipe: Optional[str] = None, force: bool = False,
+              use_fmt: bool = False, timeout: Optional[float] = None, build_dir: bool = False) -> Dict:
+    """
+    Compile many projects on a bounded process pool.
+
+    Args:
+        projects: Main .tex files
+        jobs: Worker processes (default: CPU count)
+        output_root: Parent for per-project output directories
+            (default: ``build/`` next to each main file)
+        timeout: Per-project timeout in seconds
+        build_dir: Build each project in its own build cache directory
+            (see BuildCache) instead of an output directory
+
+    Returns:
+        Summary dict with one result per project
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    work = []
+    for i, tex_file in enumerate(projects, 1):
+        if output_root:
+            output_dir = output_root / f"{i:03d}-{tex_file.parent.name}-{tex_file.stem}"
+        else:
+            output_dir = tex_file.parent / 'build'
+        work.append({
+            'tex_file': str(tex_file),
+            'output_dir': str(output_dir),
+            'compiler': compiler,
+            'recipe': recipe,
+            'force': force,
+            'use_fmt': use_fmt,
+            'timeout': timeout,
+            'build_dir': build_dir,
+        })
+
+    print(f"[INFO] Compiling {len(work)} projects with {jobs} workers")
+    started = time.monotonic()
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(_compile_project, job): job for job in work}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                job = futures[future]
+                result = {'project': job['tex_file'], 'success': False, 'returncode': 1,
+                          'timed_out': False, 'duration': 0.0, 'output_dir': job['output_dir'],
+                          'log': None, 'pdf': None, 'summary': None, 'error': str(e)}
+            status = 'OK' if result['success'] else ('TIMEOUT' if result['timed_out'] else 'FAIL')
+            print(f"[{status}] {result['project']} ({result['duration']:.1f}s)")
+            results.append(result)
+
+    order = {job['tex_file']: i for i, job in enumerate(work)}
+    results.sort(key=lambda r: order[r['project']])
+    succeeded = sum(1 for r in results if r['success'])
+    return {
+        'total': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'jobs': jobs,
+        'duration': round(time.monotonic() - started, 3),
+        'projects': results,
+    }
+
+
+def format_batch_summary(summary: Dict) -> str:
+    """Human-readable table of a batch run."""
+    lines = []
+    lines.append("=" * 60)
+    lines.append("Batch Compile Summary")
+    lines.append("=" * 60)
+    for result in summary['projects']:
+        status = 'OK' if result['success'] else ('TIMEOUT' if result['timed_out'] else 'FAIL')
+        lines.append(f"{status:<8}{result['duration']:>8.1f}s  {result['project']}")
+        if not result['success'] and result['log']:
+            lines.append(f"{'':<18}log: {result['log']}")
+    lines.append("-" * 60)
+    lines.append(f"Succeeded: {summary['succeeded']}/{summary['total']}  "
+                 f"Wall time: {summary['duration']:.1f}s  Workers: {summary['jobs']}")
+    lines.append("=" * 60)
+    return '\n'.join(lines)
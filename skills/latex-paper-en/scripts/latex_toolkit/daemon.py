@@ -0,0 +1,318 @@
+"""
+Optional long-running analysis daemon.
+
+The skill scripts are normally separate ``python script.py`` processes, each
+paying interpreter startup, regex compilation and a full re-read of the
+project. ``latex_daemon.py start`` runs one server process on a Unix socket
+that executes the scripts' ``main()`` in-process, so imported modules,
+compiled patterns and the shared ``documents`` cache stay warm between
+calls.
+
+Clients call ``run_in_daemon(__file__)`` from their ``__main__`` block; it
+returns None when no daemon is reachable (or the daemon serves a different
+toolkit) and the script then runs in-process as before.
+
+Only scripts in the skill ``scripts/`` directories that use this toolkit
+are executed, under the client's working directory and environment. A
+client that gets no answer within ``LATEX_TOOLKIT_DAEMON_TIMEOUT`` seconds
+(default 120) runs the script in-process instead.
+
+Protocol: one JSON object per line in each direction.
+
+    {"script": "/abs/check_format.py", "argv": [...], "cwd": "...", "env": {...}, "toolkit": "..."}
+    -> {"stdout": "...", "stderr": "...", "exit": 0}
+
+    {"command": "ping" | "shutdown"} -> {"pid": ..., ...}
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .cache import cache_root, documents
+
+TOOLKIT_DIR = str(Path(__file__).resolve().parent)
+# Set to any non-empty value to always run scripts in-process
+DISABLE_ENV = 'LATEX_TOOLKIT_NO_DAEMON'
+CONNECT_TIMEOUT = 0.2
+# Seconds a client waits for a script's result before running it itself
+TIMEOUT_ENV = 'LATEX_TOOLKIT_DAEMON_TIMEOUT'
+REQUEST_TIMEOUT = 120.0
+
+
+def script_dirs() -> List[Path]:
+    """Directories whose scripts the daemon may run.
+
+    The ``scripts/`` directory holding this toolkit, plus sibling skills'
+    ``scripts/`` directories that import it through ``toolkit_path.py``.
+    """
+    own = Path(TOOLKIT_DIR).parent
+    dirs = [own]
+    skills_dir = own.parent.parent
+    for candidate in sorted(skills_dir.glob('*/scripts/toolkit_path.py')):
+        if candidate.parent != own:
+            dirs.append(candidate.parent)
+    return dirs
+
+
+def request_timeout() -> float:
+    """Client-side request timeout (LATEX_TOOLKIT_DAEMON_TIMEOUT or REQUEST_TIMEOUT)."""
+    try:
+        return float(os.environ.get(TIMEOUT_ENV, REQUEST_TIMEOUT))
+    except ValueError:
+        return REQUEST_TIMEOUT
+
+
+def socket_path() -> Path:
+    """Socket location (override with LATEX_TOOLKIT_SOCKET)."""
+    override = os.environ.get('LATEX_TOOLKIT_SOCKET')
+    return Path(override) if override else cache_root() / 'daemon.sock'
+
+
+def _request(message: Dict, timeout: float = 5.0) -> Optional[Dict]:
+    """Send one request; None if the daemon is not reachable or does not answer in time."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = socket_path()
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as stream:
+                line = stream.readline()
+    except OSError:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def run_in_daemon(script_file: str, argv: Optional[List[str]] = None) -> Optional[int]:
+    """
+    Run a script through the daemon, replaying its output locally.
+
+    Args:
+        script_file: The calling script (``__file__``)
+        argv: Arguments (default: ``sys.argv[1:]``)
+
+    Returns:
+        The script's exit code, or None if it must run in-process
+    """
+    if os.environ.get(DISABLE_ENV):
+        return None
+    response = _request({
+        'script': str(Path(script_file).resolve()),
+        'argv': sys.argv[1:] if argv is None else argv,
+        'cwd': os.getcwd(),
+        'env': dict(os.environ),
+        'toolkit': TOOLKIT_DIR,
+    }, timeout=request_timeout())
+    if response is None or 'exit' not in response:
+        return None
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stdout.flush()
+    sys.stderr.write(response.get('stderr', ''))
+    return response['exit']
+
+
+class ScriptRunner:
+    """Execute skill scripts' ``main()`` in this process.
+
+    Script modules are imported once and re-imported only when the file
+    changes. Requests are serialized: scripts use the process-wide working
+    directory, environment, argv and stdout.
+    """
+
+    def __init__(self):
+        self._modules: Dict[str, Tuple[int, object]] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _load(self, script: str):
+        mtime = os.stat(script).st_mtime_ns
+        cached = self._modules.get(script)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        script_dir = str(Path(script).parent)
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        name = f"_latex_daemon_{len(self._modules)}_{Path(script).stem}"
+        spec = importlib.util.spec_from_file_location(name, script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self._modules[script] = (mtime, module)
+        return module
+
+    def run(self, script: str, argv: List[str], cwd: str, env: Optional[Dict[str, str]] = None) -> Dict:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self._lock:
+            self.requests += 1
+            previous_argv, previous_cwd = sys.argv, os.getcwd()
+            previous_env = dict(os.environ)
+            exit_code = 0
+            try:
+                os.chdir(cwd)
+                if env is not None:
+                    os.environ.clear()
+                    os.environ.update(env)
+                sys.argv = [script] + list(argv)
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    try:
+                        self._load(script).main()
+                    except SystemExit as e:
+                        if isinstance(e.code, int):
+                            exit_code = e.code
+                        elif e.code is not None:
+                            print(e.code, file=sys.stderr)
+                            exit_code = 1
+                    except Exception as e:
+                        print(f"[ERROR] {type(e).__name__}: {e}", file=sys.stderr)
+                        exit_code = 1
+            finally:
+                sys.argv = previous_argv
+                os.chdir(previous_cwd)
+                if env is not None:
+                    os.environ.clear()
+                    os.environ.update(previous_env)
+        return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'exit': exit_code}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        server = self.server
+        server.last_active = time.monotonic()
+        command = message.get('command')
+        if command in ('ping', 'shutdown'):
+            response = server.status()
+        elif message.get('toolkit') != TOOLKIT_DIR:
+            response = {'error': f'daemon serves {TOOLKIT_DIR}'}
+        elif not server.allowed(message.get('script', '')):
+            response = {'error': f"not a toolkit script: {message.get('script')}"}
+        else:
+            env = message.get('env')
+            response = server.runner.run(message['script'], message.get('argv', []),
+                                         message.get('cwd') or os.getcwd(),
+                                         env if isinstance(env, dict) else None)
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+        if command == 'shutdown':
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class DaemonServer(socketserver.ThreadingUnixStreamServer):
+        """Socket server holding the warm state."""
+
+        daemon_threads = True
+
+        def __init__(self, path: Path, idle_timeout: Optional[float] = None):
+            self.path = path
+            self.runner = ScriptRunner()
+            self.started = time.time()
+            self.last_active = time.monotonic()
+            self.idle_timeout = idle_timeout
+            self.script_dirs = script_dirs()
+            super().__init__(str(path), _Handler)
+
+        def allowed(self, script: str) -> bool:
+            """Only .py files directly inside the toolkit's script directories run."""
+            if not script:
+                return False
+            path = Path(script).resolve()
+            return path.suffix == '.py' and path.is_file() and path.parent in self.script_dirs
+
+        def status(self) -> Dict:
+            return {
+                'pid': os.getpid(),
+                'socket': str(self.path),
+                'toolkit': TOOLKIT_DIR,
+                'uptime': round(time.time() - self.started, 1),
+                'requests': self.runner.requests,
+                'cached_documents': len(documents),
+            }
+
+        def service_actions(self):
+            if self.idle_timeout and time.monotonic() - self.last_active > self.idle_timeout:
+                threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def serve(idle_timeout: Optional[float] = None) -> int:
+    """Run the daemon in the foreground until shutdown or idle timeout."""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("[ERROR] The daemon needs Unix domain sockets")
+        return 1
+    path = socket_path()
+    if _request({'command': 'ping'}) is not None:
+        print(f"[ERROR] A daemon is already listening on {path}")
+        return 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    previous_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(path, idle_timeout)
+    finally:
+        os.umask(previous_umask)
+    print(f"[INFO] Listening on {path} (pid {os.getpid()})")
+    try:
+        server.serve_forever(poll_interval=1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+    return 0
+
+
+def start(daemon_script: str, idle_timeout: Optional[float] = None, wait: float = 5.0) -> int:
+    """Start ``daemon_script serve`` in the background and wait for its socket."""
+    status = _request({'command': 'ping'})
+    if status is not None:
+        print(f"[INFO] Daemon already running (pid {status['pid']})")
+        return 0
+    cmd = [sys.executable, daemon_script, 'serve']
+    if idle_timeout:
+        cmd.extend(['--idle', str(idle_timeout)])
+    subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        status = _request({'command': 'ping'})
+        if status is not None:
+            print(f"[SUCCESS] Daemon started (pid {status['pid']}) on {status['socket']}")
+            return 0
+        time.sleep(0.05)
+    print("[ERROR] Daemon did not come up")
+    return 1
+
+
+def stop() -> int:
+    """Ask a running daemon to exit."""
+    status = _request({'command': 'shutdown'})
+    if status is None:
+        print("[INFO] No daemon running")
+        return 0
+    print(f"[SUCCESS] Daemon stopped (pid {status['pid']}, {status['requests']} requests served)")
+    return 0
+
+
+def status() -> Optional[Dict]:
+    """Status of the running daemon, or None."""
+    return _request({'command': 'ping'})
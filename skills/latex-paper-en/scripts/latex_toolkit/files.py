@@ -0,0 +1,141 @@
+"""
+Dependency walking for LaTeX projects.
+
+``SourceWatcher`` follows the include graph from a main file and polls the
+files it reaches; its ``files`` list doubles as the project file walker for
+the other scripts.
+"""
+
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .cache import documents
+
+
+class SourceWatcher:
+    """Poll the files a document depends on for changes.
+
+    The dependency set is the include graph reachable from the main file
+    (\\input, \\include, \\subfile, \\import, \\subimport), bibliography
+    databases, graphics and local .sty/.cls files. Only those files are
+    stat()ed on each poll; the graph itself is rescanned after a change,
+    so new includes are picked up automatically.
+    """
+
+    DEPENDENCY = re.compile(
+        r'\\(?P<cmd>input|include|subfile|import|subimport|bibliography|addbibresource'
+        r'|includegraphics|usepackage|RequirePackage|documentclass)\*?'
+        r'(?:\[[^\]]*\])?\{(?P<arg>[^}]+)\}(?:\{(?P<arg2>[^}]+)\})?'
+    )
+    GRAPHICS_EXTENSIONS = ('', '.pdf', '.png', '.jpg', '.jpeg', '.eps')
+
+    def __init__(self, main_file: Path):
+        self.main_file = main_file
+        self.root_dir = main_file.parent
+        self.files: List[Path] = []
+        self._snapshot: Dict[Path, Optional[Tuple[int, int]]] = {}
+        self.refresh()
+
+    def refresh(self):
+        """Rescan the include graph and take a new baseline snapshot."""
+        self.files = self._collect()
+        self._snapshot = self.snapshot()
+
+    def _candidates(self, cmd: str, arg: str, arg2: Optional[str], current: Path) -> List[Path]:
+        """Possible on-disk paths for one dependency command."""
+        bases = [current.parent, self.root_dir]
+        if cmd in ('import', 'subimport') and arg2:
+            base = (current.parent if cmd == 'subimport' else self.root_dir) / arg.strip()
+            bases, arg = [base], arg2
+        names = [a.strip() for a in arg.split(',') if a.strip()]
+
+        paths = []
+        for name in names:
+            if cmd in ('usepackage', 'RequirePackage', 'documentclass'):
+                suffix = '.cls' if cmd == 'documentclass' else '.sty'
+                local = self.root_dir / f"{name}{suffix}"
+                if local.exists():
+                    paths.append(local)
+                continue
+            if cmd == 'includegraphics':
+                suffixes = self.GRAPHICS_EXTENSIONS
+            elif cmd == 'bibliography':
+                suffixes = ('' if name.endswith('.bib') else '.bib',)
+            elif cmd == 'addbibresource':
+                suffixes = ('',)
+            else:
+                suffixes = ('' if Path(name).suffix else '.tex',)
+            found = None
+            for base in bases:
+                for suffix in suffixes:
+                    candidate = (base / f"{name}{suffix}").resolve()
+                    if candidate.is_file():
+                        found = candidate
+                        break
+                if found:
+                    break
+            if found:
+                paths.append(found)
+            elif cmd != 'includegraphics':
+                # Watch missing sources too, so creating them triggers a build
+                paths.append((bases[0] / f"{name}{suffixes[0]}").resolve())
+        return paths
+
+    def _collect(self) -> List[Path]:
+        """Walk the include graph iteratively, starting at the main file."""
+        seen = {self.main_file}
+        order = [self.main_file]
+        stack = [self.main_file]
+        while stack:
+            current = stack.pop()
+            content = documents.masked(current)
+            if content is None:
+                continue
+            for match in self.DEPENDENCY.finditer(content):
+                for path in self._candidates(match.group('cmd'), match.group('arg'),
+                                             match.group('arg2'), current):
+                    if path in seen:
+                        continue
+                    seen.add(path)
+                    order.append(path)
+                    if path.suffix == '.tex':
+                        stack.append(path)
+        return order
+
+    def snapshot(self) -> Dict[Path, Optional[Tuple[int, int]]]:
+        """(mtime_ns, size) of every tracked file, None if missing."""
+        result = {}
+        for path in self.files:
+            try:
+                st = path.stat()
+                result[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                result[path] = None
+        return result
+
+    def wait_for_change(self, interval: float = 0.5, debounce: float = 0.3) -> List[Path]:
+        """Block until tracked files change and then stay quiet for ``debounce`` seconds.
+
+        Returns:
+            The files that changed
+        """
+        baseline = self._snapshot
+        current = baseline
+        while current == baseline:
+            time.sleep(interval)
+            current = self.snapshot()
+
+        # Debounce: editors often write several times per save
+        quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < debounce:
+            time.sleep(min(interval, debounce) / 2)
+            latest = self.snapshot()
+            if latest != current:
+                current = latest
+                quiet_since = time.monotonic()
+
+        changed = [p for p in current if baseline.get(p) != current[p]]
+        self.refresh()
+        return changed
@@ -0,0 +1,221 @@
+"""
+Include graph of a LaTeX project.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .cache import cache_root, documents
+
+# (command, argument, second argument of \import/\subimport)
+IncludeRecord = Tuple[str, str, Optional[str]]
+
+
+class IncludeGraph:
+    """Files reachable from a main file through \\input, \\include,
+    \\subfile, \\import and \\subimport.
+
+    Each file's include commands are extracted with one combined regex over
+    comment-masked text. The result is cached per file: in memory, and on
+    disk under ``<cache>/graph`` keyed by (mtime, size) with the content
+    hash as a fallback, so rebuilding the graph after an edit re-reads only
+    the edited file. Traversal is an iterative depth-first walk in document
+    order; files reached twice (including cycles) are listed once.
+
+    Attributes:
+        nodes: One dict per reached file in document order: ``path``,
+            ``level``, ``parent``, ``command`` and ``exists``
+        edges: Included files per existing file, in document order
+        cycles: ``(file, included)`` pairs that close an include cycle
+    """
+
+    INCLUDE = re.compile(
+        r'\\(?P<cmd>input|include|subfile|import|subimport)\*?\s*'
+        r'\{(?P<arg>[^}]*)\}(?:\s*\{(?P<arg2>[^}]*)\})?'
+    )
+
+    def __init__(self, main_file: Path, cache_dir: Optional[Path] = None):
+        self.main_file = Path(main_file).resolve()
+        self.root_dir = self.main_file.parent
+        project = hashlib.sha1(str(self.main_file).encode('utf-8')).hexdigest()[:8]
+        self.cache_file = (cache_dir or cache_root() / 'graph') / f"{self.main_file.stem}-{project}.json"
+        self.nodes: List[Dict] = []
+        self.edges: Dict[Path, List[Path]] = {}
+        self.cycles: List[Tuple[Path, Path]] = []
+        self.rescanned: List[Path] = []
+        self._cache: Optional[Dict[str, List]] = None
+        self._dirty = False
+
+    # --- Edge cache ---
+
+    def _load_cache(self) -> Dict[str, List]:
+        if self._cache is None:
+            try:
+                self._cache = json.loads(self.cache_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                self._cache = {}
+        return self._cache
+
+    def _save_cache(self):
+        if not self._dirty:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps(self._cache), encoding='utf-8')
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            pass
+        self._dirty = False
+
+    def _records(self, path: Path, st: os.stat_result) -> List[IncludeRecord]:
+        """Include commands of one file, from the cache when it is unchanged."""
+        cache = self._load_cache()
+        key = str(path)
+        entry = cache.get(key)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return [tuple(r) for r in entry[3]]
+
+        content = documents.masked(path)
+        if content is None:
+            return []
+        digest = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        if entry and entry[2] == digest:
+            records = [tuple(r) for r in entry[3]]
+        else:
+            self.rescanned.append(path)
+            records = [(m.group('cmd'), m.group('arg').strip(),
+                        m.group('arg2').strip() if m.group('arg2') is not None else None)
+                       for m in self.INCLUDE.finditer(content)]
+        cache[key] = [st.st_mtime_ns, st.st_size, digest, records]
+        self._dirty = True
+        return records
+
+    # --- Resolution ---
+
+    def resolve(self, record: IncludeRecord, current: Path) -> Optional[Path]:
+        """On-disk path of an include (a best-guess path if it is missing)."""
+        cmd, arg, arg2 = record
+        if cmd in ('import', 'subimport'):
+            if arg2 is None:
+                return None
+            base = current.parent if cmd == 'subimport' else self.root_dir
+            bases = [Path(os.path.normpath(base / arg))]
+            name = arg2
+        else:
+            # Relative to the including file first, then to the main file
+            bases = [current.parent, self.root_dir]
+            name = arg
+        if not name:
+            return None
+        if not Path(name).suffix:
+            name += '.tex'
+        candidates = [Path(os.path.normpath(b / name)) for b in bases]
+        for candidate in candidates:
+            if candidate.is_file():
+                return candidate
+        return candidates[-1]
+
+    # --- Traversal ---
+
+    def build(self) -> 'IncludeGraph':
+        """Walk the graph from the main file (iteratively, cycle-safe)."""
+        self.nodes = []
+        self.edges = {}
+        self.cycles = []
+        self.rescanned = []
+        seen = set()
+        ancestors: Dict[Path, Optional[Path]] = {}
+        stack: List[Tuple[Path, int, Optional[Path], Optional[str]]] = [(self.main_file, 0, None, None)]
+        while stack:
+            path, level, parent, command = stack.pop()
+            if path in seen:
+                if parent is not None and self._is_ancestor(path, parent, ancestors):
+                    self.cycles.append((parent, path))
+                continue
+            seen.add(path)
+            ancestors[path] = parent
+            try:
+                st = path.stat()
+            except OSError:
+                st = None
+            self.nodes.append({'path': path, 'level': level, 'parent': parent,
+                               'command': command, 'exists': st is not None})
+            if st is None:
+                continue
+            children = []
+            for record in self._records(path, st):
+                child = self.resolve(record, path)
+                if child is not None:
+                    children.append((child, record[0]))
+            self.edges[path] = [child for child, _ in children]
+            # Reversed so the first include is visited first
+            for child, cmd in reversed(children):
+                stack.append((child, level + 1, path, cmd))
+        self._save_cache()
+        return self
+
+    @staticmethod
+    def _is_ancestor(path: Path, node: Path, ancestors: Dict[Path, Optional[Path]]) -> bool:
+        current: Optional[Path] = node
+        while current is not None:
+            if current == path:
+                return True
+            current = ancestors.get(current)
+        return False
+
+    def walk(self) -> Iterator[Tuple[Path, int, str]]:
+        """Comment-masked document text in reading order.
+
+        Yields ``(file, line_number, text)`` with each include replaced by
+        the included file's lines, so a line holding an include is split
+        around it. Each file is expanded once, at its first include.
+        """
+        seen = {self.main_file}
+        # (file, lines, next line index, column to resume at)
+        stack: List[Tuple[Path, List[str], int, int]] = []
+        main = documents.masked(self.main_file)
+        if main is not None:
+            stack.append((self.main_file, main.split('\n'), 0, 0))
+        while stack:
+            path, lines, index, column = stack.pop()
+            while index < len(lines):
+                line = lines[index]
+                child = None
+                for match in self.INCLUDE.finditer(line, column):
+                    record = (match.group('cmd'), match.group('arg').strip(),
+                              match.group('arg2').strip() if match.group('arg2') is not None else None)
+                    target = self.resolve(record, path)
+                    if target is None or target in seen:
+                        continue
+                    content = documents.masked(target)
+                    if content is None:
+                        continue
+                    seen.add(target)
+                    child = (target, content.split('\n'))
+                    break
+                if child is None:
+                    yield path, index + 1, line[column:]
+                    index += 1
+                    column = 0
+                    continue
+                yield path, index + 1, line[column:match.start()]
+                stack.append((path, lines, index, match.end()))
+                stack.append((child[0], child[1], 0, 0))
+                break
+
+    @property
+    def files(self) -> List[Path]:
+        """Existing files in document order."""
+        return [node['path'] for node in self.nodes if node['exists']]
+
+    def relative(self, path: Path) -> str:
+        """Path relative to the main file's directory (absolute if outside it)."""
+        try:
+            return path.relative_to(self.root_dir).as_posix()
+        except ValueError:
+            return str(path)
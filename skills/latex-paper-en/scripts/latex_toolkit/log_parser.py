@@ -0,0 +1,197 @@
+"""
+Streaming parser for TeX engine output and .log files.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class LogParser:
+    """Streaming parser for TeX engine output and .log files.
+
+    Text is fed in arbitrary chunks; only the current partial line and a
+    bounded number of issues per category are kept, so multi-megabyte logs
+    are processed in constant memory. Extracted categories:
+
+    - errors: ``file:line: message`` (-file-line-error) and ``! message``
+    - warnings: LaTeX/Package/Class warnings
+    - boxes: overfull/underfull boxes
+    - undefined_references / undefined_citations
+
+    Locations come from -file-line-error, ``l.<n>`` context lines,
+    ``on input line <n>`` / ``at lines <a>--<b>`` and the engine's
+    ``(file`` ... ``)`` nesting. A new engine banner (latexmk reruns)
+    resets the collected issues so only the final pass is reported.
+    """
+
+    CATEGORIES = ('errors', 'warnings', 'boxes', 'undefined_references', 'undefined_citations')
+    MAX_ISSUES = 200
+
+    BANNER = re.compile(r'^This is (?:pdfTeX|XeTeX|LuaTeX|LuaHBTeX|e-TeX|TeX),')
+    FILE_LINE_ERROR = re.compile(r'^(?P<file>(?:[A-Za-z]:)?[^:\s]*\.\w+):(?P<line>\d+): (?P<message>.+)')
+    BANG_ERROR = re.compile(r'^! (?P<message>.+)')
+    CONTEXT_LINE = re.compile(r'^l\.(?P<line>\d+)')
+    WARNING = re.compile(r'^(?:LaTeX(?: (?P<module>\w+))?|Package (?P<package>\S+)|Class (?P<cls>\S+))'
+                         r' Warning: (?P<message>.*)')
+    UNDEFINED = re.compile(r"(?P<kind>Reference|Citation) [`'](?P<key>[^']+)' on page \S+ undefined")
+    BOX = re.compile(r'^(?P<kind>Overfull|Underfull) \\[hv]box \((?P<detail>[^)]*)\).*?(?:lines? (?P<line>\d+)(?:--\d+)?)?$')
+    INPUT_LINE = re.compile(r'on input line (?P<line>\d+)')
+    PAREN = re.compile(r'\((?P<path>[^\s()]*)|\)')
+
+    def __init__(self, work_dir: Optional[Path] = None):
+        self.work_dir = work_dir
+        self._partial = ''
+        self._paths: Dict[str, str] = {}
+        self.reset()
+
+    def reset(self):
+        """Forget collected issues (a new engine run started)."""
+        self.issues: Dict[str, List[Dict]] = {c: [] for c in self.CATEGORIES}
+        self.counts: Dict[str, int] = {c: 0 for c in self.CATEGORIES}
+        self._files: List[Optional[str]] = []
+        self._pending_error: Optional[Dict] = None
+        self._pending_warning: Optional[Dict] = None
+
+    @classmethod
+    def parse_file(cls, log_file: Path) -> 'LogParser':
+        """Parse a .log file line by line."""
+        parser = cls(log_file.parent)
+        with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                parser.feed_line(line.rstrip('\n'))
+        parser.close()
+        return parser
+
+    def feed(self, text: str):
+        """Feed a chunk of output; incomplete lines are buffered."""
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self.feed_line(line.rstrip('\r'))
+
+    def close(self):
+        """Flush the buffered partial line and pending multi-line messages."""
+        if self._partial:
+            self.feed_line(self._partial)
+            self._partial = ''
+        self._flush_warning()
+        self._pending_error = None
+
+    def _current_file(self) -> Optional[str]:
+        for path in reversed(self._files):
+            if path and path.endswith('.tex'):
+                return self._relative(path)
+        return None
+
+    def _relative(self, path: str) -> str:
+        if path not in self._paths:
+            relative = path[2:] if path.startswith('./') else path
+            if self.work_dir:
+                try:
+                    relative = str((self.work_dir / path).resolve().relative_to(self.work_dir))
+                except (ValueError, OSError):
+                    pass
+            self._paths[path] = relative
+        return self._paths[path]
+
+    def _add(self, category: str, issue: Dict):
+        self.counts[category] += 1
+        if len(self.issues[category]) < self.MAX_ISSUES:
+            self.issues[category].append(issue)
+
+    def _flush_warning(self):
+        warning = self._pending_warning
+        if warning is None:
+            return
+        self._pending_warning = None
+        message = warning['message']
+        match = self.INPUT_LINE.search(message)
+        if match:
+            warning['line'] = int(match.group('line'))
+        undefined = self.UNDEFINED.search(message)
+        if undefined:
+            category = ('undefined_citations' if undefined.group('kind') == 'Citation'
+                        else 'undefined_references')
+            warning['key'] = undefined.group('key')
+            self._add(category, warning)
+        else:
+            self._add('warnings', warning)
+
+    def _track_files(self, line: str):
+        for match in self.PAREN.finditer(line):
+            path = match.group('path')
+            if path is None:
+                if self._files:
+                    self._files.pop()
+            else:
+                self._files.append(path if ('.' in path or '/' in path) else None)
+
+    def feed_line(self, line: str):
+        """Process one complete line."""
+        if self.BANNER.match(line):
+            self.reset()
+            return
+
+        if self._pending_warning is not None:
+            prefix = self._pending_warning.pop('_continuation', None)
+            if prefix and line.startswith(prefix):
+                self._pending_warning['message'] += ' ' + line[len(prefix):].strip()
+                self._pending_warning['_continuation'] = prefix
+                return
+            self._flush_warning()
+
+        if self._pending_error is not None:
+            match = self.CONTEXT_LINE.match(line)
+            if match:
+                self._pending_error.setdefault('line', int(match.group('line')))
+                self._pending_error = None
+                return
+
+        match = self.FILE_LINE_ERROR.match(line)
+        if match:
+            issue = {'type': 'error', 'message': match.group('message').strip(),
+                     'file': self._relative(match.group('file')), 'line': int(match.group('line'))}
+            self._add('errors', issue)
+            self._pending_error = issue
+            return
+
+        match = self.BANG_ERROR.match(line)
+        if match:
+            issue = {'type': 'error', 'message': match.group('message').strip(),
+                     'file': self._current_file()}
+            self._add('errors', issue)
+            self._pending_error = issue
+            return
+
+        match = self.WARNING.match(line)
+        if match:
+            # Multi-line warnings continue with "(<package>)" padding lines
+            source = match.group('package') or match.group('cls') or match.group('module')
+            self._pending_warning = {
+                'type': 'warning',
+                'source': match.group('package') or match.group('cls') or 'LaTeX',
+                'message': match.group('message').strip(),
+                'file': self._current_file(),
+                '_continuation': f"({source})" if source else None,
+            }
+            return
+
+        match = self.BOX.match(line)
+        if match:
+            issue = {'type': match.group('kind').lower(), 'message': line.strip(),
+                     'detail': match.group('detail'), 'file': self._current_file()}
+            if match.group('line'):
+                issue['line'] = int(match.group('line'))
+            self._add('boxes', issue)
+            return
+
+        self._track_files(line)
+
+    def to_dict(self) -> Dict:
+        """Summary counts plus the (capped) issue lists."""
+        result: Dict = {'summary': dict(self.counts)}
+        for category in self.CATEGORIES:
+            result[category] = [{k: v for k, v in issue.items() if not k.startswith('_')}
+                                for issue in self.issues[category]]
+        return result
@@ -0,0 +1,185 @@
+"""
+Chapter/section outline with per-section statistics.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .cache import documents
+from .graph import IncludeGraph
+
+HEADING_RANKS = {'chapter': 1, 'section': 2, 'subsection': 3}
+STAT_KEYS = ('words', 'figures', 'tables', 'equations', 'citations')
+
+FIGURE_ENVS = {'figure', 'figure*', 'sidewaysfigure', 'subfigure'}
+TABLE_ENVS = {'table', 'table*', 'sidewaystable', 'longtable'}
+MATH_ENVS = {'equation', 'equation*', 'align', 'align*', 'gather', 'gather*',
+             'multline', 'multline*', 'eqnarray', 'eqnarray*', 'displaymath', 'flalign', 'flalign*'}
+
+TOKEN = re.compile(
+    r'\\(?P<heading>chapter|section|subsection)(?P<star>\*)?\s*(?:\[[^\]]*\])?\s*\{'
+    r'|\\begin\{(?P<begin>[A-Za-z*]+)\}'
+    r'|\\end\{(?P<end>[A-Za-z*]+)\}'
+    r'|\\(?P<cite>[A-Za-z]*cite[A-Za-z]*)\*?\s*(?:\[[^\]]*\]\s*)*\{(?P<keys>[^}]*)\}'
+    r'|(?P<display>\\\[|\\\]|\$\$)'
+)
+INLINE_MATH = re.compile(r'(?<![\\$])\$(?!\$)(?:[^$\\]|\\.)*\$')
+# Commands whose argument is a key, file name or heading, not prose: blanked with it
+ARGUMENT_COMMAND = re.compile(
+    r'\\(?:label|[A-Za-z]*ref|[A-Za-z]*cite[A-Za-z]*|(?:sub)*section|chapter|paragraph'
+    r'|includegraphics|input|include|bibliography[a-z]*|usepackage|documentclass)\*?'
+    r'\s*(?:\[[^\]]*\]\s*)*\{[^}]*\}'
+)
+COMMAND = re.compile(r'\\[A-Za-z@]+\*?|\\.')
+CJK = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+LATIN_WORD = re.compile(r"[A-Za-z0-9]+(?:['\-][A-Za-z0-9]+)*")
+
+
+def count_words(text: str) -> int:
+    """Words in LaTeX source text: each CJK character counts as one word.
+
+    Labels, references, citation keys, file names and heading titles are
+    not counted.
+    """
+    text = COMMAND.sub(' ', ARGUMENT_COMMAND.sub(' ', text))
+    cjk = len(CJK.findall(text))
+    return cjk + len(LATIN_WORD.findall(CJK.sub(' ', text)))
+
+
+def _title(line: str, start: int) -> Tuple[str, int]:
+    """Brace-balanced heading title starting after the opening brace, and
+    the index just past its closing brace (the line length if unclosed)."""
+    depth = 1
+    for i in range(start, len(line)):
+        if line[i] == '{':
+            depth += 1
+        elif line[i] == '}':
+            depth -= 1
+            if depth == 0:
+                title = COMMAND.sub(' ', line[start:i]).replace('{', '').replace('}', '')
+                return ' '.join(title.split()), i + 1
+    return ' '.join(line[start:].split()), len(line)
+
+
+class OutlineBuilder:
+    """One pass over the document (following the include graph) that
+    collects chapter/section/subsection headings with their source ranges.
+
+    Statistics -- words (CJK-aware), figures, tables, equations, citations
+    and citations per 1000 words -- cover a heading's whole subtree, up to
+    the next heading of the same or a higher level.
+    """
+
+    def __init__(self, main_file: Path, graph: Optional[IncludeGraph] = None):
+        self.graph = graph or IncludeGraph(main_file)
+
+    def build(self) -> Dict:
+        graph = self.graph
+        front = {'id': '0', 'level': 'front', 'title': '(before first heading)', 'rank': 0,
+                 **{key: 0 for key in STAT_KEYS}}
+        sections: List[Dict] = []
+        open_nodes: List[Dict] = []
+        counters = [0, 0, 0]
+        parents: Dict[int, Optional[Dict]] = {}
+        in_math: Optional[str] = None
+        in_display = False
+        last_pos = None
+        # Skip the preamble when the main file has one
+        main = documents.masked(graph.main_file) or ''
+        in_body = '\\begin{document}' not in main
+
+        def close(rank: int):
+            while open_nodes and open_nodes[-1]['rank'] >= rank:
+                open_nodes.pop()['end'] = last_pos
+
+        for path, line_number, line in graph.walk():
+            if not in_body:
+                begin = line.find('\\begin{document}')
+                if begin < 0:
+                    continue
+                in_body = True
+                line = line[begin + len('\\begin{document}'):]
+            position = f"{graph.relative(path)}:{line_number}"
+            line = INLINE_MATH.sub(' ', line)
+            current = open_nodes[-1] if open_nodes else front
+            last = 0
+            for match in TOKEN.finditer(line):
+                if not (in_math or in_display):
+                    current['words'] += count_words(line[last:match.start()])
+                last = match.end()
+
+                if match.group('heading'):
+                    level = match.group('heading')
+                    rank = HEADING_RANKS[level]
+                    close(rank)
+                    counters[rank - 1] += 1
+                    for deeper in range(rank, len(counters)):
+                        counters[deeper] = 0
+                    # The title is not prose: resume counting after it
+                    title, last = _title(line, match.end())
+                    node = {
+                        'id': '.'.join(str(c) for c in counters[:rank] if c),
+                        'level': level,
+                        'title': title,
+                        'rank': rank,
+                        'start': position,
+                        'end': position,
+                        **{key: 0 for key in STAT_KEYS},
+                    }
+                    if match.group('star'):
+                        node['starred'] = True
+                    parents[id(node)] = open_nodes[-1] if open_nodes else None
+                    sections.append(node)
+                    open_nodes.append(node)
+                    current = node
+                elif match.group('begin'):
+                    env = match.group('begin')
+                    if env in FIGURE_ENVS:
+                        current['figures'] += 1
+                    elif env in TABLE_ENVS:
+                        current['tables'] += 1
+                    elif env in MATH_ENVS and not in_math:
+                        current['equations'] += 1
+                        in_math = env
+                elif match.group('end'):
+                    if match.group('end') == in_math:
+                        in_math = None
+                elif match.group('cite'):
+                    current['citations'] += len([k for k in match.group('keys').split(',') if k.strip()])
+                elif match.group('display'):
+                    if match.group('display') == '\\]':
+                        in_display = False
+                    elif match.group('display') == '$$' and in_display:
+                        in_display = False
+                    elif not in_math:
+                        current['equations'] += 1
+                        in_display = True
+            if not (in_math or in_display):
+                current['words'] += count_words(line[last:])
+            if line.strip():
+                last_pos = position
+        close(0)
+
+        # Roll subtree statistics up into parents (children follow parents)
+        totals = {key: front[key] for key in STAT_KEYS}
+        for node in sections:
+            for key in STAT_KEYS:
+                totals[key] += node[key]
+        for node in reversed(sections):
+            parent = parents[id(node)]
+            if parent is not None:
+                for key in STAT_KEYS:
+                    parent[key] += node[key]
+
+        for node in [front] + sections:
+            node.pop('rank')
+            node['citation_density'] = round(1000 * node['citations'] / node['words'], 2) if node['words'] else 0.0
+        totals['citation_density'] = round(1000 * totals['citations'] / totals['words'], 2) if totals['words'] else 0.0
+
+        return {
+            'main': graph.relative(graph.main_file),
+            'totals': totals,
+            'front': front,
+            'sections': sections,
+        }
@@ -0,0 +1,65 @@
+"""
+Sentence splitting and token estimation for extracted prose.
+"""
+
+import re
+from typing import List
+
+from . import token_budget
+
+# Words ending in '.' that do not end a sentence (compared lowercased,
+# without the final period)
+ABBREVIATIONS = {
+    'al', 'e.g', 'i.e', 'etc', 'vs', 'cf', 'viz', 'resp', 'approx', 'ca',
+    'fig', 'figs', 'eq', 'eqs', 'eqn', 'sec', 'secs', 'tab', 'ch', 'chap',
+    'ref', 'refs', 'no', 'nos', 'vol', 'pp', 'ed', 'eds',
+    'dr', 'mr', 'mrs', 'ms', 'prof', 'jr', 'sr', 'st', 'inc', 'ltd', 'co',
+}
+
+# CJK terminators end a sentence without following whitespace; Latin ones
+# need whitespace (or the end of text) after optional closing quotes
+BOUNDARY = re.compile(
+    r'[。！？]+[”’"」』）)]*\s*'
+    r'|(?P<latin>[.!?]+)[”’"\')\]]*(?:\s+|$)'
+)
+LAST_WORD = re.compile(r'(\S+?)\.+$')
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split prose into sentences.
+
+    Handles Chinese terminators (。！？), closing quotes and brackets after
+    the terminator, and common abbreviations (e.g., et al., Fig., Eq.)
+    and initials, which do not end a sentence.
+    """
+    sentences = []
+    start = 0
+    for match in BOUNDARY.finditer(text):
+        if (match.group('latin') or '').endswith('.'):
+            word = LAST_WORD.search(text, start, match.end('latin'))
+            if word:
+                token = word.group(1).lstrip('([{"“‘\'')
+                if token.lower() in ABBREVIATIONS or re.fullmatch(r'[A-Z]', token):
+                    continue
+            following = text[match.end():match.end() + 1]
+            if following.islower():
+                continue
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate LLM token count without a tokenizer.
+
+    Uses the toolkit's copy of the repository's token_budget.py, the same
+    estimator install.py and package_skill.py report budgets with.
+    """
+    return token_budget.estimate_tokens(text)
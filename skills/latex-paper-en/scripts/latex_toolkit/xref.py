@@ -0,0 +1,130 @@
+"""
+Static \\label / \\ref cross-reference index.
+"""
+
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .graph import IncludeGraph
+
+# Expected label prefixes by the environment a label sits in
+PREFIXES = {
+    'figure': ('fig:',),
+    'table': ('tab:', 'table:'),
+    'equation': ('eq:', 'eqn:'),
+}
+ENV_KINDS = {
+    'figure': 'figure', 'figure*': 'figure', 'subfigure': 'figure', 'sidewaysfigure': 'figure',
+    'wrapfigure': 'figure',
+    'table': 'table', 'table*': 'table', 'subtable': 'table', 'sidewaystable': 'table',
+    'longtable': 'table', 'wraptable': 'table',
+    'equation': 'equation', 'equation*': 'equation', 'align': 'equation', 'align*': 'equation',
+    'gather': 'equation', 'gather*': 'equation', 'multline': 'equation', 'multline*': 'equation',
+    'eqnarray': 'equation', 'eqnarray*': 'equation', 'flalign': 'equation', 'flalign*': 'equation',
+    'subequations': 'equation',
+}
+
+TOKEN = re.compile(
+    r'\\(?P<label>label)\s*\{(?P<key>[^}]*)\}'
+    r'|\\(?P<ref>ref|eqref|pageref|autoref|nameref|vref|[cC]ref|[cC]pageref|labelcref)\*?\s*\{(?P<keys>[^}]*)\}'
+    r'|\\begin\{(?P<begin>[A-Za-z*]+)\}'
+    r'|\\end\{(?P<end>[A-Za-z*]+)\}'
+)
+
+
+class CrossReferenceIndex:
+    """Labels and references of a document, collected in one pass over the
+    include graph (no compilation).
+
+    Attributes:
+        labels: key -> list of ``{'file', 'line', 'kind'}`` definitions
+        refs: key -> list of ``{'file', 'line', 'command'}`` uses
+    """
+
+    def __init__(self, main_file: Path, graph: Optional[IncludeGraph] = None):
+        self.graph = graph or IncludeGraph(main_file)
+        self.labels: Dict[str, List[Dict]] = defaultdict(list)
+        self.refs: Dict[str, List[Dict]] = defaultdict(list)
+
+    def build(self) -> 'CrossReferenceIndex':
+        graph = self.graph
+        self.labels.clear()
+        self.refs.clear()
+        envs: List[str] = []
+        for path, line_number, line in graph.walk():
+            if '\\' not in line:
+                continue
+            for match in TOKEN.finditer(line):
+                if match.group('begin'):
+                    envs.append(match.group('begin'))
+                elif match.group('end'):
+                    env = match.group('end')
+                    if env in envs:
+                        # Pop back to the matching \begin (tolerates unbalanced input)
+                        del envs[len(envs) - 1 - envs[::-1].index(env):]
+                elif match.group('label'):
+                    key = match.group('key').strip()
+                    if key and '#' not in key:
+                        self.labels[key].append({
+                            'file': graph.relative(path),
+                            'line': line_number,
+                            'kind': self._kind(envs),
+                        })
+                else:
+                    for key in match.group('keys').split(','):
+                        key = key.strip()
+                        if key and '#' not in key:
+                            self.refs[key].append({
+                                'file': graph.relative(path),
+                                'line': line_number,
+                                'command': match.group('ref'),
+                            })
+        return self
+
+    @staticmethod
+    def _kind(envs: List[str]) -> Optional[str]:
+        """Kind of the innermost figure/table/equation environment, if any."""
+        for env in reversed(envs):
+            if env in ENV_KINDS:
+                return ENV_KINDS[env]
+        return None
+
+    def check(self, prefixes: bool = True) -> Dict:
+        """
+        Cross-reference problems.
+
+        Args:
+            prefixes: Also report labels that break the fig:/tab:/eq: convention
+
+        Returns:
+            Dict with undefined_refs, duplicate_labels, unused_labels,
+            prefix_violations and counts
+        """
+        undefined = [{'key': key, **use} for key, uses in self.refs.items()
+                     if key not in self.labels for use in uses]
+        duplicates = [{'key': key, 'definitions': defs} for key, defs in self.labels.items()
+                      if len(defs) > 1]
+        unused = [{'key': key, **defs[0]} for key, defs in self.labels.items()
+                  if key not in self.refs]
+        violations = []
+        if prefixes:
+            for key, defs in self.labels.items():
+                for definition in defs:
+                    expected = PREFIXES.get(definition['kind'])
+                    if expected and not key.startswith(expected):
+                        violations.append({'key': key, 'expected': expected[0], **definition})
+
+        undefined.sort(key=lambda i: (i['file'], i['line']))
+        unused.sort(key=lambda i: (i['file'], i['line']))
+        violations.sort(key=lambda i: (i['file'], i['line']))
+        return {
+            'status': 'FAIL' if undefined or duplicates else ('WARNING' if unused or violations else 'PASS'),
+            'labels': len(self.labels),
+            'references': sum(len(uses) for uses in self.refs.values()),
+            'undefined_refs': undefined,
+            'duplicate_labels': duplicates,
+            'unused_labels': unused,
+            'prefix_violations': violations,
+        }
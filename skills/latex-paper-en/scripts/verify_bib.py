@@ -14,6 +14,9 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 
+from latex_toolkit import documents
+from latex_toolkit.daemon import run_in_daemon
+
 
 class BibTeXVerifier:
     """Verify BibTeX file integrity and completeness."""
@@ -42,12 +45,11 @@ class BibTeXVerifier:
 
     def parse(self) -> List[Dict]:
         """Parse BibTeX file into structured entries."""
-        try:
-            content = self.bib_file.read_text(encoding='utf-8', errors='ignore')
-        except Exception as e:
+        content = documents.read(self.bib_file)
+        if content is None:
             self.issues.append({
                 'type': 'file_error',
-                'message': f'Cannot read file: {e}'
+                'message': f'Cannot read file: {self.bib_file}'
             })
             return []
 
@@ -174,10 +176,9 @@ class BibTeXVerifier:
             self.parse()
 
         tex_path = Path(tex_file)
-        try:
-            tex_content = tex_path.read_text(encoding='utf-8', errors='ignore')
-        except Exception as e:
-            return {'status': 'ERROR', 'message': str(e)}
+        tex_content = documents.read(tex_path)
+        if tex_content is None:
+            return {'status': 'ERROR', 'message': f'Cannot read file: {tex_path}'}
 
         # Find all citations
         cite_pattern = r'\\(?:cite|citep|citet|parencite|textcite)\*?\{([^}]+)\}'
@@ -315,4 +316,7 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    returncode = run_in_daemon(__file__)
+    if returncode is None:
+        main()
+    sys.exit(returncode)
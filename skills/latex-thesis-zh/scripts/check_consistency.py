@@ -15,6 +15,10 @@ from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
+import toolkit_path  # noqa: F401  (locates the shared latex_toolkit)
+from latex_toolkit import documents
+from latex_toolkit.daemon import run_in_daemon
+
 
 class ConsistencyChecker:
     """Check terminology and abbreviation consistency across thesis files."""
@@ -50,12 +54,7 @@ class ConsistencyChecker:
     def _load_content(self, tex_file: Path) -> str:
         """Load and cache file content."""
         if tex_file not in self.content_cache:
-            try:
-                self.content_cache[tex_file] = tex_file.read_text(
-                    encoding='utf-8', errors='ignore'
-                )
-            except Exception:
-                self.content_cache[tex_file] = ''
+            self.content_cache[tex_file] = documents.read(tex_file) or ''
         return self.content_cache[tex_file]
 
     def check_terms(self) -> Dict:
@@ -316,4 +315,7 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    returncode = run_in_daemon(__file__)
+    if returncode is None:
+        main()
+    sys.exit(returncode)
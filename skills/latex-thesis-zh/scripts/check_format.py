@@ -9,12 +9,14 @@ Usage:
 
 import argparse
 import re
-import shutil
-import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import toolkit_path  # noqa: F401  (locates the shared latex_toolkit)
+from latex_toolkit import chktex_available, documents, run_chktex
+from latex_toolkit.daemon import run_in_daemon
+
 
 class FormatChecker:
     """ChkTeX wrapper with Chinese thesis specific checks."""
@@ -45,7 +47,7 @@ class FormatChecker:
 
     def _check_chktex(self) -> Tuple[bool, str]:
         """Check if chktex is available."""
-        if shutil.which('chktex'):
+        if chktex_available():
             return True, "chktex is available"
         return False, "chktex not found"
 
@@ -71,58 +73,29 @@ class FormatChecker:
         }
 
     def _run_chktex(self, strict: bool) -> List[Dict]:
-        """Run chktex and parse output."""
-        cmd = ['chktex']
-        if strict:
-            cmd.extend(['-v3'])
-        else:
-            cmd.extend(['-v0', '-q'])
-        cmd.append(str(self.tex_file))
-
+        """Run chktex and tag its issues."""
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=self.work_dir,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-            return self._parse_chktex_output(result.stdout + result.stderr)
+            raw_issues = run_chktex(self.tex_file, strict)
         except Exception:
             return []
-
-    def _parse_chktex_output(self, output: str) -> List[Dict]:
-        """Parse chktex output."""
-        issues = []
-        pattern = r'(.+?):(\d+):(\d+):\s*(Warning|Error)\s*(\d+):\s*(.+)'
-
-        for line in output.split('\n'):
-            match = re.match(pattern, line.strip())
-            if match:
-                issues.append({
-                    'source': 'chktex',
-                    'file': match.group(1),
-                    'line': int(match.group(2)),
-                    'column': int(match.group(3)),
-                    'severity': match.group(4).lower(),
-                    'code': int(match.group(5)),
-                    'message': match.group(6),
-                })
-
-        return issues
+        return [{
+            'source': 'chktex',
+            'file': raw['file'],
+            'line': raw['line'],
+            'column': raw['column'],
+            'severity': raw['kind'].lower(),
+            'code': raw['code'],
+            'message': raw['message'],
+        } for raw in raw_issues]
 
     def _run_chinese_checks(self) -> List[Dict]:
         """Run Chinese-specific checks."""
         issues = []
 
-        try:
-            content = self.tex_file.read_text(encoding='utf-8', errors='ignore')
-        except Exception:
+        lines = documents.lines(self.tex_file)
+        if not lines:
             return issues
 
-        lines = content.split('\n')
-
         for check_name, check_info in self.CHINESE_CHECKS.items():
             pattern = check_info['pattern']
 
@@ -218,4 +191,7 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    returncode = run_in_daemon(__file__)
+    if returncode is None:
+        main()
+    sys.exit(returncode)
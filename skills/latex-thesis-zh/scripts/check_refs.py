@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Cross-Reference Checker - Static \\label/\\ref integrity check (no compile)
+
+Usage:
+    python check_refs.py main.tex
+    python check_refs.py main.tex --json
+    python check_refs.py main.tex --no-prefix-check
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import toolkit_path  # noqa: F401  (locates the shared latex_toolkit)
+from latex_toolkit.daemon import run_in_daemon
+from latex_toolkit.xref import CrossReferenceIndex
+
+
+def generate_report(result: Dict, limit: int = 20) -> str:
+    """Generate human-readable report."""
+    lines = []
+    lines.append("=" * 60)
+    lines.append("Cross-Reference Check Report / 交叉引用检查报告")
+    lines.append("=" * 60)
+    lines.append(f"Status: {result['status']}")
+    lines.append(f"Labels: {result['labels']}  References: {result['references']}  "
+                 f"Time: {result['elapsed_ms']} ms")
+
+    def section(title: str, items, describe):
+        lines.append("")
+        lines.append(f"[{title}] ({len(items)})")
+        lines.append("-" * 40)
+        if not items:
+            lines.append("  ✅ None")
+            return
+        for item in items[:limit]:
+            lines.append(f"  {describe(item)}")
+        if len(items) > limit:
+            lines.append(f"  ... and {len(items) - limit} more")
+
+    section("Undefined References / 未定义引用", result['undefined_refs'],
+            lambda i: f"{i['file']}:{i['line']}: \\{i['command']}{{{i['key']}}}")
+    section("Duplicate Labels / 重复标签", result['duplicate_labels'],
+            lambda i: f"{i['key']}: " + ', '.join(f"{d['file']}:{d['line']}" for d in i['definitions']))
+    section("Unused Labels / 未引用标签", result['unused_labels'],
+            lambda i: f"{i['file']}:{i['line']}: {i['key']}")
+    if 'prefix_violations' in result:
+        section("Label Prefix / 标签前缀 (fig: tab: eq:)", result['prefix_violations'],
+                lambda i: f"{i['file']}:{i['line']}: {i['key']} ({i['kind']}, expected {i['expected']})")
+
+    lines.append("")
+    lines.append("=" * 60)
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Cross-Reference Checker (label/ref, no compile)'
+    )
+    parser.add_argument('tex_file', help='Main .tex file')
+    parser.add_argument(
+        '--no-prefix-check',
+        action='store_true',
+        help='Do not check the fig:/tab:/eq: label prefix convention'
+    )
+    parser.add_argument(
+        '--json', '-j',
+        action='store_true',
+        help='Output in JSON format'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.tex_file).exists():
+        print(f"[ERROR] File not found: {args.tex_file}", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    index = CrossReferenceIndex(Path(args.tex_file)).build()
+    result = index.check(prefixes=not args.no_prefix_check)
+    if args.no_prefix_check:
+        del result['prefix_violations']
+    result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(generate_report(result))
+
+    # Undefined or duplicate labels break the document; the rest are warnings
+    sys.exit(1 if result['status'] == 'FAIL' else 0)
+
+
+if __name__ == '__main__':
+    returncode = run_in_daemon(__file__)
+    if returncode is None:
+        main()
+    sys.exit(returncode)
@@ -6,6 +6,8 @@ Usage:
     python map_structure.py main.tex
     python map_structure.py main.tex --json
     python map_structure.py main.tex --detect-template
+    python map_structure.py main.tex --outline
+    python map_structure.py main.tex --outline --section 3.2
 """
 
 import argparse
@@ -14,6 +16,10 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 
+import toolkit_path  # noqa: F401  (locates the shared latex_toolkit)
+from latex_toolkit import IncludeGraph, OutlineBuilder, documents
+from latex_toolkit.daemon import run_in_daemon
+
 
 class ThesisStructureMapper:
     """Map LaTeX thesis file structure and detect template type."""
@@ -67,71 +73,27 @@ class ThesisStructureMapper:
         self.visited: Set[Path] = set()
         self.structure: List[Dict] = []
         self.template: Optional[str] = None
+        self.graph: Optional[IncludeGraph] = None
 
     def map(self) -> List[Dict]:
         """Map the thesis structure starting from main file."""
+        self.graph = IncludeGraph(self.main_file).build()
         self.structure = []
         self.visited = set()
-        self._parse_file(self.main_file, level=0)
-        return self.structure
-
-    def _parse_file(self, tex_file: Path, level: int):
-        """Recursively parse a LaTeX file for includes."""
-        if tex_file in self.visited:
-            return
-        self.visited.add(tex_file)
-
-        if not tex_file.exists():
+        for node in self.graph.nodes:
+            tex_file = node['path']
+            self.visited.add(tex_file)
             self.structure.append({
-                'file': str(tex_file.relative_to(self.root_dir)) if tex_file.is_relative_to(self.root_dir) else str(tex_file),
-                'level': level,
-                'type': 'missing',
-                'exists': False,
+                'file': self.graph.relative(tex_file),
+                'level': node['level'],
+                'type': self._detect_file_type(tex_file) if node['exists'] else 'missing',
+                'exists': node['exists'],
             })
-            return
-
-        # Add current file to structure
-        file_type = self._detect_file_type(tex_file)
-        self.structure.append({
-            'file': str(tex_file.relative_to(self.root_dir)),
-            'level': level,
-            'type': file_type,
-            'exists': True,
-        })
-
-        # Read file content
-        try:
-            content = tex_file.read_text(encoding='utf-8', errors='ignore')
-        except Exception:
-            return
 
         # Detect template from main file
-        if level == 0:
-            self.template = self._detect_template(content)
-
-        # Find included files
-        patterns = [
-            (r'\\input\{([^}]+)\}', 'input'),
-            (r'\\include\{([^}]+)\}', 'include'),
-            (r'\\subfile\{([^}]+)\}', 'subfile'),
-        ]
-
-        for pattern, include_type in patterns:
-            for match in re.finditer(pattern, content):
-                included = match.group(1)
-
-                # Handle relative paths
-                if not included.endswith('.tex'):
-                    included += '.tex'
-
-                # Resolve path relative to current file
-                included_path = (tex_file.parent / included).resolve()
-
-                # Also try relative to root
-                if not included_path.exists():
-                    included_path = (self.root_dir / included).resolve()
-
-                self._parse_file(included_path, level + 1)
+        content = documents.read(self.main_file)
+        self.template = self._detect_template(content) if content is not None else None
+        return self.structure
 
     def _detect_file_type(self, tex_file: Path) -> str:
         """Detect the type of a LaTeX file based on name and content."""
@@ -295,6 +257,17 @@ def main():
         action='store_true',
         help='Output processing order'
     )
+    parser.add_argument(
+        '--outline',
+        action='store_true',
+        help='Output a compact JSON outline: chapters/sections/subsections with '
+             'file:line ranges and word/figure/table/equation/citation counts'
+    )
+    parser.add_argument(
+        '--section',
+        metavar='ID',
+        help='With --outline, only the section with this id (e.g. 3.2) and its subsections'
+    )
 
     args = parser.parse_args()
 
@@ -319,6 +292,25 @@ def main():
             print("Template: Unknown (generic)")
         sys.exit(0)
 
+    if args.outline:
+        import json
+        outline = OutlineBuilder(mapper.main_file, mapper.graph).build()
+        if args.section:
+            prefix = args.section + '.'
+            outline['sections'] = [s for s in outline['sections']
+                                   if s['id'] == args.section or s['id'].startswith(prefix)]
+            if not outline['sections']:
+                print(f"[ERROR] No section with id {args.section}", file=sys.stderr)
+                sys.exit(1)
+        # One section per line keeps the index compact but still greppable
+        print('{"main": %s, "totals": %s, "front": %s, "sections": [' % (
+            json.dumps(outline['main'], ensure_ascii=False),
+            json.dumps(outline['totals'], ensure_ascii=False),
+            json.dumps(outline['front'], ensure_ascii=False)))
+        print(',\n'.join(json.dumps(s, ensure_ascii=False) for s in outline['sections']))
+        print(']}')
+        sys.exit(0)
+
     if args.order:
         order = mapper.get_processing_order()
         print("Recommended processing order:")
@@ -334,6 +326,8 @@ def main():
             'structure': structure,
             'completeness': mapper.check_completeness(),
             'processing_order': mapper.get_processing_order(),
+            'include_cycles': [[mapper.graph.relative(a), mapper.graph.relative(b)]
+                               for a, b in mapper.graph.cycles],
         }
         print(json.dumps(output, indent=2, ensure_ascii=False))
     else:
@@ -341,4 +335,7 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    returncode = run_in_daemon(__file__)
+    if returncode is None:
+        main()
+    sys.exit(returncode)
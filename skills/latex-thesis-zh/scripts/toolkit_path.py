@@ -0,0 +1,24 @@
+"""
+Make the shared ``latex_toolkit`` package importable.
+
+The toolkit ships with the latex-paper-en skill, which install.py installs
+alongside latex-thesis-zh (and refuses to uninstall while latex-thesis-zh
+is installed). A copy next to these scripts takes precedence; packaged
+archives bundle one there (see ../.skillbundle).
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+CANDIDATES = (SCRIPTS_DIR, SCRIPTS_DIR.parents[1] / 'latex-paper-en' / 'scripts')
+
+for candidate in CANDIDATES:
+    if (candidate / 'latex_toolkit' / '__init__.py').exists():
+        if str(candidate) not in sys.path:
+            sys.path.insert(0, str(candidate))
+        break
+else:
+    print("[ERROR] latex_toolkit not found. Install the latex-paper-en skill next to "
+          "latex-thesis-zh: python install.py install latex-paper-en")
+    sys.exit(1)
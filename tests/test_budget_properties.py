@@ -0,0 +1,135 @@
+"""
+上下文预算属性测试
+
+Property 15: Always-Loaded Budget Sums Every Installed Item
+Property 16: Install Manifest Is Trusted Only For Unchanged Skills
+
+**Validates: SkillManager.context_budget, InstallManifest, command_description**
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+
+# 添加项目根目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from hypothesis import given, strategies as st, settings
+
+import install
+from install import InstallManifest, SkillManager, command_description
+from token_budget import TokenCache, estimate_tokens
+
+
+# --- 临时目标平台 ---
+
+@contextmanager
+def temp_manager():
+    """创建指向临时目录的 SkillManager (token 缓存同样放在临时目录)"""
+    original = install.TARGET_CONFIG["claude"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base = Path(tmp_dir) / ".claude"
+        install.TARGET_CONFIG["claude"] = {
+            "base": base,
+            "skills": base / "skills",
+            "commands": base / "commands",
+            "prompt": base / "CLAUDE.md",
+        }
+        try:
+            mgr = SkillManager("claude")
+            mgr._token_cache = TokenCache(Path(tmp_dir) / "tokens.json", tokenizer="approx")
+            mgr.ensure_dirs()
+            yield mgr
+        finally:
+            install.TARGET_CONFIG["claude"] = original
+
+
+def write_skill(skills_dir: Path, name: str, description: str) -> Path:
+    skill = skills_dir / name
+    skill.mkdir(parents=True, exist_ok=True)
+    (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n# {name}\n",
+                                    encoding="utf-8")
+    return skill
+
+
+words = st.text(alphabet=st.sampled_from(list("abc XYZ 中文")), min_size=1, max_size=40).map(str.strip).filter(bool)
+
+
+# --- Property 15: Always-Loaded Budget Sums Every Installed Item ---
+
+@settings(max_examples=30, deadline=None)
+@given(skills=st.lists(words, max_size=4), commands=st.lists(words, max_size=4), prompt=words)
+def test_property_15_always_loaded_sums_items(skills, commands, prompt):
+    """
+    Property 15: 常驻开销 = CLAUDE.md + 每个技能的 name/description + 每个命令的 description；
+    条目按常驻开销降序排列
+    """
+    with temp_manager() as mgr:
+        for i, desc in enumerate(skills):
+            write_skill(mgr.target_skills_dir, f"skill-{i}", desc)
+        for i, desc in enumerate(commands):
+            path = mgr.target_commands_dir / f"cmd-{i}.md"
+            path.write_text(f"---\ndescription: {desc}\n---\nBody\n", encoding="utf-8")
+        mgr.config["prompt"].write_text(prompt, encoding="utf-8")
+
+        report = mgr.context_budget()
+        expected = estimate_tokens(prompt)
+        expected += sum(estimate_tokens(f"skill-{i}: {d}") for i, d in enumerate(skills))
+        expected += sum(estimate_tokens(d) for d in commands)
+
+        assert report["prompt"] == estimate_tokens(prompt)
+        assert report["always_loaded"] == expected
+        assert len(report["items"]) == len(skills) + len(commands)
+        costs = [item["always"] for item in report["items"]]
+        assert costs == sorted(costs, reverse=True)
+
+
+@settings(max_examples=30, deadline=None)
+@given(threshold=st.integers(min_value=0, max_value=30))
+def test_property_15_flags_follow_threshold(threshold: int):
+    """
+    Property 15: 常驻开销超过阈值的条目且仅这些条目被标记
+    """
+    with temp_manager() as mgr:
+        write_skill(mgr.target_skills_dir, "short", "x")
+        write_skill(mgr.target_skills_dir, "long", " ".join(["word"] * 30))
+        report = mgr.context_budget(threshold=threshold)
+        for item in report["items"]:
+            assert ("always-loaded" in item["flags"]) == (item["always"] > threshold)
+
+
+def test_property_15_toml_command_description():
+    """
+    Property 15: TOML 命令读取 description 字段，Markdown 命令读取 frontmatter
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        toml = Path(tmp_dir) / "plan.toml"
+        toml.write_text('description = "Plan a change"\nprompt = """\nLong body\n"""\n', encoding="utf-8")
+        md = Path(tmp_dir) / "commit.md"
+        md.write_text("---\ndescription: Write a commit\n---\nBody\n", encoding="utf-8")
+        assert command_description(toml) == "Plan a change"
+        assert command_description(md) == "Write a commit"
+
+
+# --- Property 16: Install Manifest Is Trusted Only For Unchanged Skills ---
+
+@settings(max_examples=30, deadline=None)
+@given(tokens=st.tuples(*[st.integers(min_value=0, max_value=10**6)] * 3))
+def test_property_16_manifest_round_trip(tokens):
+    """
+    Property 16: 记录的预算在重新加载后原样返回；SKILL.md 变化后不再采用
+    """
+    with temp_manager() as mgr:
+        skill = write_skill(mgr.target_skills_dir, "demo", "first")
+        manifest = InstallManifest(mgr.config["base"])
+        manifest.record_skill("demo", skill, tokens)
+        manifest.save()
+
+        assert InstallManifest(mgr.config["base"]).skill_budget("demo", skill) == tokens
+
+        (skill / "SKILL.md").write_text("---\nname: demo\ndescription: changed text\n---\n", encoding="utf-8")
+        assert InstallManifest(mgr.config["base"]).skill_budget("demo", skill) is None
+        report = mgr.context_budget()
+        assert report["items"][0]["always"] == estimate_tokens("demo: changed text")
@@ -0,0 +1,115 @@
+"""
+命令构建属性测试
+
+Property 24: Markdown And TOML Commands Round-Trip
+Property 25: Command Build Regenerates Only Changed Commands
+
+**Validates: command_build.md_to_toml, toml_to_md, CommandBuild**
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from hypothesis import given, strategies as st, settings
+
+import command_build
+from command_build import CommandBuild, md_to_toml, toml_to_md
+from token_budget import parse_frontmatter
+
+
+# 描述为单行纯文本；正文可包含引号、反斜杠、参数占位符与 Markdown
+description_strategy = st.text(
+    alphabet=st.sampled_from(list("abc XYZ-中文，")), min_size=1, max_size=40,
+).map(str.strip).filter(bool)
+body_strategy = st.lists(
+    st.sampled_from(["## Step", "Run `git diff`", 'Say "hi"', "C:\\path", "'''", '"""', "$ARGUMENTS", "中文说明", ""]),
+    min_size=1, max_size=8,
+).map("\n".join).map(lambda body: body.strip("\n")).filter(bool)
+
+
+def read_toml(text: str) -> dict:
+    import tomllib
+    return tomllib.loads(text)
+
+
+# --- Property 24: Markdown And TOML Commands Round-Trip ---
+
+@settings(max_examples=100)
+@given(description=description_strategy, body=body_strategy)
+def test_property_24_md_to_toml_is_valid_and_reversible(description: str, body: str):
+    """
+    Property 24: 生成的 TOML 可被标准解析器读取；转回 Markdown 后 description 与正文不变，
+    参数占位符在两种格式间互换
+    """
+    md = f"---\ndescription: {description}\nallowed-tools: Read\n---\n\n{body}\n"
+    toml_text = md_to_toml(md)
+    fields = read_toml(toml_text)
+    assert fields["description"] == parse_frontmatter(md)["description"]
+    assert fields["prompt"].strip("\n") == body.replace("$ARGUMENTS", "{{args}}")
+    assert "allowed-tools" not in fields
+
+    back = toml_to_md(toml_text)
+    assert parse_frontmatter(back)["description"] == description
+    assert back.split("---\n", 2)[2].strip("\n") == body
+
+
+@settings(max_examples=50)
+@given(description=description_strategy, body=body_strategy)
+def test_property_24_fallback_reader_matches_tomllib(description: str, body: str):
+    """
+    Property 24: 无 tomllib (Python 3.10) 时的简易读取器对生成的 TOML 给出相同结果
+    """
+    toml_text = md_to_toml(f"---\ndescription: {description}\n---\n{body}\n")
+    expected = read_toml(toml_text)
+    original = command_build.tomllib
+    command_build.tomllib = None
+    try:
+        assert command_build._read_toml(toml_text) == expected
+    finally:
+        command_build.tomllib = original
+
+
+# --- Property 25: Command Build Regenerates Only Changed Commands ---
+
+def test_property_25_build_cache_and_overrides():
+    """
+    Property 25: 只有一种格式的命令会生成另一种格式，同名手写文件优先；
+    未变更的命令复用缓存，修改后的命令重新生成
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        commands = tmp_path / "commands"
+        (commands / "claude").mkdir(parents=True)
+        (commands / "gemini" / "plan").mkdir(parents=True)
+        (commands / "claude" / "review.md").write_text("---\ndescription: Review\n---\nCheck $ARGUMENTS\n", encoding="utf-8")
+        (commands / "claude" / "shared.md").write_text("---\ndescription: Shared\n---\nMarkdown wording\n", encoding="utf-8")
+        (commands / "gemini" / "shared.toml").write_text('description = "Shared"\nprompt = """TOML wording"""\n', encoding="utf-8")
+        (commands / "gemini" / "plan" / "new.toml").write_text('description = "Plan"\nprompt = """Plan {{args}}"""\n', encoding="utf-8")
+        cache = tmp_path / "cache"
+
+        build = CommandBuild(commands, cache)
+        md = build.outputs("md")
+        toml = build.outputs("toml")
+        assert sorted(md) == ["plan/new.md", "review.md", "shared.md"]
+        assert sorted(toml) == ["plan/new.toml", "review.toml", "shared.toml"]
+        assert md["shared.md"] == commands / "claude" / "shared.md"
+        assert toml["shared.toml"] == commands / "gemini" / "shared.toml"
+        assert "Plan $ARGUMENTS" in md["plan/new.md"].read_text(encoding="utf-8")
+        assert read_toml(toml["review.toml"].read_text(encoding="utf-8"))["prompt"].strip() == "Check {{args}}"
+        assert build.generated == 2
+
+        rebuild = CommandBuild(commands, cache)
+        rebuild.outputs("md")
+        rebuild.outputs("toml")
+        assert rebuild.generated == 0
+
+        (commands / "claude" / "review.md").write_text("---\ndescription: Review\n---\nChanged\n", encoding="utf-8")
+        changed = CommandBuild(commands, cache)
+        assert "Changed" in changed.outputs("toml")["review.toml"].read_text(encoding="utf-8")
+        changed.outputs("md")
+        assert changed.generated == 1
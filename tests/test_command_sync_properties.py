@@ -0,0 +1,109 @@
+"""
+命令同步属性测试
+
+Property 22: Command Sync Copies Only New Or Changed Files
+Property 23: Prune Removes Only Unmodified Commands From This Installer
+
+**Validates: SkillManager.sync_commands, InstallManifest.commands**
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from unittest import mock
+from pathlib import Path
+
+# 添加项目根目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from hypothesis import given, strategies as st, settings
+
+import install
+from install import SkillManager
+
+
+@contextmanager
+def temp_sync_context():
+    """临时命令源目录 (commands/claude) 与 claude 目标目录，缓存放在临时目录"""
+    original_config = install.TARGET_CONFIG["claude"]
+    original_src = install.COMMANDS_SRC_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        base = tmp_path / ".claude"
+        install.TARGET_CONFIG["claude"] = {
+            "base": base,
+            "skills": base / "skills",
+            "commands": base / "commands",
+            "prompt": base / "CLAUDE.md",
+        }
+        install.COMMANDS_SRC_DIR = tmp_path / "commands"
+        (tmp_path / "commands" / "claude").mkdir(parents=True)
+        try:
+            with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(tmp_path / "cache")}):
+                yield SkillManager("claude"), tmp_path / "commands" / "claude"
+        finally:
+            install.TARGET_CONFIG["claude"] = original_config
+            install.COMMANDS_SRC_DIR = original_src
+
+
+# 相对路径 (含命名空间子目录) -> 内容
+command_files = st.dictionaries(
+    st.sampled_from(["a.md", "b.md", "c.md", "plan/new.md", "plan/impl.md"]),
+    st.text(max_size=50),
+    min_size=1,
+)
+
+
+def write_commands(src_dir: Path, files: dict[str, str]):
+    for rel, text in files.items():
+        (src_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+        (src_dir / rel).write_text(text, encoding="utf-8")
+
+
+# --- Property 22: Command Sync Copies Only New Or Changed Files ---
+
+@settings(max_examples=30, deadline=None)
+@given(files=command_files, changed=st.sets(st.sampled_from(["a.md", "plan/new.md"])))
+def test_property_22_sync_reports_per_file_status(files, changed):
+    """
+    Property 22: 首次同步全部为 added；再次同步只有内容变化的文件为 updated，其余 unchanged
+    """
+    with temp_sync_context() as (mgr, src_dir):
+        write_commands(src_dir, files)
+        first = mgr.sync_commands()
+        assert sorted(rel for rel, _, _ in first) == sorted(files)
+        assert all(status == "added" for _, status, _ in first)
+
+        changed = changed & set(files)
+        for rel in changed:
+            (src_dir / rel).write_text(files[rel] + "!", encoding="utf-8")
+        second = {rel: status for rel, status, _ in mgr.sync_commands()}
+        for rel in files:
+            assert second[rel] == ("updated" if rel in changed else "unchanged")
+            assert (mgr.target_commands_dir / rel).read_bytes() == (src_dir / rel).read_bytes()
+
+
+# --- Property 23: Prune Removes Only Unmodified Commands From This Installer ---
+
+def test_property_23_prune_respects_edits_and_foreign_files():
+    """
+    Property 23: 从源目录删除的命令在 --prune 时被移除；安装后被修改的命令
+    与不是本安装器写入的文件保留
+    """
+    with temp_sync_context() as (mgr, src_dir):
+        write_commands(src_dir, {"a.md": "a", "b.md": "b", "plan/new.md": "n"})
+        mgr.sync_commands()
+        foreign = mgr.target_commands_dir / "mine.md"
+        foreign.write_text("user command", encoding="utf-8")
+        (mgr.target_commands_dir / "b.md").write_text("edited", encoding="utf-8")
+        for rel in ("a.md", "b.md", "plan/new.md"):
+            (src_dir / rel).unlink()
+
+        results = {rel: status for rel, status, _ in mgr.sync_commands(prune=True)}
+        assert results == {"a.md": "removed", "b.md": "kept", "plan/new.md": "removed"}
+        assert not (mgr.target_commands_dir / "a.md").exists()
+        assert not (mgr.target_commands_dir / "plan").exists()
+        assert (mgr.target_commands_dir / "b.md").read_text(encoding="utf-8") == "edited"
+        assert foreign.exists()
@@ -0,0 +1,73 @@
+"""
+复制后端属性测试
+
+Property 19: Every Copy Backend Produces An Identical File
+Property 20: Unsupported Backends Fall Through And The Choice Is Cached
+
+**Validates: copy_backend.CopyBackend**
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from copy_backend import BACKENDS, CopyBackend
+
+
+available = [name for name, (ok, _) in BACKENDS.items() if ok]
+
+
+# --- Property 19: Every Copy Backend Produces An Identical File ---
+
+@settings(max_examples=30, deadline=None)
+@given(data=st.binary(max_size=4096), mode=st.sampled_from([0o644, 0o755, 0o600]))
+@pytest.mark.parametrize("backend", available)
+def test_property_19_backends_copy_bytes_and_mode(backend, data, mode):
+    """
+    Property 19: 无论使用哪种复制方式，目标文件的内容与权限都与源文件一致
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = Path(tmp_dir) / "src.bin"
+        src.write_bytes(data)
+        os.chmod(src, mode)
+        dst = Path(tmp_dir) / "dst.bin"
+
+        CopyBackend([backend]).copy_file(src, dst)
+        assert dst.read_bytes() == data
+        assert dst.stat().st_mode & 0o777 == mode
+
+
+# --- Property 20: Unsupported Backends Fall Through And The Choice Is Cached ---
+
+def test_property_20_fallback_and_cache(monkeypatch):
+    """
+    Property 20: 不支持的方式失败后改用下一种，且同一对文件系统只探测一次
+    """
+    calls = []
+
+    def unsupported(src_fd, dst_fd, size):
+        calls.append("fake")
+        os.write(dst_fd, b"partial")
+        raise OSError(95, "Operation not supported")
+
+    monkeypatch.setitem(BACKENDS, "fake", (True, unsupported))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        backend = CopyBackend(["fake", "buffered"])
+        for i in range(3):
+            src = tmp_path / f"src{i}.txt"
+            src.write_text(f"content {i}", encoding="utf-8")
+            assert backend.copy_file_via(src, tmp_path / f"dst{i}.txt") == "buffered"
+            assert (tmp_path / f"dst{i}.txt").read_text(encoding="utf-8") == f"content {i}"
+
+        assert calls == ["fake"]
+        assert backend.backend_for(tmp_path / "src0.txt", tmp_path) == "buffered"
+        assert backend.summary() == "buffered 3"
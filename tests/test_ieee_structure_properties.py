@@ -0,0 +1,117 @@
+"""
+IEEE 结构检查属性测试
+
+Property 37: IEEE Structure Check Counts Prose Words And Recognises Headings
+
+**Validates: skills/IEEE-writing-skills/scripts/check_structure.py**
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加 IEEE 脚本目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+IEEE_SCRIPTS = PROJECT_ROOT / "skills" / "IEEE-writing-skills" / "scripts"
+sys.path.insert(0, str(IEEE_SCRIPTS))
+
+from hypothesis import given, strategies as st, settings
+
+from check_structure import analyze, check_directory, compile_forbidden
+
+
+# 生成小写单词组成的正文
+words_strategy = st.lists(
+    st.text(alphabet="abcdefghijklmnopqrstuvwxyz", min_size=1, max_size=8),
+    min_size=1,
+    max_size=20,
+)
+
+
+@given(title=words_strategy, body=words_strategy)
+@settings(max_examples=100)
+def test_property_37_latex_headings_are_not_counted_as_words(title, body):
+    """
+    Property 37: IEEE Structure Check Counts Prose Words And Recognises Headings
+
+    LaTeX 章节标题、标签与引用不计入字数,只统计正文单词。
+    """
+    content = (
+        "\\begin{document}\n"
+        f"\\section{{{' '.join(title)}}}\\label{{sec:intro}}\n"
+        f"{' '.join(body)} \\cite{{key}}\n"
+        "\\end{document}\n"
+    )
+    result = analyze(content, None)
+
+    assert result["total_words"] == len(body)
+    assert [s["title"] for s in result["sections"]] == [" ".join(title)]
+    assert result["sections"][0]["words"] == len(body)
+
+
+def test_property_37_numbered_list_items_are_not_headings():
+    """
+    Property 37: IEEE Structure Check Counts Prose Words And Recognises Headings
+
+    纯文本中,紧跟在正文后的编号列表项与句子形式的编号行不被当作章节标题。
+    """
+    content = "\n".join([
+        "Abstract— We study things.",
+        "",
+        "I. INTRODUCTION",
+        "We list the steps:",
+        "1. Collect Data",
+        "2. Train Models",
+        "",
+        "1. Results were good and we are happy",
+        "",
+        "2. Related Work",
+        "Prior work exists.",
+        "",
+        "References",
+        "[1] A. Author, Title.",
+    ])
+    result = analyze(content, None)
+
+    titles = [s["title"] for s in result["sections"]]
+    assert titles == ["(front matter)", "Introduction", "Related Work", "References"]
+    assert result["abstract"]["line"] == 1
+    assert result["abstract"]["words"] == 3
+
+
+def test_property_37_forbidden_findings_report_columns():
+    """
+    Property 37: IEEE Structure Check Counts Prose Words And Recognises Headings
+
+    禁用词按行列定位,LaTeX 命令被空白替换后列号仍与原文一致。
+    """
+    line = "\\textbf{Note} this is very delve into it"
+    content = "\\begin{document}\n\\section{Intro}\n" + line + "\n\\end{document}\n"
+    result = analyze(content, compile_forbidden(["delve into"]))
+
+    assert len(result["findings"]) == 1
+    finding = result["findings"][0]
+    assert finding["line"] == 3
+    assert finding["column"] == line.index("delve into") + 1
+    assert finding["section"] == "Intro"
+
+
+def test_property_37_directory_check_skips_repository_documents():
+    """
+    Property 37: IEEE Structure Check Counts Prose Words And Recognises Headings
+
+    目录检查只处理论文文件,跳过 README、CHANGELOG 等仓库文档。
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "paper.tex").write_text("\\begin{document}\nText.\n\\end{document}\n", encoding="utf-8")
+        (root / "notes").mkdir()
+        (root / "notes" / "draft.md").write_text("# Introduction\nText.\n", encoding="utf-8")
+        (root / "README.md").write_text("# Readme\n", encoding="utf-8")
+        (root / "CHANGELOG.md").write_text("# Changes\n", encoding="utf-8")
+        (root / "data.csv").write_text("a,b\n", encoding="utf-8")
+
+        report = check_directory(root)
+
+        assert sorted(Path(p).name for p in report["files"]) == ["draft.md", "paper.tex"]
+        assert report["files_with_issues"] == 2
@@ -5,15 +5,18 @@ Property 6: Skill Installation Creates Target Directory
 Property 7: Batch Install Processes All Selected Items
 Property 8: Batch Install Clears Selection After Completion
 Property 9: Install All Processes Every Available Item
+Property 6c: Uninstall Keeps Dependencies Of Installed Skills
 
 **Validates: Requirements 6.1, 6.5, 7.1, 7.4, 7.6, 8.1, 8.4**
 """
 
+import os
 import sys
 import shutil
 import tempfile
 from pathlib import Path
 from contextlib import contextmanager
+from unittest import mock
 
 # 添加项目根目录到 sys.path
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -24,14 +27,14 @@ from hypothesis import given, strategies as st, settings, assume
 
 from tui.core.manager import TUIManager
 from tui.core.models import ItemInfo, ItemType, InstallStatus
-from install import SKILLS_SRC_DIR, COMMANDS_SRC_DIR
+from install import SKILLS_SRC_DIR, COMMANDS_SRC_DIR, SKILL_DEPENDENCIES
 
 
 # --- 临时目录上下文管理器 ---
 
 @contextmanager
 def temp_target_context():
-    """创建临时目标目录并修改 TARGET_CONFIG"""
+    """创建临时目标目录并修改 TARGET_CONFIG (技能存储与缓存同样放在临时目录)"""
     import install
     import tempfile
     
@@ -55,12 +58,14 @@ def temp_target_context():
             "prompt": temp_base / "CLAUDE.md"
         }
         
+        temp_env = {"MYCLAUDE_STORE": str(tmp_path / "store"), "XDG_CACHE_HOME": str(tmp_path / "cache")}
         try:
-            yield {
-                "base": temp_base,
-                "skills": temp_skills,
-                "commands": temp_commands,
-            }
+            with mock.patch.dict(os.environ, temp_env):
+                yield {
+                    "base": temp_base,
+                    "skills": temp_skills,
+                    "commands": temp_commands,
+                }
         finally:
             # 恢复原始配置
             install.TARGET_CONFIG.clear()
@@ -371,3 +376,54 @@ def test_property_9_install_all_commands():
                     f"Target file should exist for successfully installed command: {cmd.name}"
                 )
 
+
+# --- Property 6b: Skill Installation Installs Dependencies ---
+# **Validates: Requirements 6.1**
+
+@settings(max_examples=20)
+@given(skill_name=st.sampled_from(sorted(SKILL_DEPENDENCIES)))
+def test_property_6b_skill_installation_installs_dependencies(skill_name: str):
+    """
+    Property 6b: Skill Installation Installs Dependencies
+
+    *For any* skill listed in SKILL_DEPENDENCIES, after `install_skill(name)`
+    succeeds, every skill it depends on SHALL also be installed.
+
+    **Feature: install-tui, Property 6b: Skill Installation Installs Dependencies**
+    **Validates: Requirements 6.1**
+    """
+    with temp_target_context() as temp_dirs:
+        manager = TUIManager("claude")
+        result = manager.install_skill(skill_name)
+
+        assert result.success, f"Installation should succeed for {skill_name}: {result.message}"
+        for dependency in SKILL_DEPENDENCIES[skill_name]:
+            target_dir = temp_dirs["skills"] / dependency
+            assert target_dir.exists(), f"Dependency {dependency} should be installed with {skill_name}"
+        # 安装目录中不应包含字节码缓存
+        assert not list(temp_dirs["skills"].rglob("__pycache__"))
+
+
+# --- Property 6c: Uninstall Keeps Dependencies Of Installed Skills ---
+
+@settings(max_examples=5, deadline=None)
+@given(skill_name=st.sampled_from(sorted(SKILL_DEPENDENCIES)))
+def test_property_6c_uninstall_refuses_required_dependency(skill_name: str):
+    """
+    Property 6c: 依赖仍被已安装技能使用时 uninstall_skill 拒绝卸载，
+    先卸载依赖方或使用 force 后才会卸载
+    """
+    from install import SkillManager
+
+    with temp_target_context() as temp_dirs:
+        manager = SkillManager("claude")
+        assert manager.install_skill(skill_name, quiet=True)
+        for dependency in SKILL_DEPENDENCIES[skill_name]:
+            assert manager.installed_dependents(dependency) == [skill_name]
+            assert not manager.uninstall_skill(dependency, quiet=True)
+            assert (temp_dirs["skills"] / dependency).exists()
+
+        assert manager.uninstall_skill(skill_name, quiet=True)
+        for dependency in SKILL_DEPENDENCIES[skill_name]:
+            assert manager.uninstall_skill(dependency, quiet=True)
+            assert not (temp_dirs["skills"] / dependency).exists()
@@ -0,0 +1,508 @@
+"""
+LaTeX 工具包属性测试
+
+Property 28: Include Graph Lists Each Reachable File Once And Reports Cycles
+Property 29: Log Parser Output Does Not Depend On How The Log Is Chunked
+Property 30: Recipe Planner Reruns Engines Only When Aux Or Bibliography Changed
+Property 31: Recipe Builds Finish Draft Passes, Honour Timeouts And Clean By Manifest
+Property 32: Build Cache Restores Aux Snapshots And Collects Unreferenced Objects
+Property 33: Source Watcher Tracks The Dependency Set
+Property 34: Cross-Reference Index Reports Undefined, Unused And Misnamed Labels
+Property 35: Outline Statistics Count Prose Only And Roll Up Into Parents
+Property 36: Prose Chunks Respect The Token Budget And Section Boundaries
+
+**Validates: latex_toolkit.IncludeGraph, LogParser, RecipePlanner, LaTeXCompiler, run_batch,
+BuildCache, SourceWatcher, CrossReferenceIndex, OutlineBuilder, extract_prose.ProseExtractor**
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+# 添加项目根目录与 latex-paper-en 脚本目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+LATEX_SCRIPTS = PROJECT_ROOT / "skills" / "latex-paper-en" / "scripts"
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(LATEX_SCRIPTS))
+
+from hypothesis import given, strategies as st, settings
+
+from latex_toolkit import documents
+from latex_toolkit.compiler import BUILD_TIMEOUT, BuildCache, LaTeXCompiler, RecipePlanner, run_batch
+from latex_toolkit.files import SourceWatcher
+from latex_toolkit.graph import IncludeGraph
+from latex_toolkit.log_parser import LogParser
+from latex_toolkit.outline import OutlineBuilder, count_words
+from latex_toolkit.prose import estimate_tokens, split_sentences
+from latex_toolkit.xref import CrossReferenceIndex
+from extract_prose import ProseExtractor
+
+
+@contextmanager
+def temp_project():
+    """临时项目目录；工具包的用户缓存 (XDG_CACHE_HOME) 同样放在临时目录"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir).resolve()
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(tmp_path / "cache")}):
+            yield tmp_path
+
+
+def write_files(root: Path, files: dict[str, str]) -> Path:
+    for rel, text in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text, encoding="utf-8")
+    return root
+
+
+# --- Property 28: Include Graph Lists Each Reachable File Once And Reports Cycles ---
+
+def test_property_28_cycles_and_commented_includes():
+    """
+    Property 28: 循环 \\input 不会死循环且被记录为 cycle；注释掉的 \\input 不进入图
+    """
+    with temp_project() as root:
+        write_files(root, {
+            "main.tex": "\\input{a}\n% \\input{hidden}\n\\input{b}\n",
+            "a.tex": "A text\n\\input{b}\n",
+            "b.tex": "B text \\input{a} % \\include{hidden}\n",
+            "hidden.tex": "never\n",
+        })
+        graph = IncludeGraph(root / "main.tex", cache_dir=root / "graph").build()
+        assert [graph.relative(p) for p in graph.files] == ["main.tex", "a.tex", "b.tex"]
+        assert (root / "b.tex", root / "a.tex") in graph.cycles
+        assert all("hidden" not in str(p) for p in graph.files)
+
+        text = "".join(line for _, _, line in graph.walk())
+        assert "A text" in text and "B text" in text and "never" not in text
+
+        # Unchanged files come from the edge cache
+        again = IncludeGraph(root / "main.tex", cache_dir=root / "graph").build()
+        assert again.files == graph.files and again.rescanned == []
+
+
+@settings(max_examples=40, deadline=None)
+@given(edges=st.dictionaries(
+    st.sampled_from("abcde"), st.lists(st.sampled_from("abcdeX"), max_size=3), max_size=5,
+))
+def test_property_28_graph_matches_reachability(edges):
+    """
+    Property 28: 图中的文件恰为从主文件可达的文件 (各一次)，缺失文件标记为不存在；
+    存在回到祖先的 include 时 cycles 非空
+    """
+    documents.clear()
+    with temp_project() as root:
+        files = {"main.tex": "".join(f"\\input{{{c}}}\n" for c in edges.get("a", []) + ["a"])}
+        for name in "abcde":
+            files[f"{name}.tex"] = f"{name}\n" + "".join(f"\\input{{{c}}}\n" for c in edges.get(name, []))
+        write_files(root, files)
+
+        reachable, stack = set(), ["a"] + edges.get("a", [])
+        while stack:
+            name = stack.pop()
+            if name not in reachable:
+                reachable.add(name)
+                stack.extend(edges.get(name, []) if name != "X" else [])
+        graph = IncludeGraph(root / "main.tex", cache_dir=root / "graph").build()
+        names = [node["path"].stem for node in graph.nodes if node["path"].stem != "main"]
+        assert sorted(names) == sorted(reachable)
+        assert {node["path"].stem for node in graph.nodes if not node["exists"]} == reachable & {"X"}
+
+        def has_cycle(name, path):
+            return any(child in path or has_cycle(child, path | {child})
+                       for child in edges.get(name, []) if child != "X")
+        assert bool(graph.cycles) == any(has_cycle(name, {name}) for name in reachable - {"X"})
+
+
+# --- Property 29: Log Parser Output Does Not Depend On How The Log Is Chunked ---
+
+CAPTURED_LOG = """This is pdfTeX, Version 3.141592653-2.6-1.40.25 (TeX Live 2023) (preloaded format=pdflatex)
+ restricted \\write18 enabled.
+entering extended mode
+(./main.tex
+LaTeX2e <2022-11-01> patch level 1
+(/usr/share/texlive/texmf-dist/tex/latex/base/article.cls
+Document Class: article 2022/07/02 v1.4n Standard LaTeX document class
+(/usr/share/texlive/texmf-dist/tex/latex/base/size10.clo))
+(./main.aux) (./chapters/intro.tex
+LaTeX Warning: Reference `fig:missing' on page 1 undefined on input line 12.
+
+Overfull \\hbox (12.3pt too wide) in paragraph at lines 20--22
+[]\\OT1/cmr/m/n/10 A very long line|
+
+Package natbib Warning: Citation `knuth84' on page 1 undefined on input line 30.
+
+./chapters/intro.tex:41: Undefined control sequence.
+l.41 \\foo
+          bar
+)
+! Missing $ inserted.
+<inserted text>
+                $
+l.57 x_
+       1
+Package hyperref Warning: Token not allowed in a PDF string (Unicode):
+(hyperref)                removing `math shift' on input line 60.
+
+LaTeX Warning: There were undefined references.
+
+ )
+Output written on main.pdf (1 page, 24680 bytes).
+Transcript written on main.log.
+"""
+
+
+def test_property_29_captured_log():
+    """
+    Property 29: 真实格式的日志被解析为带文件与行号的错误、警告、盒子与未定义引用
+    """
+    with temp_project() as root:
+        log_file = root / "main.log"
+        # An earlier latexmk pass: its issues are dropped at the next banner
+        log_file.write_text("This is pdfTeX, Version 3.14\n! Emergency stop.\n" + CAPTURED_LOG, encoding="utf-8")
+        result = LogParser.parse_file(log_file).to_dict()
+
+    assert result["summary"] == {"errors": 2, "warnings": 2, "boxes": 1,
+                                 "undefined_references": 1, "undefined_citations": 1}
+    first, second = result["errors"]
+    assert first == {"type": "error", "message": "Undefined control sequence.",
+                     "file": "chapters/intro.tex", "line": 41}
+    assert second["message"] == "Missing $ inserted." and second["file"] == "main.tex" and second["line"] == 57
+    assert result["undefined_references"][0]["key"] == "fig:missing"
+    assert result["undefined_references"][0]["line"] == 12
+    assert result["undefined_citations"][0]["key"] == "knuth84"
+    assert result["boxes"][0]["line"] == 20 and result["boxes"][0]["file"] == "chapters/intro.tex"
+    hyperref = result["warnings"][0]
+    assert hyperref["source"] == "hyperref" and "removing `math shift'" in hyperref["message"]
+    assert hyperref["line"] == 60
+
+
+@settings(max_examples=100)
+@given(cuts=st.lists(st.integers(min_value=0, max_value=len(CAPTURED_LOG)), max_size=20))
+def test_property_29_chunking_invariance(cuts):
+    """
+    Property 29: 以任意位置切分后流式输入，结果与一次性输入相同
+    """
+    whole = LogParser()
+    whole.feed(CAPTURED_LOG)
+    whole.close()
+
+    streamed = LogParser()
+    bounds = [0] + sorted(cuts) + [len(CAPTURED_LOG)]
+    for start, end in zip(bounds, bounds[1:]):
+        streamed.feed(CAPTURED_LOG[start:end])
+    streamed.close()
+    assert streamed.to_dict() == whole.to_dict()
+
+
+# --- Property 30: Recipe Planner Reruns Engines Only When Aux Or Bibliography Changed ---
+
+def engine_pass(planner: RecipePlanner, aux_dir: Path, aux: str):
+    planner.before_step("pdflatex")
+    (aux_dir / "main.aux").write_text(aux, encoding="utf-8")
+    planner.after_step("pdflatex", 0)
+
+
+@settings(max_examples=50, deadline=None)
+@given(passes=st.lists(st.sampled_from(["\\relax\n", "\\relax\n\\newlabel{a}{{1}{1}}\n",
+                                         "\\relax\n\\newlabel{a}{{2}{1}}\n"]), min_size=1, max_size=5))
+def test_property_30_engine_rerun_follows_aux(passes):
+    """
+    Property 30: 首次总是运行；之后仅当上一遍改变了 aux 内容时再运行
+    """
+    with temp_project() as root:
+        planner = RecipePlanner(root, "main")
+        assert planner.should_run("pdflatex") == (True, "first pass")
+        previous = None
+        for aux in passes:
+            engine_pass(planner, root, aux)
+            run, _ = planner.should_run("pdflatex")
+            assert run == (aux != previous)
+            previous = aux
+
+
+def test_property_30_bibliography_changes():
+    """
+    Property 30: .bbl 变化后引擎重跑；引用与 .bib 未变时跳过 bibtex (跨进程保存的状态)，
+    .bib 修改后重新运行
+    """
+    with temp_project() as root:
+        aux = "\\relax\n\\citation{knuth84}\n\\bibdata{refs}\n\\bibstyle{plain}\n"
+        (root / "refs.bib").write_text("@book{knuth84, title={TeX}}\n", encoding="utf-8")
+        planner = RecipePlanner(root, "main")
+        engine_pass(planner, root, aux)
+        assert planner.should_run("bibtex") == (True, "no .bbl yet")
+
+        (root / "main.bbl").write_text("\\bibitem{knuth84} TeX\n", encoding="utf-8")
+        planner.after_step("bibtex", 0)
+        assert planner.should_run("pdflatex") == (True, "bibliography changed")
+        assert planner.expects_rerun()
+        engine_pass(planner, root, aux)
+        assert planner.should_run("pdflatex")[0] is False
+        planner.save()
+
+        warm = RecipePlanner(root, "main")
+        assert warm.should_run("bibtex")[0] is False
+        (root / "refs.bib").write_text("@book{knuth84, title={The TeXbook}}\n", encoding="utf-8")
+        assert warm.should_run("bibtex") == (True, "citations or .bib files changed")
+
+
+# --- Property 31: Recipe Builds Finish Draft Passes, Honour Timeouts And Clean By Manifest ---
+
+FAKE_ENGINE = """
+import os, sys, time
+args = sys.argv[1:]
+stem = os.path.splitext(os.path.basename(args[-1]))[0]
+with open(os.environ["FAKE_TEX_CALLS"], "a") as calls:
+    calls.write(" ".join(["pdflatex"] + args[:-1]) + "\\n")
+time.sleep(float(os.environ.get("FAKE_TEX_DELAY", "0")))
+print("This is pdfTeX, Version 3.14 (fake)")
+with open(stem + ".aux", "w") as f:
+    f.write("\\\\relax\\n\\\\citation{knuth84}\\n\\\\bibdata{refs}\\n")
+with open(stem + ".log", "w") as f:
+    f.write("This is pdfTeX, Version 3.14 (fake)\\n")
+with open(stem + ".fls", "w") as f:
+    f.write("PWD " + os.getcwd() + "\\nOUTPUT " + stem + ".aux\\nOUTPUT " + stem + ".log\\n")
+if "-draftmode" not in args:
+    with open(stem + ".pdf", "w") as f:
+        f.write("%PDF-1.5 fake")
+"""
+
+FAKE_BIBTEX = """
+import sys
+with open(sys.argv[1] + ".bbl", "w") as f:
+    f.write("\\\\bibitem{knuth84} TeX\\n")
+with open(sys.argv[1] + ".blg", "w") as f:
+    f.write("fake bibtex\\n")
+"""
+
+
+@contextmanager
+def fake_tex(root: Path, delay: float = 0):
+    """PATH 中放入模拟的 pdflatex / bibtex / latexmk (记录每次调用的参数)"""
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    for name, body in (("pdflatex", FAKE_ENGINE), ("bibtex", FAKE_BIBTEX), ("latexmk", "")):
+        script = bin_dir / name
+        script.write_text(f"#!{sys.executable}\n{body}", encoding="utf-8")
+        script.chmod(0o755)
+    calls = root / "calls.txt"
+    calls.touch()
+    env = {"PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+           "FAKE_TEX_CALLS": str(calls), "FAKE_TEX_DELAY": str(delay)}
+    with mock.patch.dict(os.environ, env):
+        yield lambda: calls.read_text(encoding="utf-8").splitlines()
+
+
+def test_property_31_draft_passes_and_warm_rebuild():
+    """
+    Property 31: 中间遍使用 -draftmode，最后一遍为草稿时补跑一次写出 PDF；
+    源文件未变时重建只运行一遍引擎
+    """
+    with temp_project() as root, fake_tex(root) as calls:
+        project = write_files(root / "paper", {
+            "main.tex": "\\documentclass{article}\n\\begin{document}\nHi \\cite{knuth84}\n"
+                        "\\bibliography{refs}\n\\end{document}\n",
+            "refs.bib": "@book{knuth84, title={TeX}}\n",
+        })
+        compiler = LaTeXCompiler(str(project / "main.tex"), "pdflatex", "pdflatex-bibtex")
+        assert compiler.compile() == 0
+        engine_calls = [c for c in calls() if c.startswith("pdflatex")]
+        assert ["-draftmode" in c for c in engine_calls] == [True, True, False]
+        assert (project / "main.pdf").exists()
+        steps = compiler.report["steps"]
+        assert [s["step"] for s in steps if s.get("skipped")] == ["pdflatex"]
+
+        before = len(calls())
+        assert LaTeXCompiler(str(project / "main.tex"), "pdflatex", "pdflatex-bibtex").compile() == 0
+        assert [c.split()[0] for c in calls()[before:]] == ["pdflatex"]
+
+
+def test_property_31_clean_removes_only_generated_files():
+    """
+    Property 31: --clean 只删除清单中记录的生成文件，源文件与其他文件保留；
+    不带 full 时保留 PDF
+    """
+    with temp_project() as root, fake_tex(root):
+        project = write_files(root / "paper", {
+            "main.tex": "\\documentclass{article}\n\\begin{document}\nHi\n\\end{document}\n",
+            "main.bib": "@misc{x}\n",
+            "notes.txt": "mine\n",
+        })
+        compiler = LaTeXCompiler(str(project / "main.tex"), "pdflatex", "pdflatex")
+        assert compiler.compile() == 0
+        assert compiler.clean() == 0
+        # The manifest stays while it still lists the kept PDF
+        kept = ["main.bib", "main.build_manifest", "main.pdf", "main.tex", "notes.txt"]
+        assert sorted(p.name for p in project.iterdir()) == kept
+        assert compiler.clean(full=True) == 0
+        assert sorted(p.name for p in project.iterdir()) == ["main.bib", "main.tex", "notes.txt"]
+
+
+def test_property_31_batch_timeout():
+    """
+    Property 31: 超时的批量项目被终止并报告为 timed_out，其余项目照常完成
+    """
+    with temp_project() as root, fake_tex(root, delay=30):
+        slow = write_files(root / "slow", {"main.tex": "\\begin{document}x\\end{document}\n"})
+        started = time.monotonic()
+        summary = run_batch([slow / "main.tex"], jobs=1, compiler="pdflatex", recipe="pdflatex", timeout=0.5)
+        assert time.monotonic() - started < 20
+        (result,) = summary["projects"]
+        assert result["timed_out"] and result["returncode"] == BUILD_TIMEOUT
+        assert summary["failed"] == 1
+        assert "timed out" in Path(result["log"]).read_text(encoding="utf-8")
+
+
+# --- Property 32: Build Cache Restores Aux Snapshots And Collects Unreferenced Objects ---
+
+def test_property_32_snapshot_restore_and_gc():
+    """
+    Property 32: 按源摘要存储的 aux 快照可原样恢复；已在位时不重复恢复；
+    forget 后未被引用的对象被回收
+    """
+    with temp_project() as root:
+        tex = write_files(root / "paper", {"main.tex": "\\begin{document}x\\end{document}\n"}) / "main.tex"
+        cache = BuildCache(tex, "pdflatex", cache_dir=root / "cache")
+        write_files(cache.build_dir, {"main.aux": "branch A", "chap/one.aux": "one", "main.pdf": "pdf"})
+        cache.store("key-a")
+        write_files(cache.build_dir, {"main.aux": "branch B, longer"})
+        cache.store("key-b")
+
+        assert cache.restore("key-b") is False
+        assert cache.restore("key-a") is True
+        assert (cache.build_dir / "main.aux").read_text(encoding="utf-8") == "branch A"
+        assert (cache.build_dir / "chap" / "one.aux").read_text(encoding="utf-8") == "one"
+        assert cache.restore("missing") is False
+
+        objects = list(cache.objects_dir.glob("*/*"))
+        assert len(objects) == 3
+        cache.GC_GRACE = 0
+        assert cache.collect_garbage() == 0
+        cache.forget()
+        assert list(cache.objects_dir.glob("*/*")) == []
+
+
+# --- Property 33: Source Watcher Tracks The Dependency Set ---
+
+def test_property_33_dependencies_and_changes():
+    """
+    Property 33: 跟踪包含文件、.bib、本地 .sty 与图片 (缺失的源文件也跟踪)；
+    修改被跟踪的文件后 wait_for_change 返回该文件
+    """
+    documents.clear()
+    with temp_project() as root:
+        write_files(root, {
+            "main.tex": "\\usepackage{local}\\usepackage{amsmath}\n\\input{chap/one}\n"
+                        "% \\input{ignored}\n\\includegraphics{fig}\n\\bibliography{refs}\n",
+            "chap/one.tex": "\\input{missing}\n",
+            "local.sty": "", "fig.png": "", "refs.bib": "",
+        })
+        watcher = SourceWatcher(root / "main.tex")
+        names = {p.relative_to(root).as_posix() for p in watcher.files}
+        assert names == {"main.tex", "local.sty", "chap/one.tex", "fig.png", "refs.bib", "chap/missing.tex"}
+
+        timer = threading.Timer(0.1, lambda: (root / "refs.bib").write_text("@misc{x}\n", encoding="utf-8"))
+        timer.start()
+        assert watcher.wait_for_change(interval=0.02, debounce=0.05) == [root / "refs.bib"]
+        timer.join()
+
+
+# --- Property 34: Cross-Reference Index Reports Undefined, Unused And Misnamed Labels ---
+
+def test_property_34_xref_check():
+    """
+    Property 34: 未定义的引用为 FAIL，未使用的标签与不符合前缀约定的标签为 WARNING；
+    注释中的引用不计入，子文件中的标签带文件与行号
+    """
+    documents.clear()
+    with temp_project() as root:
+        write_files(root, {
+            "main.tex": "\\begin{document}\n\\input{body}\nSee \\ref{fig:plot} and \\cref{sec:intro,eq:missing}.\n"
+                        "% \\ref{tab:commented}\n\\end{document}\n",
+            "body.tex": "\\section{Intro}\\label{sec:intro}\n"
+                        "\\begin{figure}\\label{fig:plot}\\end{figure}\n"
+                        "\\begin{table}\\label{results}\\end{table}\n"
+                        "\\begin{equation}x\\label{eq:unused}\\end{equation}\n",
+        })
+        index = CrossReferenceIndex(root / "main.tex", IncludeGraph(root / "main.tex", root / "graph")).build()
+        report = index.check()
+
+    assert report["status"] == "FAIL"
+    assert [(i["key"], i["file"], i["line"]) for i in report["undefined_refs"]] == [("eq:missing", "main.tex", 3)]
+    assert [(i["key"], i["line"]) for i in report["unused_labels"]] == [("results", 3), ("eq:unused", 4)]
+    assert [(i["key"], i["expected"]) for i in report["prefix_violations"]] == [("results", "tab:")]
+    assert "tab:commented" not in index.refs
+
+
+# --- Property 35: Outline Statistics Count Prose Only And Roll Up Into Parents ---
+
+def test_property_35_outline_statistics():
+    """
+    Property 35: 标题、\\label/\\ref/\\cite 的参数不计入字数；子节统计汇总到父节
+    """
+    documents.clear()
+    with temp_project() as root:
+        write_files(root, {
+            "main.tex": "\\documentclass{article}\n\\begin{document}\n"
+                        "\\section{A Long Heading Title}\\label{sec:first-part}\n"
+                        "One two \\cite{knuth84,lamport94} three~\\ref{fig:a-b}.\n"
+                        "\\subsection{Child}\nFour 中文 $x+y$.\n"
+                        "\\begin{figure}\\end{figure}\n\\begin{equation}a=b\\end{equation}\n"
+                        "\\end{document}\n",
+        })
+        outline = OutlineBuilder(root / "main.tex", IncludeGraph(root / "main.tex", root / "graph")).build()
+
+    section, child = outline["sections"]
+    assert section["title"] == "A Long Heading Title" and child["title"] == "Child"
+    assert child["words"] == 3 and child["figures"] == 1 and child["equations"] == 1
+    assert section["words"] == 3 + 3 and section["citations"] == 2 and section["figures"] == 1
+    assert section["citation_density"] == round(1000 * 2 / 6, 2)
+    assert outline["totals"]["words"] == 6
+    assert count_words("\\label{sec:a-b} \\autoref{x} word") == 1
+
+
+# --- Property 36: Prose Chunks Respect The Token Budget And Section Boundaries ---
+
+sentence_strategy = st.sampled_from([
+    "Short sentence.", "A somewhat longer sentence about compilers and caches.",
+    "数据结构很重要。", "Results improve by 12.5 percent (see Fig. 3).", "Why?",
+])
+
+
+@settings(max_examples=40, deadline=None)
+@given(
+    sections=st.lists(
+        st.lists(st.lists(sentence_strategy, min_size=1, max_size=6).map(" ".join), min_size=1, max_size=4),
+        min_size=1, max_size=3,
+    ),
+    budget=st.integers(min_value=5, max_value=60),
+)
+def test_property_36_chunk_budget(sections, budget):
+    """
+    Property 36: 每个块不超过预算 (除非是单个超长句子)，不跨越章节，按顺序覆盖全部正文
+    """
+    documents.clear()
+    with temp_project() as root:
+        body = "".join(
+            f"\\section{{Part {i}}}\n\n" + "\n\n".join(paragraphs) + "\n\n"
+            for i, paragraphs in enumerate(sections)
+        )
+        write_files(root, {"main.tex": f"\\begin{{document}}\n{body}\\end{{document}}\n"})
+        chunks = ProseExtractor(str(root / "main.tex")).extract_chunks(budget)
+
+    for chunk in chunks:
+        assert chunk["tokens"] == sum(estimate_tokens(piece) for piece in chunk["text"].split("\n\n"))
+        if chunk["tokens"] > budget:
+            assert len(split_sentences(chunk["text"])) == 1
+    by_section = {}
+    for chunk in chunks:
+        by_section.setdefault(chunk["section"], []).append(chunk["text"])
+    assert list(by_section) == [f"Part {i}" for i in range(len(sections))]
+    for i, paragraphs in enumerate(sections):
+        assert " ".join(" ".join(by_section[f"Part {i}"]).split()) == " ".join(" ".join(paragraphs).split())
+    assert [chunk["id"] for chunk in chunks] == list(range(1, len(chunks) + 1))
@@ -3,12 +3,16 @@ TUIManager 属性测试
 
 Property 10: Get Skills Returns All Available Skills
 Property 11: Get Commands Returns Platform-Specific Commands
+Property 21: Command Registry Tracks The Source Directory
 
 **Validates: Requirements 3.1, 4.1**
 """
 
 import os
 import sys
+import tempfile
+from contextlib import contextmanager
+from unittest import mock
 from pathlib import Path
 
 # 添加项目根目录到 sys.path
@@ -126,3 +130,85 @@ def test_property_11_get_commands_returns_platform_specific_commands(platform: s
             f"Command {cmd.name} source_path {cmd.source_path} is not from "
             f"expected directory {expected_src_dir}"
         )
+
+
+# --- Property 21: Command Registry Tracks The Source Directory ---
+
+@contextmanager
+def temp_command_dirs():
+    """临时命令源目录与目标目录 (claude 平台，生成命令的缓存同样放在临时目录)"""
+    import install
+    
+    original_config = install.TARGET_CONFIG["claude"]
+    original_src = install.COMMANDS_SRC_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        base = tmp_path / ".claude"
+        install.TARGET_CONFIG["claude"] = {
+            "base": base,
+            "skills": base / "skills",
+            "commands": base / "commands",
+            "prompt": base / "CLAUDE.md",
+        }
+        install.COMMANDS_SRC_DIR = tmp_path / "commands"
+        (tmp_path / "commands" / "claude").mkdir(parents=True)
+        try:
+            with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(tmp_path / "cache")}):
+                yield tmp_path / "commands" / "claude", base / "commands"
+        finally:
+            install.TARGET_CONFIG["claude"] = original_config
+            install.COMMANDS_SRC_DIR = original_src
+
+
+@settings(max_examples=30, deadline=None)
+@given(
+    first=st.sets(st.from_regex(r"[a-z]{1,8}", fullmatch=True), max_size=5),
+    second=st.sets(st.from_regex(r"[a-z]{1,8}", fullmatch=True), max_size=5),
+)
+def test_property_21_registry_follows_source_changes(first: set[str], second: set[str]):
+    """
+    Property 21: 注册表在源目录增删文件后刷新，且与目录内容一致；
+    已是最新的命令再次安装时不复制
+    """
+    with temp_command_dirs() as (src_dir, target_dir):
+        for name in first:
+            (src_dir / f"{name}.md").write_text(name, encoding="utf-8")
+        manager = TUIManager("claude")
+        assert sorted(manager.command_registry()) == sorted(first)
+        
+        for name in first - second:
+            (src_dir / f"{name}.md").unlink()
+        for name in second - first:
+            (src_dir / f"{name}.md").write_text(name, encoding="utf-8")
+        # 目录 mtime 精度不足时，手动推进以模拟一次变化
+        st_dir = src_dir.stat()
+        os.utime(src_dir, ns=(st_dir.st_atime_ns, st_dir.st_mtime_ns + 1_000_000))
+        
+        assert sorted(manager.command_registry()) == sorted(second)
+        # 单条安装使用注册表中的文件，不再重建全部命令
+        manager._manager.command_sources = None
+        for name in second:
+            assert manager.install_command(name).success
+            assert (target_dir / f"{name}.md").read_text(encoding="utf-8") == name
+            assert manager.install_command(name).message == f"{name} is up to date"
+        assert all(cmd.status == InstallStatus.INSTALLED for cmd in manager.get_commands())
+
+
+def test_property_21_in_place_edit_refreshes_generated_command():
+    """
+    Property 21: 原地修改另一格式的源文件 (目录 mtime 不变) 后，安装的是重新生成的命令
+    """
+    with temp_command_dirs() as (src_dir, target_dir):
+        gemini_dir = src_dir.parent / "gemini"
+        gemini_dir.mkdir()
+        source = gemini_dir / "plan.toml"
+        source.write_text('description = "Plan"\nprompt = """first"""\n', encoding="utf-8")
+        manager = TUIManager("claude")
+        assert manager.install_command("plan").success
+        assert "first" in (target_dir / "plan.md").read_text(encoding="utf-8")
+        
+        dir_mtime = gemini_dir.stat().st_mtime_ns
+        source.write_text('description = "Plan"\nprompt = """second version"""\n', encoding="utf-8")
+        os.utime(gemini_dir, ns=(dir_mtime, dir_mtime))
+        assert manager.install_command("plan").success
+        assert "second version" in (target_dir / "plan.md").read_text(encoding="utf-8")
@@ -0,0 +1,158 @@
+"""
+平台注册表属性测试
+
+Property 26: Registry Merges Built-In And User Platform Definitions
+Property 27: Platform Paths Resolve Relative To Base And Home
+
+**Validates: platforms.load_platforms, platform_from_dict, install.TARGET_CONFIG**
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# 添加项目根目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+import install
+from platforms import BUILTIN_PLATFORMS, PlatformError, load_platforms, platform_from_dict
+
+
+platform_ids = st.from_regex(r"[a-z][a-z0-9-]{0,10}", fullmatch=True)
+dir_names = st.from_regex(r"[a-z][a-z0-9_]{0,8}", fullmatch=True)
+
+
+# --- Property 26: Registry Merges Built-In And User Platform Definitions ---
+
+@settings(max_examples=50, deadline=None)
+@given(
+    added=st.dictionaries(platform_ids, dir_names, max_size=3),
+    removed=st.sets(st.sampled_from(sorted(BUILTIN_PLATFORMS)), max_size=2),
+)
+def test_property_26_toml_adds_and_removes_platforms(added, removed):
+    """
+    Property 26: TOML 中新增的平台出现在注册表中，enabled = false 的平台被移除，
+    其余内置平台保持不变
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        lines = []
+        for name, base in added.items():
+            lines += [f"[{name}]", f'base = "~/.{base}"', 'format = "toml"', ""]
+        for name in removed - set(added):
+            lines += [f"[{name}]", "enabled = false", ""]
+        config_file = tmp_path / "platforms.toml"
+        config_file.write_text("\n".join(lines), encoding="utf-8")
+
+        registry = load_platforms(tmp_path, config_file)
+        expected = (set(BUILTIN_PLATFORMS) - (removed - set(added))) | set(added)
+        assert set(registry) == expected
+        for name, base in added.items():
+            assert registry[name].base == tmp_path / f".{base}"
+            assert registry[name].format == "toml"
+        assert load_platforms(tmp_path, config_file) is registry
+
+
+def test_property_26_partial_override_keeps_builtin_fields():
+    """
+    Property 26: 只覆盖 base 的定义保留内置平台的其余字段
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        config_file = tmp_path / "platforms.toml"
+        config_file.write_text('[codex]\nbase = "/opt/codex"\n', encoding="utf-8")
+
+        codex = load_platforms(tmp_path, config_file)["codex"]
+        assert codex.base == Path("/opt/codex")
+        assert codex.commands == Path("/opt/codex/prompts")
+        assert codex.format == "md"
+        assert codex.label == "Codex"
+
+
+def test_property_26_target_config_matches_builtins():
+    """
+    Property 26: install.TARGET_CONFIG 包含全部内置平台及其命令格式
+    """
+    for name, definition in BUILTIN_PLATFORMS.items():
+        assert name in install.TARGET_CONFIG
+        assert install.TARGET_CONFIG[name]["format"] == definition["format"]
+
+
+# --- Property 27: Platform Paths Resolve Relative To Base And Home ---
+
+@settings(max_examples=100)
+@given(base=dir_names, skills=dir_names, commands=dir_names, prompt=st.one_of(st.none(), dir_names))
+def test_property_27_paths_resolve(base, skills, commands, prompt):
+    """
+    Property 27: ~ 相对主目录展开，skills/commands/prompt 相对 base 解析
+    """
+    home = Path("/home/user")
+    data = {"base": f"~/.{base}", "skills": skills, "commands": commands}
+    if prompt:
+        data["prompt"] = f"{prompt}.md"
+    platform = platform_from_dict("demo", data, home)
+    assert platform.base == home / f".{base}"
+    assert platform.skills == platform.base / skills
+    assert platform.commands == platform.base / commands
+    assert platform.prompt == (platform.base / f"{prompt}.md" if prompt else None)
+    assert platform.as_config()["commands"] == platform.commands
+
+
+@pytest.mark.parametrize("data", [{}, {"base": "~/.x", "format": "yaml"}])
+def test_property_27_invalid_definitions(data):
+    """
+    Property 27: 缺少 base 或命令格式未知时抛出 PlatformError
+    """
+    with pytest.raises(PlatformError):
+        platform_from_dict("broken", data, Path("/home/user"))
+
+
+def test_property_27_invalid_file_entries_are_skipped(capsys):
+    """
+    Property 27: 平台文件中的无效定义只产生警告: 新平台被跳过，被覆盖的内置平台保持不变；
+    无法解析的文件回退到内置平台
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        config_file = tmp_path / "platforms.toml"
+        config_file.write_text(
+            '[nobase]\nformat = "md"\n\n[codex]\nformat = "yaml"\n\n[cursor]\nbase = "~/.cursor"\n',
+            encoding="utf-8",
+        )
+        registry = load_platforms(tmp_path, config_file)
+        assert "nobase" not in registry
+        assert registry["codex"].format == "md"
+        assert registry["cursor"].base == tmp_path / ".cursor"
+
+        broken = tmp_path / "broken.toml"
+        broken.write_text("[cursor\nbase = ", encoding="utf-8")
+        assert set(load_platforms(tmp_path, broken)) == set(BUILTIN_PLATFORMS)
+        assert "[WARN]" in capsys.readouterr().err
+
+
+def test_property_27_invalid_plugins_are_skipped(capsys):
+    """
+    Property 27: 加载失败或返回非字典的插件、以及插件中不是表的定义只产生警告并被跳过
+    """
+    def broken():
+        raise RuntimeError("boom")
+
+    plugins = [
+        SimpleNamespace(name="broken", load=lambda: broken),
+        SimpleNamespace(name="scalar", load=lambda: "bar"),
+        SimpleNamespace(name="mixed", load=lambda: {"foo": "bar", "cursor": {"base": "~/.cursor"}}),
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            mock.patch("importlib.metadata.entry_points", return_value=plugins):
+        tmp_path = Path(tmp_dir)
+        registry = load_platforms(tmp_path, tmp_path / "missing.toml")
+        assert set(registry) == set(BUILTIN_PLATFORMS) | {"cursor"}
+        assert registry["cursor"].base == tmp_path / ".cursor"
+    err = capsys.readouterr().err
+    assert "'broken'" in err and "'scalar'" in err and "'foo'" in err
@@ -0,0 +1,128 @@
+"""
+共享技能存储属性测试
+
+Property 17: Identical Skills Share One Stored Copy
+Property 18: Store Entries Are Released With Their Last Reference
+
+**Validates: content_store.ContentStore, tree_hash**
+"""
+
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 添加项目根目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from hypothesis import given, strategies as st, settings
+
+from content_store import ContentStore, tree_files, tree_hash
+
+
+# 小型技能目录: 相对路径 -> 内容
+file_names = st.sampled_from(["SKILL.md", "references/GUIDE.md", "scripts/run.py", "data/a.json"])
+skill_strategy = st.dictionaries(file_names, st.binary(max_size=256), min_size=1, max_size=4)
+
+
+def write_tree(root: Path, files: dict[str, bytes]) -> Path:
+    for rel, data in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_bytes(data)
+    return root
+
+
+# --- Property 17: Identical Skills Share One Stored Copy ---
+
+@settings(max_examples=30, deadline=None)
+@given(files=skill_strategy, targets=st.integers(min_value=1, max_value=4))
+def test_property_17_targets_share_one_copy(files, targets):
+    """
+    Property 17: 同一技能安装到多个目标时存储中只有一个条目，各目标内容与源一致
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        src = write_tree(tmp_path / "src" / "demo", files)
+        store = ContentStore(tmp_path / "store")
+
+        digests = set()
+        for i in range(targets):
+            dst = tmp_path / f"target-{i}" / "demo"
+            digest, _ = store.install(src, dst)
+            digests.add(digest)
+            assert tree_files(dst) == tree_files(src)
+            for rel, data in files.items():
+                assert (dst / rel).read_bytes() == data
+
+        assert digests == {tree_hash(src)}
+        assert store.usage()[0] == 1
+
+
+@settings(max_examples=30, deadline=None)
+@given(a=skill_strategy, b=skill_strategy)
+def test_property_17_hash_follows_content(a, b):
+    """
+    Property 17: 内容哈希相同当且仅当文件集合与内容相同
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        first = write_tree(tmp_path / "a", a)
+        second = write_tree(tmp_path / "b", b)
+        assert (tree_hash(first) == tree_hash(second)) == (a == b)
+
+
+# --- Property 18: Store Entries Are Released With Their Last Reference ---
+
+@settings(max_examples=30, deadline=None)
+@given(files=skill_strategy, targets=st.integers(min_value=1, max_value=4))
+def test_property_18_release_is_reference_counted(files, targets):
+    """
+    Property 18: 只有最后一个安装目录释放引用时才删除存储条目
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        src = write_tree(tmp_path / "src" / "demo", files)
+        store = ContentStore(tmp_path / "store")
+        dsts = [tmp_path / f"target-{i}" / "demo" for i in range(targets)]
+        for dst in dsts:
+            digest, _ = store.install(src, dst)
+
+        for i, dst in enumerate(dsts):
+            removed = store.release(digest, dst)
+            assert removed == (i == targets - 1)
+            assert (store.root / digest).exists() == (not removed)
+
+
+def test_property_18_deleted_targets_are_pruned_on_install():
+    """
+    Property 18: 安装任一技能时丢弃已被删除的安装目录，只被它们引用的条目随之删除
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        store = ContentStore(tmp_path / "store")
+        old = write_tree(tmp_path / "src" / "old", {"SKILL.md": b"old"})
+        new = write_tree(tmp_path / "src" / "new", {"SKILL.md": b"new"})
+        old_digest, _ = store.install(old, tmp_path / "gone" / "old")
+        shutil.rmtree(tmp_path / "gone")
+
+        new_digest, _ = store.install(new, tmp_path / "target" / "new")
+        assert not (store.root / old_digest).exists()
+        assert set(store._load_refs()) == {new_digest}
+
+
+def test_property_18_concurrent_installs_keep_every_reference():
+    """
+    Property 18: 并发安装 (如 CLI 与 TUI 同时运行) 不会丢失 refs.json 中的引用
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        src = write_tree(tmp_path / "src" / "demo", {"SKILL.md": b"demo"})
+        dsts = [tmp_path / f"target-{i}" / "demo" for i in range(8)]
+
+        # Separate ContentStore objects, as separate processes would have
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            digests = set(pool.map(lambda dst: ContentStore(tmp_path / "store").install(src, dst)[0], dsts))
+        (digest,) = digests
+        assert sorted(ContentStore(tmp_path / "store")._load_refs()[digest]) == sorted(map(str, dsts))
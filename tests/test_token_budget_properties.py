@@ -0,0 +1,165 @@
+"""
+Token 预算属性测试
+
+Property 12: Token Estimate Is Additive Across Line Breaks
+Property 13: Token Cache Returns The Estimator's Count
+Property 14: Token Budget Formatting Shows Every Layer
+
+**Validates: token_budget.estimate_tokens, TokenCache, format_token_budget, package_skill.token_budget**
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到 sys.path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from token_budget import TokenCache, estimate_tokens, parse_frontmatter, skill_budget
+from tui.core.formatters import format_token_budget, format_token_count
+
+
+# 中英文混合、代码与 Markdown 片段
+text_strategy = st.text(
+    alphabet=st.sampled_from(list("abcXYZ019 _#*`(){}:;.,\n") + list("中文技能测试。")),
+    max_size=200,
+)
+
+
+# --- Property 12: Token Estimate Is Additive Across Line Breaks ---
+
+@settings(max_examples=100)
+@given(a=text_strategy, b=text_strategy)
+def test_property_12_estimate_additive_across_newlines(a: str, b: str):
+    """
+    Property 12: 以换行分隔的两段文本，估算值为两段之和加换行的 1 个 token
+    (四舍五入误差不超过 1)
+    """
+    a = a.rstrip("\n")
+    b = b.lstrip("\n")
+    combined = estimate_tokens(f"{a}\n{b}")
+    separate = estimate_tokens(a) + estimate_tokens(b) + 1
+    assert abs(combined - separate) <= 1
+
+
+@settings(max_examples=100)
+@given(n=st.integers(min_value=0, max_value=500))
+def test_property_12_cjk_counts_per_character(n: int):
+    """
+    Property 12: CJK 文本按字计数，不再像 len // 4 那样严重低估
+    """
+    text = "技" * n
+    assert estimate_tokens(text) == round(1.2 * n)
+    assert estimate_tokens(text) >= len(text) // 4
+
+
+# --- Property 13: Token Cache Returns The Estimator's Count ---
+
+@settings(max_examples=50, deadline=None)
+@given(content=text_strategy)
+def test_property_13_cache_matches_estimator(content: str):
+    """
+    Property 13: 缓存命中与未命中时返回的计数都等于估算器结果
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        doc = tmp_path / "doc.md"
+        doc.write_text(content, encoding="utf-8")
+        cache_file = tmp_path / "tokens.json"
+
+        cache = TokenCache(cache_file, tokenizer="approx")
+        assert cache.count_file(doc) == estimate_tokens(content)
+        cache.save()
+
+        reloaded = TokenCache(cache_file, tokenizer="approx")
+        assert reloaded.count_file(doc) == estimate_tokens(content)
+
+
+def test_property_13_skill_budget_layers():
+    """
+    Property 13: 多行 description 计入 Layer 0，SKILL.md 计入 Layer 1，
+    scripts/ 以外的文档计入 Layer 2
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        skill = Path(tmp_dir) / "demo-skill"
+        (skill / "references").mkdir(parents=True)
+        (skill / "scripts").mkdir()
+        skill_md = "---\nname: demo-skill\ndescription: |\n  多行描述\n  second line\n---\n# Demo\n"
+        (skill / "SKILL.md").write_text(skill_md, encoding="utf-8")
+        (skill / "references" / "GUIDE.md").write_text("Guide text", encoding="utf-8")
+        (skill / "scripts" / "run.py").write_text("print('x')", encoding="utf-8")
+
+        assert parse_frontmatter(skill_md)["description"] == "多行描述\nsecond line"
+        budget = skill_budget(skill, TokenCache(Path(tmp_dir) / "tokens.json", tokenizer="approx"))
+        assert budget.layer0 == estimate_tokens("demo-skill: 多行描述\nsecond line")
+        assert budget.layer1 == estimate_tokens(skill_md)
+        assert budget.layer2 == estimate_tokens("Guide text")
+        assert budget.files == 1
+
+
+@settings(max_examples=30, deadline=None)
+@given(docs=st.dictionaries(
+    st.sampled_from(["references/a.md", "resources/b.md", "notes.txt", "data/c.json",
+                     "scripts/README.md", "scripts/run.py", ".hidden/d.md"]),
+    text_strategy, max_size=5,
+))
+def test_property_13_package_skill_matches_skill_budget(docs):
+    """
+    Property 13: package_skill.py 报告的各层 token 与 skill_budget 一致
+    (同一估算器与同一 Layer 2 判定)
+    """
+    sys.path.insert(0, str(PROJECT_ROOT / "skills" / "claude-expert-skill-creator" / "scripts"))
+    import package_skill
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        skill = Path(tmp_dir) / "demo-skill"
+        skill.mkdir()
+        (skill / "SKILL.md").write_text("---\nname: demo\ndescription: 演示 skill\n---\nBody\n", encoding="utf-8")
+        for rel, text in docs.items():
+            (skill / rel).parent.mkdir(parents=True, exist_ok=True)
+            (skill / rel).write_text(text, encoding="utf-8")
+
+        budget = skill_budget(skill, TokenCache(Path(tmp_dir) / "tokens.json", tokenizer="approx"))
+        files = [p.relative_to(skill).as_posix() for p in skill.rglob("*") if p.is_file()]
+        packaged = package_skill.token_budget(skill, files)
+        assert (packaged["layer0"], packaged["layer1"], packaged["layer2"]) == budget.as_tuple()
+
+
+# --- Property 14: Token Budget Formatting Shows Every Layer ---
+
+@settings(max_examples=100)
+@given(tokens=st.tuples(*[st.integers(min_value=0, max_value=10**6)] * 3))
+def test_property_14_budget_format_lists_layers(tokens):
+    """
+    Property 14: 格式化结果按顺序包含 L0、L1、L2 及各自的数值
+    """
+    result = format_token_budget(tokens)
+    parts = result.split(" · ")
+    assert len(parts) == 3
+    for layer, (part, count) in enumerate(zip(parts, tokens)):
+        assert part == f"L{layer} {format_token_count(count)}"
+
+
+@pytest.mark.parametrize("tokens", [None, ()])
+def test_property_14_budget_format_empty(tokens):
+    """
+    Property 14: 无预算数据时返回空字符串
+    """
+    assert format_token_budget(tokens) == ""
+
+
+def test_property_13_skill_copies_match_token_budget():
+    """
+    Property 13: 技能中携带的 token_budget.py 副本与仓库中的文件完全一致
+    (latex_toolkit.prose 与 package_skill.py 只从各自的副本加载)
+    """
+    original = (PROJECT_ROOT / "token_budget.py").read_bytes()
+    for copy in (
+        PROJECT_ROOT / "skills" / "latex-paper-en" / "scripts" / "latex_toolkit" / "token_budget.py",
+        PROJECT_ROOT / "skills" / "claude-expert-skill-creator" / "scripts" / "token_budget.py",
+    ):
+        assert copy.read_bytes() == original, f"{copy} is out of date; copy token_budget.py over it"
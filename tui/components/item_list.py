@@ -10,7 +10,12 @@ from textual.containers import Horizontal, Center
 from textual.message import Message
 
 from ..core.models import ItemInfo, InstallStatus
-from ..core.formatters import format_checkbox, format_status_icon, format_empty_state_message
+from ..core.formatters import (
+    format_checkbox,
+    format_status_icon,
+    format_empty_state_message,
+    format_token_budget,
+)
 
 
 class SelectableItem(ListItem):
@@ -196,6 +201,8 @@ class SelectableItem(ListItem):
             yield Static(self._format_status(), id="status", classes=self._get_status_class())
             yield Static(self.item_name, id="name")
             yield Static(self.description or "", id="desc")
+            if self.item_info.tokens:
+                yield Static(format_token_budget(self.item_info.tokens), id="tokens")
     
     def _format_checkbox(self) -> str:
         """格式化复选框显示
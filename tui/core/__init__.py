@@ -9,7 +9,7 @@ TUI 核心业务逻辑模块
 """
 
 from .models import ItemType, InstallStatus, ItemInfo, InstallResult
-from .manager import TUIManager
+from .manager import TUIManager, platform_options
 from .theme import myclaudeTheme, THEME_COLORS, REQUIRED_THEME_PROPERTIES
 from .formatters import (
     PlatformConfig,
@@ -23,6 +23,8 @@ from .formatters import (
     format_empty_state_message,
     format_loading_message,
     format_progress_message,
+    format_token_count,
+    format_token_budget,
     CHECKBOX_CHECKED,
     CHECKBOX_UNCHECKED,
     STATUS_INSTALLED,
@@ -39,6 +41,7 @@ __all__ = [
     "ItemInfo",
     "InstallResult",
     "TUIManager",
+    "platform_options",
     "myclaudeTheme",
     "THEME_COLORS",
     "REQUIRED_THEME_PROPERTIES",
@@ -54,6 +57,8 @@ __all__ = [
     "format_empty_state_message",
     "format_loading_message",
     "format_progress_message",
+    "format_token_count",
+    "format_token_budget",
     "CHECKBOX_CHECKED",
     "CHECKBOX_UNCHECKED",
     "STATUS_INSTALLED",
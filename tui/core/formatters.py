@@ -229,3 +229,41 @@ def format_progress_message(action: str, current: int, total: int) -> str:
     Requirements: 9.2, 9.3 - 进度状态应显示进度指示
     """
     return f"{ICON_PROGRESS} {action}... ({current}/{total})"
+
+
+def format_token_count(count: int) -> str:
+    """格式化 token 数
+    
+    Args:
+        count: token 数
+    
+    Returns:
+        1000 以下原样显示，以上以 k 为单位保留一位小数
+    
+    Example:
+        >>> format_token_count(850)
+        '850'
+        >>> format_token_count(12345)
+        '12.3k'
+    """
+    if count < 1000:
+        return str(count)
+    return f"{count / 1000:.1f}k"
+
+
+def format_token_budget(tokens) -> str:
+    """格式化技能的分层 token 预算
+    
+    Args:
+        tokens: (Layer 0, Layer 1, Layer 2) token 数，或 None
+    
+    Returns:
+        形如 'L0 45 · L1 1.4k · L2 2.3k' 的文本；无数据时为空字符串
+    
+    Example:
+        >>> format_token_budget((45, 1357, 2273))
+        'L0 45 · L1 1.4k · L2 2.3k'
+    """
+    if not tokens:
+        return ""
+    return " · ".join(f"L{layer} {format_token_count(count)}" for layer, count in enumerate(tokens))
@@ -13,15 +13,35 @@ from typing import Callable, Optional
 _PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(_PROJECT_ROOT))
 
+import install
+from command_build import FORMATS, CommandBuild
 from install import (
     SkillManager,
     SKILLS_SRC_DIR,
-    COMMANDS_SRC_DIR,
 )
+from token_budget import TokenCache, skill_budget
 
+from .formatters import PlatformConfig
 from .models import ItemType, InstallStatus, ItemInfo, InstallResult
 
 
+def platform_options() -> list[PlatformConfig]:
+    """平台注册表中的所有平台 (用于平台选择屏幕)
+    
+    Returns:
+        PlatformConfig 列表，路径以 ~ 表示主目录
+    """
+    options = []
+    for name, config in install.TARGET_CONFIG.items():
+        base = Path(config["base"])
+        try:
+            path = f"~/{base.relative_to(install.HOME_DIR).as_posix()}/"
+        except ValueError:
+            path = f"{base.as_posix()}/"
+        options.append(PlatformConfig(name, config.get("label", name.capitalize()), path))
+    return options
+
+
 class SourceDirectoryError(Exception):
     """源目录不存在错误"""
     def __init__(self, directory: Path, message: str = ""):
@@ -36,7 +56,7 @@ class TUIManager:
     封装 install.py 的 SkillManager，提供 TUI 所需的接口。
     
     Attributes:
-        platform: 目标平台 (claude, codex, gemini)
+        platform: 目标平台 (install.TARGET_CONFIG 中的平台 ID)
     """
     
     def __init__(self, platform: str):
@@ -47,6 +67,9 @@ class TUIManager:
         """
         self.platform = platform
         self._manager = SkillManager(platform)
+        self._token_cache: Optional[TokenCache] = None
+        self._command_registry: Optional[dict[str, Path]] = None
+        self._command_registry_signature: Optional[tuple] = None
     
     @property
     def target_skills_dir(self) -> Path:
@@ -72,11 +95,7 @@ class TUIManager:
         Returns:
             源目录是否存在
         """
-        if self.platform in ["gemini", "qwen"]:
-            src_dir = COMMANDS_SRC_DIR / "gemini"
-        else:
-            src_dir = COMMANDS_SRC_DIR / "claude"
-        return src_dir.exists()
+        return any(d.exists() for d in CommandBuild(install.COMMANDS_SRC_DIR).source_dirs())
     
     def get_skills_source_dir(self) -> Path:
         """获取技能源目录路径"""
@@ -84,15 +103,57 @@ class TUIManager:
     
     def get_commands_source_dir(self) -> Path:
         """获取命令源目录路径"""
-        if self.platform in ["gemini", "qwen"]:
-            return COMMANDS_SRC_DIR / "gemini"
-        return COMMANDS_SRC_DIR / "claude"
+        return self._manager.commands_source_dir()
+    
+    @property
+    def token_cache(self) -> TokenCache:
+        """token 计数缓存 (首次使用时加载)"""
+        if self._token_cache is None:
+            self._token_cache = TokenCache()
+        return self._token_cache
+    
+    def command_registry(self) -> dict[str, Path]:
+        """命令注册表: 命令名 -> 待安装文件 (手写文件或由另一格式生成的缓存文件)
+        
+        首次调用时构建一次；之后仅在任一源文件的 (mtime, 大小) 变化或文件增删时
+        重新构建 (只 stat，不读取内容)。源目录都不存在时返回空字典。
+        
+        Returns:
+            按名称排序的命令注册表 (仅顶层命令)
+        """
+        build = CommandBuild(install.COMMANDS_SRC_DIR)
+        if not any(src_dir.exists() for src_dir in build.source_dirs()):
+            self._command_registry, self._command_registry_signature = None, None
+            return {}
+        
+        # An in-place edit changes no directory mtime, so key on every source file
+        signature = build.signature()
+        if self._command_registry is None or signature != self._command_registry_signature:
+            suffix = FORMATS[self._manager.command_format]["suffix"]
+            self._command_registry = {
+                rel[: -len(suffix)]: path
+                for rel, path in self._manager.command_sources().items()
+                if "/" not in rel
+            }
+            self._command_registry_signature = signature
+        return self._command_registry
+    
+    def _command_file_name(self, name: str) -> str:
+        """命令在目标目录中的文件名"""
+        return f"{name}{FORMATS[self._manager.command_format]['suffix']}"
+    
+    def _installed_command_files(self) -> set[str]:
+        """目标命令目录中已有的文件名 (一次扫描)"""
+        try:
+            return {entry.name for entry in self._manager.target_commands_dir.iterdir()}
+        except OSError:
+            return set()
     
     def get_skills(self) -> list[ItemInfo]:
         """获取所有技能列表
         
         Returns:
-            技能信息列表
+            技能信息列表 (含分层 token 预算)
             
         Note:
             如果源目录不存在，返回空列表
@@ -114,16 +175,18 @@ class TUIManager:
                     status=InstallStatus.INSTALLED if installed else InstallStatus.NOT_INSTALLED,
                     source_path=skill_dir,
                     target_path=target_path,
+                    tokens=skill_budget(skill_dir, self.token_cache).as_tuple(),
                 ))
         
+        self.token_cache.save()
         return skills
     
     def get_commands(self) -> list[ItemInfo]:
         """获取所有命令列表
         
-        根据平台返回对应的命令列表:
-        - gemini/qwen: 从 commands/gemini/ 获取
-        - claude/codex: 从 commands/claude/ 获取
+        根据平台的命令格式返回对应的命令列表:
+        - toml (gemini/qwen): commands/gemini/，缺少的命令由 Markdown 生成
+        - md (claude/codex): commands/claude/，缺少的命令由 TOML 生成
         
         Returns:
             命令信息列表
@@ -132,29 +195,24 @@ class TUIManager:
             如果源目录不存在，返回空列表
         """
         commands = []
-        
-        # 根据平台确定命令源目录
-        if self.platform in ["gemini", "qwen"]:
-            src_dir = COMMANDS_SRC_DIR / "gemini"
-        else:
-            src_dir = COMMANDS_SRC_DIR / "claude"
-        
-        if not src_dir.exists():
+        registry = self.command_registry()
+        if not registry:
             return commands
         
-        for cmd_file in sorted(src_dir.iterdir()):
-            if cmd_file.is_file():
-                target_file = self._manager.target_commands_dir / cmd_file.name
-                installed = target_file.exists()
-                
-                commands.append(ItemInfo(
-                    name=cmd_file.stem,
-                    item_type=ItemType.COMMAND,
-                    description=None,
-                    status=InstallStatus.INSTALLED if installed else InstallStatus.NOT_INSTALLED,
-                    source_path=cmd_file,
-                    target_path=target_file,
-                ))
+        installed_files = self._installed_command_files()
+        for name, cmd_file in registry.items():
+            file_name = self._command_file_name(name)
+            target_file = self._manager.target_commands_dir / file_name
+            installed = file_name in installed_files
+            
+            commands.append(ItemInfo(
+                name=name,
+                item_type=ItemType.COMMAND,
+                description=None,
+                status=InstallStatus.INSTALLED if installed else InstallStatus.NOT_INSTALLED,
+                source_path=cmd_file,
+                target_path=target_file,
+            ))
         
         return commands
     
@@ -229,13 +287,7 @@ class TUIManager:
             
         Requirements: 6.2, 6.5, 6.6
         """
-        import shutil
-        
-        # 根据平台确定命令源目录
-        if self.platform in ["gemini", "qwen"]:
-            src_dir = COMMANDS_SRC_DIR / "gemini"
-        else:
-            src_dir = COMMANDS_SRC_DIR / "claude"
+        src_dir = install.COMMANDS_SRC_DIR
         
         # 检查源目录
         if not src_dir.exists():
@@ -248,11 +300,7 @@ class TUIManager:
         
         try:
             # 查找命令文件
-            src_file = None
-            for f in src_dir.iterdir():
-                if f.is_file() and f.stem == name:
-                    src_file = f
-                    break
+            src_file = self.command_registry().get(name)
             
             if src_file is None:
                 return InstallResult(
@@ -262,17 +310,23 @@ class TUIManager:
                     error=f"No file with stem '{name}' in {src_dir}",
                 )
             
-            # 确保目标目录存在
-            self._manager.ensure_dirs()
-            
-            # 复制文件
-            target_file = self._manager.target_commands_dir / src_file.name
-            shutil.copy2(src_file, target_file)
+            # 与 install.py install-commands 相同的逐文件同步 (内容未变时跳过)；
+            # 直接使用注册表中的文件，不再重建全部命令
+            file_name = self._command_file_name(name)
+            results = self._manager.sync_commands(sources={file_name: src_file})
+            _, status, error = results[0]
+            if status == "failed":
+                return InstallResult(
+                    success=False,
+                    item_name=name,
+                    message=f"Failed to install {name}",
+                    error=error,
+                )
             
             return InstallResult(
                 success=True,
                 item_name=name,
-                message=f"Successfully installed {name}",
+                message=f"{name} is up to date" if status == "unchanged" else f"Successfully installed {name}",
             )
         except PermissionError as e:
             return InstallResult(
@@ -336,15 +390,23 @@ class TUIManager:
         failures: list[str] = []
         
         commands = self.get_commands()
+        if not commands:
+            return success_count, fail_count, failures
+        
+        # 一次同步整个命令目录 (含 plan/ 等子目录)，再按命令汇报结果
+        try:
+            statuses = {rel: status for rel, status, _ in self._manager.sync_commands()}
+        except OSError:
+            statuses = {}
         for cmd in commands:
-            result = self.install_command(cmd.name)
-            if result.success:
+            success = statuses.get(self._command_file_name(cmd.name), "failed") != "failed"
+            if success:
                 success_count += 1
             else:
                 fail_count += 1
                 failures.append(cmd.name)
             
             if callback:
-                callback(cmd.name, result.success)
+                callback(cmd.name, success)
         
         return success_count, fail_count, failures
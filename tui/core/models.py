@@ -33,6 +33,7 @@ class ItemInfo:
         status: 安装状态
         source_path: 源文件路径 (可选)
         target_path: 目标安装路径 (可选)
+        tokens: 技能的 (Layer 0, Layer 1, Layer 2) 估算 token 数 (可选)
     """
     name: str
     item_type: ItemType
@@ -40,6 +41,7 @@ class ItemInfo:
     status: InstallStatus = InstallStatus.NOT_INSTALLED
     source_path: Optional[Path] = None
     target_path: Optional[Path] = None
+    tokens: Optional[tuple[int, int, int]] = None
     
     @property
     def is_installed(self) -> bool:
@@ -1,6 +1,6 @@
 """平台选择屏幕
 
-启动时首先显示，让用户选择目标平台 (Claude, Codex, Gemini)。
+启动时首先显示，让用户从平台注册表中选择目标平台 (Claude, Codex, Gemini, Qwen 等)。
 支持键盘导航和选择。
 
 Requirements: 1.1, 1.2, 1.3, 1.4, 1.5, 2.1, 2.2, 2.3, 2.4, 2.5
@@ -13,13 +13,13 @@ from textual.widgets.option_list import Option
 from textual.binding import Binding
 from textual.containers import Center, Vertical
 
-from ..core import PlatformConfig, format_platform_option
+from ..core import PlatformConfig, format_platform_option, platform_options
 
 
 class PlatformSelectScreen(Screen):
     """平台选择屏幕
     
-    显示三个平台选项，支持键盘导航和选择。
+    显示注册表中的所有平台选项，支持键盘导航和选择。
     美化后的界面包含:
     - 居中卡片容器，圆角边框和微妙阴影效果
     - 带 emoji 的应用标题
@@ -104,13 +104,8 @@ class PlatformSelectScreen(Screen):
     }
     """
     
-    # 平台配置: (id, 显示名称, 目标路径)
-    PLATFORMS = [
-        PlatformConfig("claude", "Claude", "~/.claude/"),
-        PlatformConfig("codex", "Codex", "~/.codex/"),
-        PlatformConfig("gemini", "Gemini", "~/.gemini/"),
-        PlatformConfig("qwen", "Qwen", "~/.qwen/"),
-    ]
+    # 平台配置: (id, 显示名称, 目标路径)，来自平台注册表
+    PLATFORMS: list[PlatformConfig] = platform_options()
     
     def compose(self) -> ComposeResult:
         """构建屏幕组件